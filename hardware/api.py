@@ -1,35 +1,275 @@
+import asyncio
+import json
+import socket
+
 # send_api_request('/api/data', data={'temp': 25.5}, method='POST')
+# Binary data (bytes, bytearray or memoryview) is sent as is, as
+# application/octet-stream; anything else is sent as JSON.
 
-# Function to send API requests to local endpoint
-def send_api_request(endpoint, data=None, method='GET'):
-    try:
-        from secrets import API_HOST, API_PORT
-    except ImportError:
-        print("Warning: API_HOST or API_PORT not found in secrets.py")
-        return None
-
-    import urequests
-
-    url = f'http://{API_HOST}:{API_PORT}{endpoint}'
-
-    try:
-        if method == 'GET':
-            response = urequests.get(url)
-        elif method == 'POST':
-            response = urequests.post(url, json=data)
-        elif method == 'PUT':
-            response = urequests.put(url, json=data)
+class ApiClient:
+    # HTTP/1.1 client on one persistent keep-alive connection
+    # - API_HOST/API_PORT are read from secrets.py once, and the address is
+    #   resolved once
+    # - Requests are assembled in a preallocated buffer (request line,
+    #   fixed headers and body) and written in one call; response bodies
+    #   that fit are read back into the same buffer
+    # - A request on a connection the server has dropped is retried once on
+    #   a fresh connection; a server that answers "Connection: close" gets
+    #   a new connection on the next request
+
+    def __init__(self, host=None, port=None, timeout=5, buffer_size=1024):
+        if host is None:
+            try:
+                from secrets import API_HOST, API_PORT
+            except ImportError:
+                print("Warning: API_HOST or API_PORT not found in secrets.py")
+                API_HOST, API_PORT = None, None
+            host, port = API_HOST, API_PORT
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.address = None
+        self.sock = None
+        self.stream = None
+        self.buffer = bytearray(buffer_size)
+        self.view = memoryview(self.buffer)
+        self.headers = (
+            " HTTP/1.1\r\nHost: {}:{}\r\nConnection: keep-alive\r\n"
+            "Content-Type: ".format(host, port)
+        ).encode()
+        self.requests = 0
+        self.connects = 0
+
+    def connect(self):
+        if self.address is None:
+            self.address = socket.getaddrinfo(self.host, self.port)[0][-1]
+        sock = socket.socket()
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.address)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+        self.stream = sock.makefile("rwb", 0)
+        self.connects += 1
+
+    def close(self):
+        if self.sock is not None:
+            self.sock.close()
+            self.sock = None
+            self.stream = None
+
+    def put(self, n, data):
+        # Copy data into the buffer at n; returns the new end
+        end = n + len(data)
+        self.view[n:end] = data
+        return end
+
+    def send(self, method, endpoint, content_type, body):
+        n = self.put(0, method)
+        n = self.put(n, b" ")
+        n = self.put(n, endpoint)
+        n = self.put(n, self.headers)
+        n = self.put(n, content_type)
+        n = self.put(n, b"\r\nContent-Length: ")
+        n = self.put(n, str(len(body)).encode())
+        n = self.put(n, b"\r\n\r\n")
+        if n + len(body) <= len(self.buffer):
+            n = self.put(n, body)
+            self.write(self.view[:n])
+        else:
+            self.write(self.view[:n])
+            self.write(body)
+
+    def write(self, data):
+        sent = 0
+        while sent < len(data):
+            count = self.stream.write(data[sent:])
+            if count is None:
+                raise OSError("Write timed out")
+            sent += count
+
+    def readinto(self, view):
+        n = 0
+        while n < len(view):
+            count = self.stream.readinto(view[n:])
+            if not count:
+                raise OSError("Connection closed by server")
+            n += count
+
+    def status(self, line):
+        # (status, head) of a status line; head is [length, chunked,
+        # keep_alive], filled in by header()
+        if not line:
+            raise OSError("Connection closed by server")
+        return int(line.split(None, 2)[1]), [None, False, line.startswith(b"HTTP/1.1")]
+
+    def header(self, head, line):
+        name, _, value = line.partition(b":")
+        name = name.strip().lower()
+        value = value.strip().lower()
+        if name == b"content-length":
+            head[0] = int(value)
+        elif name == b"transfer-encoding":
+            head[1] = value == b"chunked"
+        elif name == b"connection":
+            head[2] = value == b"keep-alive"
+
+    def receive(self):
+        # (status, content) of one response; closes the connection when the
+        # server will not keep it open
+        status, head = self.status(self.stream.readline())
+        while True:
+            line = self.stream.readline()
+            if not line or line == b"\r\n":
+                break
+            self.header(head, line)
+        length, chunked, keep_alive = head
+
+        if chunked:
+            parts = []
+            while True:
+                size = int(self.stream.readline().split(b";")[0], 16)
+                if size == 0:
+                    self.stream.readline()
+                    break
+                parts.append(self.stream.read(size))
+                self.stream.readline()
+            content = b"".join(parts)
+        elif length is None:
+            content = self.stream.read()
+            keep_alive = False
+        elif length <= len(self.buffer):
+            self.readinto(self.view[:length])
+            content = bytes(self.view[:length])
         else:
-            print(f'Unsupported method: {method}')
+            content = self.stream.read(length)
+
+        if not keep_alive:
+            self.close()
+        return status, content.decode()
+
+    def body(self, data, method):
+        # (content type, body) for data, or None when it cannot be sent
+        if self.host is None:
             return None
+        if method not in ("GET", "POST", "PUT"):
+            print(f"Unsupported method: {method}")
+            return None
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            return b"application/octet-stream", data
+        return b"application/json", json.dumps(data).encode() if data is not None else b""
+
+    def request(self, endpoint, data=None, method="GET"):
+        # {'status', 'content'} of the response, or None when it failed
+        encoded = self.body(data, method)
+        if encoded is None:
+            return None
+        content_type, body = encoded
+        for attempt in range(2):
+            fresh = self.sock is None
+            try:
+                if fresh:
+                    self.connect()
+                self.send(method.encode(), endpoint.encode(), content_type, body)
+                status, content = self.receive()
+                self.requests += 1
+                return {"status": status, "content": content}
+            except (OSError, ValueError, IndexError) as e:
+                self.close()
+                # Only a reused connection can have gone stale
+                if fresh or attempt:
+                    print(f"API request failed: {e}")
+                    return None
+
+class AsyncApiClient(ApiClient):
+    # ApiClient on asyncio streams, for the firmware's tasks: a request
+    # waits for the network without blocking the event loop, so a slow or
+    # unreachable server never delays sampling. Each exchange (connecting
+    # included) is bounded by `timeout` seconds.
 
-        status = response.status_code
-        content = response.text
-        response.close()
+    def __init__(self, host=None, port=None, timeout=5, buffer_size=1024):
+        super().__init__(host, port, timeout, buffer_size)
+        self.reader = None
 
-        print(f'API {method} {endpoint}: {status}')
-        return {'status': status, 'content': content}
+    async def connect(self):
+        self.reader, self.stream = await asyncio.open_connection(self.host, self.port)
+        self.connects += 1
 
-    except Exception as e:
-        print(f'API request failed: {e}')
-        return None
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+            self.reader = None
+
+    def write(self, data):
+        # Buffered by the stream; exchange() drains it
+        self.stream.write(data)
+
+    async def receive(self):
+        status, head = self.status(await self.reader.readline())
+        while True:
+            line = await self.reader.readline()
+            if not line or line == b"\r\n":
+                break
+            self.header(head, line)
+        length, chunked, keep_alive = head
+
+        if chunked:
+            parts = []
+            while True:
+                size = int((await self.reader.readline()).split(b";")[0], 16)
+                if size == 0:
+                    await self.reader.readline()
+                    break
+                parts.append(await self.reader.readexactly(size))
+                await self.reader.readline()
+            content = b"".join(parts)
+        elif length is None:
+            content = await self.reader.read(-1)
+            keep_alive = False
+        else:
+            content = await self.reader.readexactly(length)
+
+        if not keep_alive:
+            self.close()
+        return status, content.decode()
+
+    async def exchange(self, fresh, method, endpoint, content_type, body):
+        if fresh:
+            await self.connect()
+        self.send(method, endpoint, content_type, body)
+        await self.stream.drain()
+        return await self.receive()
+
+    async def request(self, endpoint, data=None, method="GET"):
+        encoded = self.body(data, method)
+        if encoded is None:
+            return None
+        content_type, body = encoded
+        for attempt in range(2):
+            fresh = self.stream is None
+            try:
+                status, content = await asyncio.wait_for(
+                    self.exchange(fresh, method.encode(), endpoint.encode(), content_type, body),
+                    self.timeout)
+                self.requests += 1
+                return {"status": status, "content": content}
+            except (OSError, ValueError, IndexError, asyncio.TimeoutError) as e:
+                self.close()
+                if fresh or attempt:
+                    print(f"API request failed: {e!r}")
+                    return None
+
+client = None
+
+# Function to send API requests to local endpoint, on a shared ApiClient
+def send_api_request(endpoint, data=None, method='GET'):
+    global client
+    if client is None:
+        client = ApiClient()
+    resp = client.request(endpoint, data, method)
+    if resp is not None:
+        print(f'API {method} {endpoint}: {resp["status"]}')
+    return resp
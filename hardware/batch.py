@@ -0,0 +1,113 @@
+import json
+
+from record import RECORD_SIZE, bulk_prefix
+
+# Outbound batching of measurements
+# Readings from every sensor are written to a RingLog on flash and
+# uploaded from there, many at a time, as one binary POST to
+# /api/box/{HOT_BOX_ID}/measurements/bulk (format in record.py): the
+# records go out as they are stored, behind a header naming the sensors.
+# An upload is due once `max_readings` readings are waiting or the oldest
+# is `max_age` seconds old. flush() drains the whole backlog in requests
+# of up to `bulk_readings`, so after an outage the log is backfilled in a
+# few large requests; if one fails, the rest stays in the log and the next
+# attempt waits `retry` seconds. Nothing is lost unless the log fills up
+# (its `dropped` count). Sensor indices are kept in `sensors_path`, so
+# readings logged before a reboot keep their sensor.
+
+class MeasurementBatch:
+    def __init__(self, send, log, max_readings=60, max_age=60, bulk_readings=240,
+                 retry=60, sensors_path="sensors.json"):
+        # send(payload) uploads one batch and returns True on success (a
+        # coroutine when uploading with upload() instead of flush())
+        self.send = send
+        self.log = log
+        self.max_readings = max_readings
+        self.max_age = max_age
+        self.bulk_readings = bulk_readings
+        self.retry = retry
+        self.retry_at = 0
+        self.sensors_path = sensors_path
+        # Request body: bulk header, then room for bulk_readings records;
+        # rebuilt when a sensor is added
+        self.body = None
+        try:
+            with open(sensors_path) as f:
+                self.sensors = json.load(f)
+        except (OSError, ValueError):
+            self.sensors = []
+
+    def sensor_index(self, sensor_id):
+        if sensor_id not in self.sensors:
+            self.sensors.append(sensor_id)
+            self.body = None
+            with open(self.sensors_path, "w") as f:
+                json.dump(self.sensors, f)
+        return self.sensors.index(sensor_id)
+
+    def add(self, timestamp, sensor_id, raw):
+        # Log one raw reading (1/16 °C, sensors.readRaw); False for a
+        # failed read (raw None). Readings reach flash on the next sync()
+        # or flush().
+        if raw is None:
+            return False
+        self.log.append(timestamp, self.sensor_index(sensor_id), raw)
+        return True
+
+    def sync(self):
+        self.log.sync()
+
+    def pending(self):
+        return self.log.count() + self.log.staged_count
+
+    def due(self, now):
+        # True when enough readings are waiting, or the oldest is too old,
+        # and no failed upload is still backing off
+        if now < self.retry_at or not self.pending():
+            return False
+        if self.pending() >= self.max_readings:
+            return True
+        self.log.sync()
+        return now - self.log.oldest() >= self.max_age
+
+    def defer(self, now):
+        # Hold off uploads for `retry` seconds, after a failed attempt
+        self.retry_at = now + self.retry
+
+    def payload(self):
+        # (end, body) of the next upload: the oldest logged records, and the
+        # log position just past them. The log may overflow while the body
+        # is in flight; releasing up to `end` then never discards records
+        # that were not in it.
+        if self.body is None:
+            prefix = bulk_prefix(self.sensors)
+            self.start = len(prefix)
+            self.body = prefix + bytearray(self.bulk_readings * RECORD_SIZE)
+            self.view = memoryview(self.body)
+        count = self.log.readinto(self.view[self.start:])
+        return self.log.position(count), self.view[:self.start + count * RECORD_SIZE]
+
+    def flush(self, now=0):
+        # Upload the whole backlog; on failure keep the rest for later
+        self.log.sync()
+        while self.log.count():
+            end, body = self.payload()
+            if not self.send(body):
+                self.defer(now)
+                return False
+            self.log.release(end)
+        self.retry_at = 0
+        return True
+
+    async def upload(self, now=0):
+        # flush() for a coroutine send(), so other tasks keep running while
+        # a request waits on the network
+        self.log.sync()
+        while self.log.count():
+            end, body = self.payload()
+            if not await self.send(body):
+                self.defer(now)
+                return False
+            self.log.release(end)
+        self.retry_at = 0
+        return True
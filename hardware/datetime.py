@@ -1,59 +1,64 @@
+import asyncio
+import socket
+import struct
 import time
 import machine
 
+NTP_HOST = "pool.ntp.org"
+# Seconds from the NTP epoch (1900) to the one time.time() counts from
+NTP_DELTA = 3155673600 if time.gmtime(0)[0] == 2000 else 2208988800
+
+ntp_address = None
+
 def iso_timestamp(t):
     timestamp = "{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}".format(
         t[0], t[1], t[2], t[4], t[5], t[6]
     )
     return timestamp
 
-async def setTime(loop=0):
-    #ntptime.settime() failure: [Errno 110] ETIMEDOUT
-    #ntptime.settime() failure: overflow converting long int to machine word
-    print('Attempt to set time:',1+loop)
+async def ntpTime(timeout_ms=2000):
+    # Epoch seconds from one NTP query, as ntptime.time() but without
+    # blocking: the socket is polled between sleeps, so other tasks keep
+    # running while the reply is on its way. The server address is looked
+    # up once.
+    global ntp_address
+    if ntp_address is None:
+        ntp_address = socket.getaddrinfo(NTP_HOST, 123)[0][-1]
+    query = bytearray(48)
+    query[0] = 0x1B
+    s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
     try:
-        if loop<5:
-            d=time.time()-debug.poweron.time
-            ntptime.settime()
-            debug.poweron.time=time.time()-d
-            logging.clock.method="accurate"
-        else:
-            # if it did not work the second time it is not going to in my testing
-            print("Failed to set time; Waiting 15 seconds")
-            await sleep(15000)
-            if logging.clock.time_delta:
-                # If I do not have this by now something is very wrong
-                # WiFi is working, therefore my server is up and has configured settings
-                print("Setting clock using low precision method")
-                from machine import RTC
-                d=time.time()-debug.poweron.time
-                t=time.gmtime(time.time()+logging.clock.time_delta)
-                RTC().datetime((t[0], t[1], t[2], t[6], t[3], t[4], t[5], 0))
-                debug.poweron.time=time.time()-d
-                print("Result:",debugData(time.time()))
-                logging.clock.method="low precision"
-            else:
-                # So lets get this strait:
-                # The server's Guest OS (pfsense) has asigned a IP to us over WiFi
-                # The server host is unrechable
-                # How is that even possible
-                print("Rebooting in 15 seconds, failed to set clock")
-                await sleep(15000)
-                from machine import reset
-                reset()
-        logging.clock.sync=time.time()
-    except OverflowError:
-        # it is not going to work
-        print("overflow error; settime is borked")
-        await setTime(9001)
-    except OSError:
-        print("ntptime.settime() failure")
-        if loop>0:
-            # Not expecting more than 1 failure, maybe waiting will help?
-            await sleep(10000)
-        await setTime(loop+1)
+        s.setblocking(False)
+        s.sendto(query, ntp_address)
+        start = time.ticks_ms()
+        while True:
+            try:
+                msg = s.recv(48)
+                break
+            except OSError:
+                if time.ticks_diff(time.ticks_ms(), start) > timeout_ms:
+                    raise OSError("NTP timeout")
+                await asyncio.sleep_ms(20)
+    finally:
+        s.close()
+    return struct.unpack("!I", msg[40:44])[0] - NTP_DELTA
+
+async def setTime(attempts=3):
+    # Set the RTC from NTP; True when it worked. Failed attempts back off
+    # 2, 4, ... seconds; when all fail the caller tries again later.
+    for attempt in range(attempts):
+        print("Attempt to set time:", attempt + 1)
+        try:
+            t = time.gmtime(await ntpTime())
+            machine.RTC().datetime((t[0], t[1], t[2], t[6] + 1, t[3], t[4], t[5], 0))
+            print("Time set:", iso_timestamp(machine.RTC().datetime()))
+            return True
+        except (OSError, OverflowError, ValueError) as e:
+            print("Failed to set time:", e)
+            await asyncio.sleep(2 << attempt)
+    return False
 
 def initTime(rtc):
+    # The RTC as it came up; setTime() corrects it once the network is up
     default_now = rtc.datetime()
     print(iso_timestamp(default_now))
-    setTime()
@@ -1,10 +1,12 @@
 import os
 
 def file_exists(file_path):
-    directory = '/' if '/' not in file_path else file_path.rsplit('/', 1)[0]
-    files = os.listdir(directory)
-    file_name = file_path.split('/')[-1]
-    return file_name in files
+    # One stat instead of listing the whole directory
+    try:
+        os.stat(file_path)
+        return True
+    except OSError:
+        return False
 
 def openFile(count=1):
     file_path = f"test-{count}.csv"
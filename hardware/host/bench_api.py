@@ -0,0 +1,127 @@
+# Requests per second and heap behaviour of api.ApiClient
+# Runs under the MicroPython unix port (or CPython) against a local server,
+# normally host/standin_server.py:
+#   python3 host/standin_server.py --port 3000 --interval 0 &
+#   micropython host/bench_api.py 127.0.0.1 3000 [requests]
+# - fresh: a new TCP connection per request, like urequests
+# - keep-alive: one persistent connection
+# - urequests: the library itself, when it is installed
+# Each run POSTs a typical batch payload. On MicroPython it also reports
+# heap bytes allocated per request and, after a collection, fragmentation:
+# 1 - (largest allocatable block / free heap).
+
+import gc
+import sys
+import time
+
+# Import the firmware modules from the parent directory; appended so that
+# hardware/datetime.py cannot shadow CPython's datetime
+parts = __file__.rsplit("/", 1)
+sys.path.append((parts[0] if len(parts) > 1 else ".") + "/..")
+
+from api import ApiClient
+
+try:
+    ticks_ms, ticks_diff = time.ticks_ms, time.ticks_diff
+except AttributeError:
+    def ticks_ms():
+        return int(time.perf_counter() * 1000)
+
+    def ticks_diff(end, start):
+        return end - start
+
+ENDPOINT = "/api/box/1234567890/measurements/batch"
+PAYLOAD = {
+    "t0": 1760000000,
+    "sensors": ["28b87f230d000052", "28f475b80e000076"],
+    "readings": [[10 * n, n % 2, 2150 + n] for n in range(12)],
+}
+
+
+def largest_block(limit):
+    # Largest bytearray that can be allocated right now (binary search)
+    low, high = 0, limit
+    while low < high:
+        size = (low + high + 1) // 2
+        try:
+            block = bytearray(size)
+            del block
+            low = size
+        except MemoryError:
+            high = size - 1
+    return low
+
+
+def heap_report():
+    if not hasattr(gc, "mem_free"):
+        return "n/a"
+    gc.collect()
+    free = gc.mem_free()
+    largest = largest_block(free)
+    gc.collect()
+    return "{:.1%}".format(1 - largest / free if free else 0)
+
+
+def measure(name, request, count):
+    # Requests/s, heap bytes allocated per request and fragmentation after
+    gc.collect()
+    allocated = 0
+    failures = 0
+    start = ticks_ms()
+    for _ in range(count):
+        if hasattr(gc, "mem_alloc"):
+            # Collections between requests keep the delta to this request
+            gc.collect()
+            before = gc.mem_alloc()
+            gc.disable()
+        ok = request()
+        if hasattr(gc, "mem_alloc"):
+            allocated += gc.mem_alloc() - before
+            gc.enable()
+        if not ok:
+            failures += 1
+    seconds = ticks_diff(ticks_ms(), start) / 1000
+    per_request = "{:10.0f}".format(allocated / count) if hasattr(gc, "mem_alloc") else "{:>10}".format("n/a")
+    print("{:>10} | {:8.1f} | {} | {:>13} | {:8d}".format(
+        name, count / seconds, per_request, heap_report(), failures))
+
+
+def main():
+    host = sys.argv[1] if len(sys.argv) > 1 else "127.0.0.1"
+    port = int(sys.argv[2]) if len(sys.argv) > 2 else 3000
+    count = int(sys.argv[3]) if len(sys.argv) > 3 else 200
+    print("{} requests to http://{}:{}{}".format(count, host, port, ENDPOINT))
+    print("{:>10} | {:>8} | {:>10} | {:>13} | {:>8}".format(
+        "Client", "req/s", "B/request", "Fragmentation", "Failures"))
+
+    client = ApiClient(host, port)
+
+    def fresh():
+        resp = client.request(ENDPOINT, PAYLOAD, "POST")
+        client.close()
+        return resp is not None and resp["status"] == 201
+
+    def keep_alive():
+        resp = client.request(ENDPOINT, PAYLOAD, "POST")
+        return resp is not None and resp["status"] == 201
+
+    measure("fresh", fresh, count)
+    measure("keep-alive", keep_alive, count)
+    client.close()
+
+    try:
+        import urequests
+    except ImportError:
+        return
+    url = "http://{}:{}{}".format(host, port, ENDPOINT)
+
+    def library():
+        response = urequests.post(url, json=PAYLOAD)
+        status = response.status_code
+        response.close()
+        return status == 201
+
+    measure("urequests", library, count)
+
+
+main()
@@ -0,0 +1,132 @@
+# Upload cost per reading: one JSON POST per reading, JSON batches and
+# MeasurementBatch's binary bulk uploads
+# - Starts the stand-in server in-process (with --latency per request),
+#   then replays `cycles` acquisition cycles of `sensors` sensors each way
+# - Each request opens a fresh connection, as urequests does on the device
+# - Reports requests, bytes on the wire and readings uploaded per second
+#
+# python3 host/bench_upload.py [--sensors 8] [--cycles 120] [--latency 0.02]
+
+import argparse
+import http.client
+import json
+import os
+import sys
+import tempfile
+import time
+
+# Appended, not prepended: the firmware's datetime.py and secrets.py must not
+# shadow the standard library modules of the same name
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import MeasurementBatch
+from record import to_raw
+from ringlog import RingLog
+from standin_server import serve
+
+BOX = '1234567890'
+
+
+def post(port, endpoint, data):
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        body, content_type = bytes(data), 'application/octet-stream'
+    else:
+        body, content_type = json.dumps(data), 'application/json'
+    try:
+        connection.request('POST', endpoint, body,
+                           {'Content-Type': content_type, 'Connection': 'close'})
+        return connection.getresponse().status in (200, 201)
+    finally:
+        connection.close()
+
+
+def readings(sensors, cycles, start=1760000000, period=10):
+    for cycle in range(cycles):
+        for sensor in range(sensors):
+            yield start + cycle * period, f'28{sensor:014x}', 20 + sensor + cycle / 16
+
+
+def single(port, sensors, cycles):
+    for t, sensor_id, temperature in readings(sensors, cycles):
+        post(port, f'/api/box/{BOX}/measurements/', {
+            'sensor_id': sensor_id,
+            'timestamp': '{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}'.format(*time.gmtime(t)[:6]),
+            'temperature': temperature,
+        })
+
+
+def batched(port, sensors, cycles, max_readings):
+    # JSON batches of max_readings, {"t0", "sensors", "readings"}
+    ids = [f'28{sensor:014x}' for sensor in range(sensors)]
+    pending = []
+    for reading in readings(sensors, cycles):
+        pending.append(reading)
+        if len(pending) == max_readings:
+            post_batch(port, ids, pending)
+            pending = []
+    if pending:
+        post_batch(port, ids, pending)
+
+
+def post_batch(port, ids, pending):
+    t0 = pending[0][0]
+    post(port, f'/api/box/{BOX}/measurements/batch', {
+        't0': t0,
+        'sensors': ids,
+        'readings': [[t - t0, ids.index(sensor_id), round(temperature * 100)]
+                     for t, sensor_id, temperature in pending],
+    })
+
+
+def bulk(port, sensors, cycles, max_readings):
+    # Through the flash ring log, as on the device (a temporary file here)
+    with tempfile.TemporaryDirectory() as directory:
+        log = RingLog(os.path.join(directory, 'measurements.log'))
+        batch = MeasurementBatch(lambda payload: post(port, f'/api/box/{BOX}/measurements/bulk', payload),
+                                 log, max_readings=max_readings,
+                                 sensors_path=os.path.join(directory, 'sensors.json'))
+        for t, sensor_id, temperature in readings(sensors, cycles):
+            batch.add(t, sensor_id, to_raw(temperature))
+            if batch.due(t):
+                batch.flush(t)
+        batch.flush()
+        log.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-reading vs batched vs bulk upload throughput")
+    parser.add_argument('--sensors', type=int, default=8)
+    parser.add_argument('--cycles', type=int, default=120)
+    parser.add_argument('--latency', type=float, default=0.02, help="server seconds per request")
+    parser.add_argument('--max-readings', type=int, default=60)
+    parser.add_argument('--port', type=int, default=3900)
+    args = parser.parse_args()
+
+    server, stats = serve(args.port, args.latency, interval=0, host='127.0.0.1')
+    total = args.sensors * args.cycles
+    print(f"{args.sensors} sensors x {args.cycles} cycles = {total} readings, "
+          f"{args.latency * 1e3:.0f} ms per request")
+    print(f"{'Upload':>10} | {'Requests':>8} | {'Bytes':>8} | {'B/reading':>9} | "
+          f"{'Wall (s)':>8} | {'Readings/s':>10}")
+    runs = (
+        ('single', lambda: single(args.port, args.sensors, args.cycles)),
+        ('batched', lambda: batched(args.port, args.sensors, args.cycles, args.max_readings)),
+        ('bulk', lambda: bulk(args.port, args.sensors, args.cycles, args.max_readings)),
+    )
+    for name, run in runs:
+        before = stats.snapshot()
+        start = time.perf_counter()
+        run()
+        seconds = time.perf_counter() - start
+        after = stats.snapshot()
+        requests = after['requests'] - before['requests']
+        size = after['bytes'] - before['bytes']
+        uploaded = after['readings'] - before['readings']
+        print(f"{name:>10} | {requests:8d} | {size:8d} | {size / uploaded:9.1f} | "
+              f"{seconds:8.2f} | {uploaded / seconds:10.0f}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+# Round-trip checks and throughput of the binary sample format (record.py)
+# - Scratchpad conversion against the DS18B20 datasheet table
+# - encode/decode and bulk uploads round-trip, malformed uploads are
+#   rejected, records read from a RingLog decode to what was appended,
+#   releasing an upload after the log overflowed keeps newer records
+# - Samples/s and bytes/sample of binary records vs the per-reading JSON
+#   dicts with ISO timestamps they replace
+# Exits non-zero on the first failed check.
+#
+# python3 host/check_record.py [--count 100000]
+
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Appended, not prepended: the firmware's datetime.py and secrets.py must not
+# shadow the standard library modules of the same name
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from record import (RECORD_SIZE, celsius, decode, decode_bulk, encode, encode_bulk,
+                    scratch_to_raw, to_raw)
+from ringlog import RingLog
+
+# DS18B20 datasheet, table 1: temperature and scratchpad bytes 1, 0
+DATASHEET = (
+    (125, 0x07D0), (85, 0x0550), (25.0625, 0x0191), (10.125, 0x00A2), (0.5, 0x0008),
+    (0, 0x0000), (-0.5, 0xFFF8), (-10.125, 0xFF5E), (-25.0625, 0xFE6F), (-55, 0xFC90),
+)
+SENSORS = ['28b87f230d000052', '28f475b80e000076', '28000000000000aa']
+
+
+def check(condition, message):
+    if not condition:
+        sys.exit(f"FAILED: {message}")
+
+
+def random_samples(count, seed=1):
+    rng = random.Random(seed)
+    samples = [(rng.randrange(2**32), rng.randrange(len(SENSORS)), rng.randrange(-32768, 32768))
+               for _ in range(count)]
+    # The edges of every field
+    samples += [(0, 0, -32768), (2**32 - 1, len(SENSORS) - 1, 32767), (1760000000, 1, 0)]
+    return samples
+
+
+def check_scratchpad():
+    for temperature, value in DATASHEET:
+        raw = scratch_to_raw(0x28, bytes((value & 0xFF, value >> 8, 0, 0, 0, 0, 0, 0, 0)))
+        check(celsius(raw) == temperature, f"DS18B20 {value:#06x} read as {celsius(raw)}")
+        check(to_raw(temperature) == raw, f"to_raw({temperature}) != {raw}")
+    # DS18S20: 25 °C in 1/2 °C steps (0x0032), refined by COUNT_REMAIN 12 of 16
+    raw = scratch_to_raw(0x10, bytes((0x32, 0x00, 0, 0, 0, 0, 12, 16, 0)))
+    check(celsius(raw) == 25.0, f"DS18S20 read as {celsius(raw)}")
+    raw = scratch_to_raw(0x10, bytes((0xCE, 0xFF, 0, 0, 0, 0, 12, 16, 0)))
+    check(celsius(raw) == -25.0, f"DS18S20 negative read as {celsius(raw)}")
+    check(scratch_to_raw(0x99, bytes(9)) is None, "unknown family accepted")
+    print("scratchpad conversion: ok")
+
+
+def check_round_trip():
+    samples = random_samples(10000)
+    data = encode(samples)
+    check(len(data) == RECORD_SIZE * len(samples), "record size")
+    check(decode(data) == samples, "encode/decode round trip")
+    check(decode_bulk(encode_bulk(SENSORS, samples)) == (SENSORS, samples), "bulk round trip")
+    check(decode_bulk(encode_bulk(SENSORS, [])) == (SENSORS, []), "empty bulk round trip")
+
+    body = encode_bulk(SENSORS, samples[:10])
+    malformed = {
+        'truncated header': body[:3],
+        'bad magic': b'XX' + body[2:],
+        'bad version': body[:2] + b'\x02' + body[3:],
+        'truncated sensor table': body[:12],
+        'truncated record': body[:-1],
+        'unknown sensor': encode_bulk(SENSORS[:1], samples[:10]),
+    }
+    for name, data in malformed.items():
+        try:
+            decode_bulk(data)
+        except ValueError:
+            continue
+        check(False, f"{name} accepted")
+    print("encode/decode and bulk round trip: ok")
+
+
+def check_log():
+    samples = sorted(random_samples(300))
+    with tempfile.TemporaryDirectory() as directory:
+        log = RingLog(os.path.join(directory, 'samples.log'), capacity=256)
+        for timestamp, sensor, raw in samples:
+            log.append(timestamp, sensor, raw)
+        log.sync()
+        check(log.read(256) == samples[-256:], "RingLog.read")
+        view = memoryview(bytearray(256 * RECORD_SIZE))
+        check(log.readinto(view) == 256, "RingLog.readinto count")
+        check(decode(view) == samples[-256:], "RingLog records decode")
+
+        # Overflow while an upload is in flight: only the records it carried
+        # are released, the ones logged since stay unsent
+        end = log.position(100)
+        for timestamp, sensor, raw in samples[:40]:
+            log.append(timestamp, sensor, raw)
+        log.sync()
+        log.release(end)
+        check(log.read(256) == (samples[-256:] + samples[:40])[100:], "RingLog.release after overflow")
+        # Overwritten past the end of the upload: nothing to release
+        end = log.position(10)
+        for timestamp, sensor, raw in samples[:80]:
+            log.append(timestamp, sensor, raw)
+        log.sync()
+        count = log.count()
+        log.release(end)
+        check(log.count() == count, "RingLog.release behind the tail")
+        log.close()
+    print("ring log records: ok")
+
+
+def rate(function, count, repeat=3):
+    best = min(timed(function) for _ in range(repeat))
+    return count / best
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def iso_json(samples):
+    # One JSON measurement per reading, as the firmware used to post
+    return [json.dumps({
+        'sensor_id': SENSORS[sensor],
+        'timestamp': '{:04d}-{:02d}-{:02d}T{:02d}:{:02d}:{:02d}'.format(*time.gmtime(t)[:6]),
+        'temperature': celsius(raw),
+    }).encode() for t, sensor, raw in samples]
+
+
+def throughput(count):
+    samples = [(1760000000 + n * 10 // len(SENSORS), n % len(SENSORS), 320 + n % 97)
+               for n in range(count)]
+    data = encode(samples)
+    body = encode_bulk(SENSORS, samples)
+    payloads = iso_json(samples)
+    print(f"\n{count} samples")
+    print(f"{'Format':>14} | {'Encode/s':>10} | {'Decode/s':>10} | {'B/sample':>8}")
+    rows = (
+        ('records', lambda: encode(samples), lambda: decode(data), len(data)),
+        ('bulk', lambda: encode_bulk(SENSORS, samples), lambda: decode_bulk(body), len(body)),
+        ('JSON + ISO', lambda: iso_json(samples), lambda: [json.loads(p) for p in payloads],
+         sum(len(p) for p in payloads)),
+    )
+    for name, encoder, decoder, size in rows:
+        print(f"{name:>14} | {rate(encoder, count):10.0f} | {rate(decoder, count):10.0f} | "
+              f"{size / count:8.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Binary sample format checks and throughput")
+    parser.add_argument('--count', type=int, default=100000, help="samples for the throughput run")
+    args = parser.parse_args()
+    check_scratchpad()
+    check_round_trip()
+    check_log()
+    throughput(args.count)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,161 @@
+# Stand-in for the hot-boxed-pie API, for throughput testing on a host
+# - Accepts the endpoints the firmware uses: sensor registration, single
+#   measurements, JSON batches and binary bulk uploads; nothing is stored,
+#   every request is validated and counted
+# - Speaks HTTP/1.1 with keep-alive, so persistent clients can be tested
+# - --latency adds a fixed delay per request, to stand in for a slow
+#   server or network
+# - Prints requests, readings and bytes per second every --interval
+#   seconds; GET /stats returns the running totals as JSON
+#
+# python3 host/standin_server.py [--port 3000] [--latency 0.05]
+
+import argparse
+import json
+import os
+import re
+import socket
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Appended, not prepended: the firmware's datetime.py and secrets.py must not
+# shadow the standard library modules of the same name
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from record import decode_bulk
+
+ROUTES = (
+    ('sensors', re.compile(r'^/api/box/[^/]+/sensors/?$')),
+    ('measurement', re.compile(r'^/api/box/[^/]+/measurements/?$')),
+    ('batch', re.compile(r'^/api/box/[^/]+/measurements/batch/?$')),
+    ('bulk', re.compile(r'^/api/box/[^/]+/measurements/bulk/?$')),
+)
+
+
+class Stats:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.totals = {'requests': 0, 'readings': 0, 'bytes': 0, 'errors': 0, 'connections': 0}
+
+    def add(self, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                self.totals[name] += value
+
+    def snapshot(self):
+        with self.lock:
+            return dict(self.totals)
+
+
+def count_readings(route, raw):
+    # Readings in a request body; raises ValueError when it is malformed
+    if route == 'bulk':
+        return len(decode_bulk(raw)[1])
+    body = json.loads(raw)
+    if route == 'sensors':
+        if not body.get('id') or not body.get('name'):
+            raise ValueError('Sensor id and name are required')
+        return 0
+    if route == 'measurement':
+        if not body.get('sensor_id') or not body.get('timestamp') or 'temperature' not in body:
+            raise ValueError('sensor_id, timestamp and temperature are required')
+        return 1
+    sensors = body['sensors']
+    for dt, sensor, centi in body['readings']:
+        if not (isinstance(dt, int) and isinstance(centi, int) and 0 <= sensor < len(sensors)):
+            raise ValueError('Invalid reading')
+    return len(body['readings'])
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    stats = None
+    latency = 0.0
+
+    def setup(self):
+        super().setup()
+        # Headers and body go out in separate writes; without this, Nagle
+        # plus delayed ACKs stall every response on a kept-alive connection
+        self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.stats.add(connections=1)
+
+    def log_message(self, format, *args):
+        pass
+
+    def reply(self, status, data):
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        if self.path == '/stats':
+            self.reply(200, self.stats.snapshot())
+        else:
+            self.reply(404, {'error': 'Not found'})
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        raw = self.rfile.read(length)
+        if self.latency:
+            time.sleep(self.latency)
+        route = next((name for name, pattern in ROUTES if pattern.match(self.path)), None)
+        if route is None:
+            self.stats.add(requests=1, bytes=length, errors=1)
+            return self.reply(404, {'error': 'Not found'})
+        try:
+            readings = count_readings(route, raw)
+        except (ValueError, KeyError, TypeError) as error:
+            self.stats.add(requests=1, bytes=length, errors=1)
+            return self.reply(400, {'error': str(error)})
+        self.stats.add(requests=1, bytes=length, readings=readings)
+        self.reply(201, {'inserted': readings, 'duplicates': 0, 'conflicts': []})
+
+
+def serve(port=3000, latency=0.0, interval=5.0, host='0.0.0.0'):
+    # Start the server on a background thread; returns (server, stats)
+    stats = Stats()
+    handler = type('StandinHandler', (Handler,), {'stats': stats, 'latency': latency})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    if interval:
+        threading.Thread(target=report, args=(stats, interval), daemon=True).start()
+    return server, stats
+
+
+def report(stats, interval):
+    last = stats.snapshot()
+    while True:
+        time.sleep(interval)
+        now = stats.snapshot()
+        delta = {name: now[name] - last[name] for name in now}
+        if delta['requests']:
+            print(f"{delta['requests'] / interval:8.1f} req/s | "
+                  f"{delta['readings'] / interval:8.1f} readings/s | "
+                  f"{delta['bytes'] / interval / 1024:8.1f} KiB/s | "
+                  f"{delta['connections']} connections, {delta['errors']} errors", flush=True)
+        last = now
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Stand-in hot-boxed-pie API for throughput tests")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=3000)
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added per request")
+    parser.add_argument('--interval', type=float, default=5.0, help="seconds between reports")
+    args = parser.parse_args()
+    server, _ = serve(args.port, args.latency, args.interval, args.host)
+    print(f"Stand-in API on http://{args.host}:{args.port} (latency {args.latency * 1e3:.0f} ms)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
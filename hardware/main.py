@@ -1,70 +1,154 @@
+import asyncio
 import machine
 import time
 
-from wifi import connectWifi
-from datetime import iso_timestamp, initTime
+from wifi import superviseWifi
+from datetime import initTime, setTime
 from sensors import (
     getSensorId,
     getSensors,
     convertTemp,
-    readTemp,
+    readRaw,
     getSensorName,
 )
-from api import send_api_request
+from api import AsyncApiClient
+from batch import MeasurementBatch
+from ringlog import RingLog
+from record import celsius
+from schedule import Ticker
 from secrets import HOT_BOX_ID
 
+# A conversion starts every PERIOD_MS; DS18B20s need CONVERSION_MS for one
+# at 12 bits
+PERIOD_MS = 10000
+CONVERSION_MS = 750
+# Clock sync interval, and the wait before retrying a failed sync
+TIME_SYNC_S = 6 * 3600
+TIME_RETRY_S = 60
+# Print the sampling jitter every JITTER_REPORT periods
+JITTER_REPORT = 30
+
 rtc = machine.RTC()
+initTime(rtc)
 
-# Connect to WiFi before starting
-connectWifi()
+client = AsyncApiClient()
+online = asyncio.Event()  # WiFi is connected
+converted = asyncio.Event()  # a conversion finished, sensors can be read
+uploadDue = asyncio.Event()  # the batch wants uploading
+ticker = Ticker(PERIOD_MS)
+sampledAt = 0
 
-# Set Proper Time
-initTime(rtc)
 
 # Register Sensors
-registeredSensors = True
-for device in getSensors():
-    id = getSensorId(device)
-    name = getSensorName(device)
-    print("Registering Sensor", id, name)
-    resp = send_api_request(
-        f"/api/box/{HOT_BOX_ID}/sensors/",
-        data={"id": id, "name": name, "type": "ds18b20"},
-        method="POST",
-    )
-    if resp != None and (resp["status"] == 200 | resp["status"] == 201):
-        print("Sensor registered successfully", id, name)
-    else:
-        registeredSensors = False
-
-if registeredSensors:
-    print("All sensors registered")
-else:
-    print("Failed to register all sensors")
-    exit()
-
-while True:
-    convertTemp()
-    time.sleep_ms(750)
-
-    now = rtc.datetime()
+async def registerSensors():
+    registered = True
     for device in getSensors():
         id = getSensorId(device)
         name = getSensorName(device)
-        c_raw = readTemp(device)
-        print(id, name, c_raw)
-        resp = send_api_request(
-            f"/api/box/{HOT_BOX_ID}/measurements/",
-            data={
-                "sensor_id": id,
-                "timestamp": iso_timestamp(now),
-                "temperature": c_raw,
-            },
+        print("Registering Sensor", id, name)
+        resp = await client.request(
+            f"/api/box/{HOT_BOX_ID}/sensors/",
+            data={"id": id, "name": name, "type": "ds18b20"},
             method="POST",
         )
-        if resp != None and (resp["status"] == 200 | resp["status"] == 201):
-            print(f"Measured {name} ({id}): {c_raw}")
+        if resp != None and resp["status"] in (200, 201):
+            print("Sensor registered successfully", id, name)
+        else:
+            registered = False
+    return registered
+
+
+async def uploadBatch(payload):
+    resp = await client.request(
+        f"/api/box/{HOT_BOX_ID}/measurements/bulk",
+        data=payload,
+        method="POST",
+    )
+    return resp != None and resp["status"] in (200, 201)
+
+
+# Every reading goes to a ring log on flash first; uploads drain it once a
+# minute or every 60 readings, and backfill whatever piled up while WiFi
+# or the server was down
+log = RingLog("measurements.log")
+batch = MeasurementBatch(uploadBatch, log)
+print(f"{log.count()} logged measurements waiting for upload")
+
+
+# The firmware is a set of asyncio tasks. Only convert() runs on a clock;
+# everything that touches the network waits on sockets without blocking,
+# so a slow server or a WiFi outage never shifts the sampling period.
+
+# Conversion scheduling: start a conversion on every sensor each period,
+# on a fixed grid of deadlines, and wake the reader once it is done
+async def convert():
+    global sampledAt
+    while True:
+        await ticker.wait()
+        sampledAt = time.time()
+        convertTemp()
+        await asyncio.sleep_ms(CONVERSION_MS)
+        converted.set()
+
+
+# Reading: log one raw reading per sensor, flag an upload when one is due
+async def read():
+    while True:
+        await converted.wait()
+        converted.clear()
+        for device in getSensors():
+            id = getSensorId(device)
+            name = getSensorName(device)
+            raw = readRaw(device)
+            print(id, name, celsius(raw) if raw is not None else None)
+            if not batch.add(sampledAt, id, raw):
+                print("Failed to read sensor", id, name)
+        batch.sync()
+        if batch.due(time.time()):
+            uploadDue.set()
+        if ticker.jitter.count % JITTER_REPORT == 0:
+            print("Sampling jitter:", ticker.jitter)
+
+
+# Upload queue draining: register the sensors once, then drain the log
+# whenever an upload is due and WiFi is up
+async def drainUploads():
+    registered = False
+    while True:
+        await uploadDue.wait()
+        uploadDue.clear()
+        await online.wait()
+        # Set again while the last upload was in flight: maybe drained already
+        if not batch.due(time.time()):
+            continue
+        if not registered:
+            registered = await registerSensors()
+            if not registered:
+                batch.defer(time.time())
+                print("Failed to register all sensors, logging offline until the server is reachable")
+                continue
+        count = batch.pending()
+        if await batch.upload(time.time()):
+            print(f"Uploaded {count} measurements")
         else:
-            print("Failed to record measurement", id, name, c_raw)
+            print(f"Failed to upload measurements, {batch.pending()} logged ({log.dropped} dropped)")
+
+
+# Time sync: set the clock from NTP once WiFi is up, then every few hours
+async def syncTime():
+    while True:
+        await online.wait()
+        synced = await setTime()
+        await asyncio.sleep(TIME_SYNC_S if synced else TIME_RETRY_S)
+
+
+async def main():
+    # WiFi supervision runs alongside, reconnecting whenever it drops
+    asyncio.create_task(superviseWifi(online))
+    asyncio.create_task(syncTime())
+    asyncio.create_task(drainUploads())
+    asyncio.create_task(read())
+    await convert()
+
 
-    time.sleep(10)
+asyncio.run(main())
@@ -0,0 +1,97 @@
+import struct
+from binascii import hexlify, unhexlify
+
+# Binary sample records, shared by the flash log (ringlog.py) and bulk
+# uploads to /api/box/{HOT_BOX_ID}/measurements/bulk
+# One sample, RECORD, 8 bytes little-endian:
+#   I  epoch seconds
+#   h  raw temperature: 1/16 °C, as the DS18B20 scratchpad holds it
+#   B  sensor index
+#   B  flags: bookkeeping of the flash log, ignored by the server
+# A bulk upload (application/octet-stream) is HEADER (magic b"HB", format
+# version, sensor count), then each sensor's 8-byte ROM code, then the
+# records back to back; the sensor index of a record points into the ROM
+# codes. Every part is a multiple of 4 bytes, so records stay aligned.
+RECORD = "<IhBB"
+RECORD_SIZE = struct.calcsize(RECORD)
+HEADER = "<2sBB"
+HEADER_SIZE = struct.calcsize(HEADER)
+MAGIC = b"HB"
+VERSION = 1
+ROM_SIZE = 8
+
+def celsius(raw):
+    return raw / 16
+
+def to_raw(celsius):
+    return max(-32768, min(32767, round(celsius * 16)))
+
+def scratch_to_raw(family, buf):
+    # Raw temperature from a scratchpad read (ds18x20.read_scratch), for a
+    # sensor of the given ROM family code; None for unknown families
+    if family in (0x22, 0x28):
+        t = buf[1] << 8 | buf[0]
+        return t - 0x10000 if t & 0x8000 else t
+    if family == 0x10:
+        # DS18S20: 1/2 °C steps, refined with the count registers
+        t = buf[1] << 8 | buf[0]
+        if t & 0x8000:
+            t -= 0x10000
+        return to_raw((t >> 1) - 0.25 + (buf[7] - buf[6]) / buf[7])
+    return None
+
+def pack_into(buffer, offset, timestamp, sensor, raw, flags=0):
+    struct.pack_into(RECORD, buffer, offset, timestamp, raw, sensor, flags)
+
+def unpack_from(buffer, offset=0):
+    # (timestamp, sensor, raw) of the record at offset
+    timestamp, raw, sensor, _ = struct.unpack_from(RECORD, buffer, offset)
+    return timestamp, sensor, raw
+
+def encode(samples):
+    # Records for (timestamp, sensor, raw) tuples
+    data = bytearray(RECORD_SIZE * len(samples))
+    for n, (timestamp, sensor, raw) in enumerate(samples):
+        struct.pack_into(RECORD, data, n * RECORD_SIZE, timestamp, raw, sensor, 0)
+    return data
+
+def decode(data):
+    # (timestamp, sensor, raw) tuples of back-to-back records
+    if len(data) % RECORD_SIZE:
+        raise ValueError("Truncated record")
+    return [unpack_from(data, offset) for offset in range(0, len(data), RECORD_SIZE)]
+
+def bulk_prefix(sensors):
+    # Header and ROM codes of a bulk upload, for sensor ids as hex strings
+    if len(sensors) > 255:
+        raise ValueError("Too many sensors")
+    prefix = bytearray(HEADER_SIZE + ROM_SIZE * len(sensors))
+    struct.pack_into(HEADER, prefix, 0, MAGIC, VERSION, len(sensors))
+    for n, sensor_id in enumerate(sensors):
+        rom = unhexlify(sensor_id)
+        if len(rom) != ROM_SIZE:
+            raise ValueError("Invalid sensor id " + sensor_id)
+        prefix[HEADER_SIZE + n * ROM_SIZE:HEADER_SIZE + (n + 1) * ROM_SIZE] = rom
+    return prefix
+
+def encode_bulk(sensors, samples):
+    return bulk_prefix(sensors) + encode(samples)
+
+def decode_bulk(data):
+    # (sensor ids, samples) of a bulk upload; raises ValueError when it is
+    # malformed or a record names an unknown sensor
+    if len(data) < HEADER_SIZE:
+        raise ValueError("Truncated header")
+    magic, version, count = struct.unpack_from(HEADER, data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a version {} bulk upload".format(VERSION))
+    start = HEADER_SIZE + ROM_SIZE * count
+    if len(data) < start:
+        raise ValueError("Truncated sensor table")
+    sensors = [hexlify(data[HEADER_SIZE + n * ROM_SIZE:HEADER_SIZE + (n + 1) * ROM_SIZE]).decode()
+               for n in range(count)]
+    samples = decode(memoryview(data)[start:])
+    for sample in samples:
+        if sample[1] >= count:
+            raise ValueError("Unknown sensor index {}".format(sample[1]))
+    return sensors, samples
@@ -0,0 +1,196 @@
+import os
+import struct
+
+from record import RECORD_SIZE, pack_into, unpack_from
+
+# Flags of a record (record.RECORD)
+VALID = 1
+LAP = 2
+
+def file_size(path):
+    try:
+        return os.stat(path)[6]
+    except OSError:
+        return None
+
+class RingLog:
+    # Fixed-size, append-only log of readings on flash
+    # - `path` holds `capacity` records (record.py) and is preallocated once, so
+    #   the file never grows; records are written in order, wrapping around
+    # - Positions run over two laps (0 .. 2*capacity) and every record
+    #   stores its lap bit, so the write position is found after a reboot
+    #   by a binary search over the records: no header is rewritten on
+    #   every append
+    # - The read position (how far uploads have got) lives in
+    #   `path`.idx and is written only by consume() and release() and,
+    #   while the log is full and overwriting its oldest records, at most
+    #   twice per lap
+    # - append() stages records in RAM; sync() writes them in one go, so
+    #   flash sees one write per acquisition cycle
+    # Wear is bounded: every slot is rewritten once per lap, the index once
+    # per upload. Changing `capacity` starts a new, empty log.
+
+    def __init__(self, path, capacity=4096, chunk=32):
+        self.path = path
+        self.index_path = path + ".idx"
+        self.capacity = capacity
+        self.span = 2 * capacity
+        self.buffer = bytearray(RECORD_SIZE * chunk)
+        self.view = memoryview(self.buffer)
+        self.staged = bytearray(RECORD_SIZE * chunk)
+        self.staged_count = 0
+        self.dropped = 0
+        if file_size(path) != capacity * RECORD_SIZE:
+            self.create()
+        self.file = open(path, "r+b")
+        self.head = self.find_head()
+        self.tail = self.load_tail()
+        self.saved_tail = self.tail
+
+    def create(self):
+        with open(self.path, "wb") as f:
+            for offset in range(0, self.capacity * RECORD_SIZE, len(self.buffer)):
+                f.write(self.view[:min(len(self.buffer), self.capacity * RECORD_SIZE - offset)])
+        try:
+            os.remove(self.index_path)
+        except OSError:
+            pass
+
+    def slot(self, n):
+        # (valid, lap) flags of the record in slot n
+        self.file.seek(n * RECORD_SIZE)
+        self.file.readinto(self.view[:RECORD_SIZE])
+        flags = self.buffer[RECORD_SIZE - 1]
+        return flags & VALID, 1 if flags & LAP else 0
+
+    def find_head(self):
+        # Slots before the write position carry the lap of slot 0, the ones
+        # after it the other lap (or nothing, on the first lap)
+        valid, lap = self.slot(0)
+        if not valid:
+            return 0
+        low, high = 1, self.capacity
+        while low < high:
+            middle = (low + high) // 2
+            if self.slot(middle) == (VALID, lap):
+                low = middle + 1
+            else:
+                high = middle
+        return (low + lap * self.capacity) % self.span
+
+    def load_tail(self):
+        # Read position from the index, checked against the write position
+        try:
+            with open(self.index_path, "rb") as f:
+                stored = struct.unpack("<I", f.read(4))[0] % self.span
+        except (OSError, ValueError, struct.error):
+            stored = None
+        if stored is not None and (self.head - stored) % self.span <= self.capacity:
+            return stored
+        # No index, or the log was overwritten past it: everything still
+        # in the log is unsent. The index is rewritten to match.
+        if not self.slot(self.head % self.capacity)[0]:
+            self.tail = 0
+        else:
+            self.tail = (self.head + self.capacity) % self.span
+        self.save_tail()
+        return self.tail
+
+    def save_tail(self):
+        with open(self.index_path, "wb") as f:
+            f.write(struct.pack("<I", self.tail))
+        self.saved_tail = self.tail
+
+    def count(self):
+        # Synced records not yet consumed
+        return (self.head - self.tail) % self.span
+
+    def append(self, timestamp, sensor, raw):
+        if self.staged_count * RECORD_SIZE == len(self.staged):
+            self.sync()
+        # Flags are filled in by sync(), which knows the lap
+        pack_into(self.staged, self.staged_count * RECORD_SIZE, timestamp, sensor, raw)
+        self.staged_count += 1
+
+    def sync(self):
+        # Write the staged records at the write position
+        if not self.staged_count:
+            return
+        written = 0
+        while written < self.staged_count:
+            slot = self.head % self.capacity
+            count = min(self.staged_count - written, self.capacity - slot)
+            flags = VALID | (LAP if self.head >= self.capacity else 0)
+            for n in range(written, written + count):
+                self.staged[n * RECORD_SIZE + RECORD_SIZE - 1] = flags
+            self.file.seek(slot * RECORD_SIZE)
+            self.file.write(memoryview(self.staged)[written * RECORD_SIZE:(written + count) * RECORD_SIZE])
+            self.head = (self.head + count) % self.span
+            written += count
+        self.file.flush()
+        self.staged_count = 0
+
+        overflow = self.count() - self.capacity
+        if overflow > 0:
+            # Full: the oldest unsent records were overwritten
+            self.tail = (self.tail + overflow) % self.span
+            self.dropped += overflow
+            if (self.tail - self.saved_tail) % self.span >= self.capacity // 2:
+                self.save_tail()
+
+    def readinto(self, view, skip=0):
+        # Copy the oldest unsent records after the first `skip`, as stored,
+        # into view (as many as fit); returns their count. They stay in the
+        # log until consume().
+        count = max(0, min(len(view) // RECORD_SIZE, self.count() - skip))
+        position = (self.tail + skip) % self.span
+        done = 0
+        while done < count:
+            slot = position % self.capacity
+            n = min(count - done, self.capacity - slot)
+            self.file.seek(slot * RECORD_SIZE)
+            self.file.readinto(view[done * RECORD_SIZE:(done + n) * RECORD_SIZE])
+            position = (position + n) % self.span
+            done += n
+        return count
+
+    def read(self, count):
+        # Up to `count` of the oldest unsent records as (timestamp, sensor,
+        # raw) tuples
+        records = []
+        chunk = len(self.buffer) // RECORD_SIZE
+        while len(records) < count:
+            n = self.readinto(self.view[:min(count - len(records), chunk) * RECORD_SIZE], len(records))
+            if not n:
+                break
+            for i in range(n):
+                records.append(unpack_from(self.buffer, i * RECORD_SIZE))
+        return records
+
+    def oldest(self):
+        # Timestamp of the oldest unsent record, or None
+        if not self.count():
+            return None
+        return self.read(1)[0][0]
+
+    def consume(self, count):
+        # Mark the oldest `count` records as sent
+        self.tail = (self.tail + min(count, self.count())) % self.span
+        self.save_tail()
+
+    def position(self, count):
+        # Position just past the oldest `count` unsent records
+        return (self.tail + min(count, self.count())) % self.span
+
+    def release(self, position):
+        # Mark the records before `position` (from position()) as sent.
+        # If the log overflowed since, the tail may already be past it: the
+        # overwritten records were counted in `dropped` and newer ones must
+        # stay unsent.
+        if (position - self.tail) % self.span <= self.count():
+            self.tail = position
+            self.save_tail()
+
+    def close(self):
+        self.sync()
+        self.file.close()
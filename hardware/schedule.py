@@ -0,0 +1,45 @@
+import asyncio
+import time
+
+class Jitter:
+    # Scheduling jitter of a periodic task: how late, in ms, it woke after
+    # each deadline, and how many periods it missed outright
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.max = 0
+        self.last = 0
+        self.missed = 0
+
+    def add(self, late, missed=0):
+        self.count += 1
+        self.total += late
+        self.max = max(self.max, late)
+        self.last = late
+        self.missed += missed
+
+    def mean(self):
+        return self.total / self.count if self.count else 0
+
+    def __str__(self):
+        return "last {} ms, mean {:.1f} ms, max {} ms over {} periods, {} missed".format(
+            self.last, self.mean(), self.max, self.count, self.missed)
+
+class Ticker:
+    # Wakes a task every `period_ms` on a fixed grid of deadlines
+    # (ticks_ms), so time spent between waits never shifts the period.
+    # Periods that are already over when wait() is called are skipped, not
+    # caught up in a burst.
+    def __init__(self, period_ms):
+        self.period_ms = period_ms
+        self.deadline = time.ticks_ms()
+        self.jitter = Jitter()
+
+    async def wait(self):
+        delay = time.ticks_diff(self.deadline, time.ticks_ms())
+        if delay > 0:
+            await asyncio.sleep_ms(delay)
+        late = time.ticks_diff(time.ticks_ms(), self.deadline)
+        missed = late // self.period_ms
+        self.jitter.add(late - missed * self.period_ms, missed)
+        self.deadline = time.ticks_add(self.deadline, (missed + 1) * self.period_ms)
@@ -2,6 +2,7 @@ import machine
 import binascii
 import onewire
 import ds18x20
+from record import scratch_to_raw
 
 # Sensor Mapping
 sensor_mapping = {"28b87f230d000052": "A Side", "28f475b80e000076": "B Side"}
@@ -42,3 +43,11 @@ def convertTemp():
 
 def readTemp(device):
     return ds18b20_sensor.read_temp(device)
+
+
+def readRaw(device):
+    # Temperature as the raw scratchpad value, 1/16 °C; None on a CRC error
+    try:
+        return scratch_to_raw(device[0], ds18b20_sensor.read_scratch(device))
+    except AssertionError:
+        return None
@@ -1,3 +1,4 @@
+import asyncio
 import network
 import time
 
@@ -32,3 +33,34 @@ def connectWifi():
     else:
         print("Failed to connect to WiFi")
         return False
+
+
+# Keep WiFi up in the background: `online` (an asyncio.Event) is set while
+# connected, so network tasks can wait for it. Reconnecting polls between
+# sleeps instead of blocking like connectWifi().
+async def superviseWifi(online, interval=10, max_wait=10):
+    try:
+        from secrets import WIFI_SSID, WIFI_PASSWORD
+    except ImportError:
+        print("Warning: secrets.py not found, skipping WiFi connection")
+        return
+
+    wlan = network.WLAN(network.STA_IF)
+    wlan.active(True)
+    while True:
+        if not wlan.isconnected():
+            online.clear()
+            print(f"Connecting to WiFi: {WIFI_SSID}")
+            wlan.disconnect()
+            wlan.connect(WIFI_SSID, WIFI_PASSWORD)
+            for _ in range(max_wait):
+                await asyncio.sleep(1)
+                if wlan.isconnected():
+                    break
+            if wlan.isconnected():
+                print(f"Connected! IP: {wlan.ifconfig()[0]}")
+            else:
+                print("Failed to connect to WiFi")
+        if wlan.isconnected():
+            online.set()
+        await asyncio.sleep(interval)
@@ -50,6 +50,15 @@ export async function initializeDatabase() {
   }
 }
 
+// Lookup of a sensor's measurement at a timestamp, used to recognise
+// re-sent uploads (utils/measurements.js createMeasurements). Not unique:
+// existing rows are never touched. Databases created before it get it from
+// scripts/index-measurements.js.
+export const MEASUREMENT_INDEX = `
+        CREATE INDEX IF NOT EXISTS measurements_sensor_timestamp
+        ON measurements (sensor_id, timestamp)
+    `;
+
 // Initialize a new box database with sensor support
 export async function initializeBoxDatabase(boxId) {
   const db = await openBoxDb(boxId);
@@ -77,5 +86,7 @@ export async function initializeBoxDatabase(boxId) {
         )
     `);
 
+  await db.exec(MEASUREMENT_INDEX);
+
   return db;
 }
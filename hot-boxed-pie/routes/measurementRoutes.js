@@ -4,6 +4,9 @@ import { boxExists } from "../middleware/boxExists.js";
 import {
   getMeasurementById,
   createMeasurement,
+  createMeasurements,
+  decodeBulk,
+  epochToIso,
 } from "../utils/measurements.js";
 
 const router = express.Router();
@@ -99,4 +102,90 @@ router.post("/:boxId/measurements", boxExists, async (req, res) => {
   }
 });
 
+// Re-sent readings whose values differ from the stored ones are kept out
+// of the database; they are returned to the uploader and logged here
+function reportConflicts(boxId, conflicts) {
+  if (conflicts.length) {
+    console.warn(
+      `Box ${boxId}: ${conflicts.length} measurements conflict with stored ones:`,
+      JSON.stringify(conflicts.slice(0, 10)),
+    );
+  }
+}
+
+// Batched upload from the hardware: many readings in one compact request
+// {
+//   "t0": 1760000000,                 // epoch seconds of the first reading
+//   "sensors": ["28b87f230d000052"],  // sensor ids, referenced by index
+//   "readings": [[0, 0, 2150], ...]   // [seconds after t0, sensor, °C x 100]
+// }
+router.post("/:boxId/measurements/batch", boxExists, async (req, res) => {
+  try {
+    const { t0, sensors, readings } = req.body;
+
+    if (!Number.isInteger(t0) || !Array.isArray(sensors) || !Array.isArray(readings)) {
+      return res
+        .status(400)
+        .json({ error: "t0, sensors and readings are required" });
+    }
+
+    const measurements = [];
+    for (const reading of readings) {
+      const [dt, sensor, centi] = Array.isArray(reading) ? reading : [];
+      const sensor_id = sensors[sensor];
+      if (!Number.isInteger(dt) || !Number.isInteger(centi) || !sensor_id) {
+        return res
+          .status(400)
+          .json({ error: `Invalid reading: ${JSON.stringify(reading)}` });
+      }
+      measurements.push({
+        sensor_id,
+        timestamp: epochToIso(t0 + dt),
+        temperature: centi / 100,
+      });
+    }
+
+    const result = await createMeasurements(req.params.boxId, measurements);
+    reportConflicts(req.params.boxId, result.conflicts);
+    return res.status(201).json(result);
+  } catch (error) {
+    if (error.message === "Sensor not found") {
+      return res.status(404).json({ error: error.message });
+    }
+    console.error("Error adding measurements:", error);
+    res.status(500).json({ error: "Failed to add measurements" });
+  }
+});
+
+// Binary bulk upload from the hardware: fixed-width 8-byte records behind
+// a sensor table, as logged on the device (format in decodeBulk)
+router.post(
+  "/:boxId/measurements/bulk",
+  boxExists,
+  express.raw({ type: "application/octet-stream", limit: "1mb" }),
+  async (req, res) => {
+    let measurements;
+    try {
+      if (!Buffer.isBuffer(req.body)) {
+        throw new Error("Expected an application/octet-stream body");
+      }
+      measurements = decodeBulk(req.body);
+    } catch (error) {
+      return res.status(400).json({ error: error.message });
+    }
+
+    try {
+      const result = await createMeasurements(req.params.boxId, measurements);
+      reportConflicts(req.params.boxId, result.conflicts);
+      return res.status(201).json(result);
+    } catch (error) {
+      if (error.message === "Sensor not found") {
+        return res.status(404).json({ error: error.message });
+      }
+      console.error("Error adding measurements:", error);
+      res.status(500).json({ error: "Failed to add measurements" });
+    }
+  },
+);
+
 export default router;
@@ -0,0 +1,34 @@
+// Add the (sensor_id, timestamp) lookup index to box databases created
+// before it, so re-sent uploads are recognised without a table scan.
+// Run once from the hot-boxed-pie directory, with the server stopped:
+//
+//   node scripts/index-measurements.js
+//
+// No rows are changed. Sensors with more than one measurement at the same
+// timestamp (stored before uploads were checked for re-sends) are listed
+// for review; they stay in the database as they are.
+import { openCommonDb, openBoxDb, MEASUREMENT_INDEX } from "../db.js";
+
+const common = await openCommonDb();
+const boxes = await common.all("SELECT id FROM boxes");
+
+for (const box of boxes) {
+  const boxDb = await openBoxDb(box.id);
+  await boxDb.exec(MEASUREMENT_INDEX);
+  const repeated = await boxDb.all(`
+        SELECT sensor_id, timestamp, COUNT(*) AS count,
+               COUNT(DISTINCT temperature) AS temperatures
+        FROM measurements
+        GROUP BY sensor_id, timestamp
+        HAVING COUNT(*) > 1
+    `);
+  console.log(`Box ${box.id}: indexed, ${repeated.length} repeated timestamps`);
+  for (const row of repeated) {
+    const kind = row.temperatures > 1 ? "conflicting" : "identical";
+    console.log(
+      `  ${row.sensor_id} ${row.timestamp}: ${row.count} ${kind} measurements`,
+    );
+  }
+  await boxDb.close();
+}
+await common.close();
@@ -34,3 +34,124 @@ export async function createMeasurement(boxId, data) {
 
   return result.lastID;
 }
+
+// Device timestamps are stored like the firmware's iso_timestamp: UTC,
+// seconds precision, no zone suffix
+export function epochToIso(seconds) {
+  return new Date(seconds * 1000).toISOString().slice(0, 19);
+}
+
+// Binary bulk upload from the hardware (hardware/record.py):
+// - header: "HB", format version 1, sensor count (u8)
+// - each sensor's 8-byte ROM code; the sensor id is its hex string
+// - 8-byte records, little-endian: epoch seconds (u32), temperature in
+//   1/16 °C (i16), sensor index (u8), flags (u8, ignored)
+const BULK_HEADER_SIZE = 4;
+const ROM_SIZE = 8;
+const RECORD_SIZE = 8;
+
+export function decodeBulk(buffer) {
+  if (
+    buffer.length < BULK_HEADER_SIZE ||
+    buffer.toString("latin1", 0, 2) !== "HB" ||
+    buffer[2] !== 1
+  ) {
+    throw new Error("Not a version 1 bulk upload");
+  }
+  const count = buffer[3];
+  const start = BULK_HEADER_SIZE + ROM_SIZE * count;
+  if (buffer.length < start || (buffer.length - start) % RECORD_SIZE) {
+    throw new Error("Truncated bulk upload");
+  }
+
+  const sensors = [];
+  for (let n = 0; n < count; n++) {
+    const offset = BULK_HEADER_SIZE + n * ROM_SIZE;
+    sensors.push(buffer.toString("hex", offset, offset + ROM_SIZE));
+  }
+
+  const measurements = [];
+  for (let offset = start; offset < buffer.length; offset += RECORD_SIZE) {
+    const sensor_id = sensors[buffer.readUInt8(offset + 6)];
+    if (!sensor_id) {
+      throw new Error(`Unknown sensor index ${buffer.readUInt8(offset + 6)}`);
+    }
+    measurements.push({
+      sensor_id,
+      timestamp: epochToIso(buffer.readUInt32LE(offset)),
+      temperature: buffer.readInt16LE(offset + 4) / 16,
+    });
+  }
+  return measurements;
+}
+
+// Insert many measurements in one transaction. The hardware re-sends an
+// upload when the response is lost, so a measurement already stored for
+// the same sensor and timestamp is not inserted again: with the same values
+// it counts as a duplicate, with different ones as a conflict, reported
+// back and left as stored. Returns { inserted, duplicates, conflicts }.
+export async function createMeasurements(boxId, measurements) {
+  const boxDb = await openBoxDb(boxId);
+
+  // Verify every referenced sensor exists, once per sensor
+  const sensorIds = [...new Set(measurements.map((m) => m.sensor_id))];
+  for (const sensorId of sensorIds) {
+    const sensor = await boxDb.get(
+      "SELECT id FROM sensors WHERE id = ?",
+      sensorId,
+    );
+    if (!sensor) {
+      throw new Error("Sensor not found");
+    }
+  }
+
+  const lookup = await boxDb.prepare(
+    "SELECT temperature, humidity FROM measurements WHERE sensor_id = ? AND timestamp = ? LIMIT 1",
+  );
+  const insert = await boxDb.prepare(
+    "INSERT INTO measurements (sensor_id, timestamp, temperature, humidity, notes) VALUES (?, ?, ?, ?, ?)",
+  );
+  let inserted = 0;
+  let duplicates = 0;
+  const conflicts = [];
+  // IMMEDIATE: take the write lock before the lookups, so two uploads of
+  // the same readings cannot both find them missing
+  await boxDb.exec("BEGIN IMMEDIATE");
+  try {
+    for (const m of measurements) {
+      const humidity = m.humidity || null;
+      const stored = await lookup.get([m.sensor_id, m.timestamp]);
+      if (!stored) {
+        await insert.run([
+          m.sensor_id,
+          m.timestamp,
+          m.temperature,
+          humidity,
+          m.notes || null,
+        ]);
+        inserted++;
+      } else if (
+        stored.temperature === m.temperature &&
+        stored.humidity === humidity
+      ) {
+        duplicates++;
+      } else {
+        conflicts.push({
+          sensor_id: m.sensor_id,
+          timestamp: m.timestamp,
+          stored: { temperature: stored.temperature, humidity: stored.humidity },
+          received: { temperature: m.temperature, humidity },
+        });
+      }
+    }
+    await boxDb.exec("COMMIT");
+  } catch (error) {
+    await boxDb.exec("ROLLBACK");
+    throw error;
+  } finally {
+    await lookup.finalize();
+    await insert.finalize();
+  }
+
+  return { inserted, duplicates, conflicts };
+}
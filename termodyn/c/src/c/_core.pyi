@@ -1 +1,19 @@
+import numpy as np
+import numpy.typing as npt
+
 def hello_from_bin() -> str: ...
+def explicit_step(
+    src: npt.NDArray[np.float64],
+    dst: npt.NDArray[np.float64],
+    alpha_dt: float,
+    dx: float,
+    dy: float,
+    T_ambient: float,
+    T_hot_surface: float,
+    h: float,
+    emissivity_sigma: float,
+    k_over_dx: float,
+    dt: float,
+    heat_capacity: float,
+    use_convection_radiation: bool,
+) -> float: ...
@@ -1,13 +1,103 @@
 #include <pybind11/pybind11.h>
+#include <pybind11/numpy.h>
+
+#include <algorithm>
+#include <cmath>
+#include <stdexcept>
 
 std::string hello_from_bin() { return "Hello from c!"; }
 
 namespace py = pybind11;
 
+using Grid = py::array_t<double, py::array::c_style>;
+
+// Convection + radiation edge update of termopy's HeatTransferSimulation,
+// in the same operation order as its NumPy path
+static inline double cool_edge(double T, double T_ambient, double h,
+                               double emissivity_sigma, double T_amb_K4,
+                               double k_over_dx, double dt, double heat_capacity) {
+  double q_conv = (T - T_ambient) * h;
+  double T_K = T + 273.15;
+  double q_rad = (std::pow(T_K, 4.0) - T_amb_K4) * emissivity_sigma;
+  double heat_loss = (q_conv + q_rad) / k_over_dx;
+  return T - heat_loss * dt / heat_capacity;
+}
+
+// One explicit time step of the 2D plate, src -> dst, in a single pass:
+// interior 5-point stencil, edge boundary conditions and the largest
+// absolute change. Returns that change.
+double explicit_step(Grid src, Grid dst, double alpha_dt, double dx, double dy,
+                     double T_ambient, double T_hot_surface, double h,
+                     double emissivity_sigma, double k_over_dx, double dt,
+                     double heat_capacity, bool use_convection_radiation) {
+  if (src.ndim() != 2 || dst.ndim() != 2 || src.shape(0) != dst.shape(0) ||
+      src.shape(1) != dst.shape(1)) {
+    throw std::invalid_argument("src and dst must be 2D arrays of the same shape");
+  }
+  const py::ssize_t H = src.shape(0), W = src.shape(1);
+  if (H < 3 || W < 3) {
+    throw std::invalid_argument("grid needs at least 3x3 points");
+  }
+  const double *s = src.data();
+  double *d = dst.mutable_data();
+  const double dx2 = dx * dx, dy2 = dy * dy;
+  const double T_amb_K = T_ambient + 273.15;
+  const double T_amb_K4 = std::pow(T_amb_K, 4);
+  double largest = 0.0;
+
+  auto edge = [&](double T) {
+    return use_convection_radiation
+               ? cool_edge(T, T_ambient, h, emissivity_sigma, T_amb_K4, k_over_dx, dt, heat_capacity)
+               : T_ambient;
+  };
+  auto store = [&](py::ssize_t k, double value) {
+    largest = std::max(largest, std::fabs(value - s[k]));
+    d[k] = value;
+  };
+
+  {
+    py::gil_scoped_release release;
+
+    // Bottom row: corners keep their value (ambient without convection)
+    store(0, use_convection_radiation ? s[0] : T_ambient);
+    for (py::ssize_t j = 1; j < W - 1; ++j) store(j, edge(s[j]));
+    store(W - 1, use_convection_radiation ? s[W - 1] : T_ambient);
+
+    for (py::ssize_t i = 1; i < H - 1; ++i) {
+      const double *up = s + (i + 1) * W, *row = s + i * W, *down = s + (i - 1) * W;
+      store(i * W, edge(row[0]));
+      for (py::ssize_t j = 1; j < W - 1; ++j) {
+        double c = row[j];
+        double ly = ((up[j] - c * 2) + down[j]) / dy2;
+        double lx = ((row[j + 1] - c * 2) + row[j - 1]) / dx2;
+        store(i * W + j, c + (ly + lx) * alpha_dt);
+      }
+      store(i * W + W - 1, edge(row[W - 1]));
+    }
+
+    // Top row always at the hot surface temperature
+    for (py::ssize_t j = 0; j < W; ++j) store((H - 1) * W + j, T_hot_surface);
+  }
+  return largest;
+}
+
 PYBIND11_MODULE(_core, m) {
   m.doc() = "pybind11 hello module";
 
   m.def("hello_from_bin", &hello_from_bin, R"pbdoc(
       A function that returns a Hello string.
   )pbdoc");
+
+  m.def("explicit_step", &explicit_step, py::arg("src"), py::arg("dst").noconvert(),
+        py::arg("alpha_dt"), py::arg("dx"), py::arg("dy"), py::arg("T_ambient"),
+        py::arg("T_hot_surface"), py::arg("h"), py::arg("emissivity_sigma"),
+        py::arg("k_over_dx"), py::arg("dt"), py::arg("heat_capacity"),
+        py::arg("use_convection_radiation"), R"pbdoc(
+      One fused explicit step of the 2D plate from src into dst.
+
+      Applies the interior 5-point stencil and the edge boundary conditions
+      (convection + radiation, or fixed ambient; top edge at T_hot_surface)
+      in a single pass and returns the largest absolute change. dst must be
+      a C-contiguous float64 array; it is written in place.
+  )pbdoc");
 }
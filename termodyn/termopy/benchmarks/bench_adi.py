@@ -0,0 +1,39 @@
+# Wall-time benchmark: explicit time stepping vs the ADI backend
+# - Both backends run to the same CONVERGENCE_THRESHOLD on n x n grids
+# - Reports time steps, DT, wall time and the largest difference between
+#   the two converged fields. The threshold bounds the change per step, so
+#   the explicit run stops further from the true steady state than ADI does
+#   with its much larger steps; most of that difference is explicit error.
+#
+# uv run benchmarks/bench_adi.py [grid_size ...]
+
+import sys
+
+import numpy as np
+
+from bench_memory import make_simulation
+
+
+def run(n, solver, use_convection_radiation=True):
+    sim = make_simulation(n, solver)
+    sim.MAX_ITERATIONS = 10**6
+    grid = sim.run_simulation(use_convection_radiation)
+    return sim, grid
+
+
+def main(sizes=(50, 100, 200)):
+    print(f"{'Grid':>6} | {'Solver':>8} | {'DT (s)':>9} | {'Steps':>7} | "
+          f"{'Time (s)':>9} | {'Speedup':>7} | {'Max |ΔT| (°C)':>13}")
+    for n in sizes:
+        explicit, grid_explicit = run(n, 'explicit')
+        adi, grid_adi = run(n, 'adi')
+        diff = np.max(np.abs(grid_adi - grid_explicit))
+        speedup = explicit.run_stats['wall_time'] / adi.run_stats['wall_time']
+        for sim, extra in ((explicit, ''), (adi, f"{speedup:7.1f} | {diff:13.4f}")):
+            stats = sim.run_stats
+            print(f"{n:6d} | {sim.solver:>8} | {sim.DT:9.2e} | {stats['iterations']:7d} | "
+                  f"{stats['wall_time']:9.3f} | {extra}")
+
+
+if __name__ == "__main__":
+    main(tuple(map(int, sys.argv[1:])) or (50, 100, 200))
@@ -0,0 +1,62 @@
+# Memory benchmark for the double-buffered explicit stepper
+# - Runs HeatTransferSimulation.step on a large grid (1000x1000 by default)
+# - Samples peak RSS after every block of steps; it must stay flat
+# - Uses tracemalloc to record the transient heap peak per block of steps;
+#   no arrays are allocated, only NumPy's fixed-size iterator buffer for
+#   strided operands shows up, and it is released within each ufunc call
+#
+# uv run benchmarks/bench_memory.py [grid_size] [steps]
+
+import resource
+import sys
+import tracemalloc
+
+from termopy.config import SimulationConfig
+from termopy.HeatTransferSimulation import HeatTransferSimulation
+
+
+def make_simulation(n, solver='explicit'):
+    # Default plate on an n x n grid, headless
+    config = SimulationConfig(WIDTH=n, HEIGHT=n)
+    return HeatTransferSimulation(config, solver=solver, verbose=False)
+
+
+def peak_rss_mb():
+    # ru_maxrss is reported in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main(n=1000, steps=500, block=50):
+    sim = make_simulation(n)
+    buffers = sim.allocate_buffers()
+    grid, grid_next = buffers.grids
+    grid.fill(sim.T_ambient)
+    grid[-1, :] = sim.T_hot_surface
+
+    # Warm-up step so every buffer page has been touched once
+    sim.step(grid, grid_next, buffers)
+    grid, grid_next = grid_next, grid
+    baseline = peak_rss_mb()
+
+    print(f"Grid {n}x{n}, {steps} steps, buffers {n * n * 8 * 4 / 2**20:.0f} MB")
+    print(f"{'Steps':>8} | {'Peak RSS (MB)':>14} | {'Growth (MB)':>12} | {'Transient (B)':>14}")
+
+    tracemalloc.start()
+    for done in range(block, steps + 1, block):
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        for _ in range(block):
+            sim.step(grid, grid_next, buffers)
+            grid, grid_next = grid_next, grid
+        _, peak = tracemalloc.get_traced_memory()
+        rss = peak_rss_mb()
+        print(f"{done:8d} | {rss:14.1f} | {rss - baseline:12.1f} | {peak - before:14d}")
+    tracemalloc.stop()
+
+    growth = peak_rss_mb() - baseline
+    print(f"Peak RSS growth after warm-up: {growth:.1f} MB")
+    return growth
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:3]))
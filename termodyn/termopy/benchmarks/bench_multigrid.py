@@ -0,0 +1,41 @@
+# Scaling benchmark for the multigrid steady-state solver
+# - Solves the steady plate on n x n grids with solve_steady_state
+# - Multigrid V-cycles should stay roughly constant as n grows
+# - Setup (hierarchy construction) and a repeated solve are timed apart
+# - Sparse LU is run for comparison up to DIRECT_LIMIT nodes per side
+#
+# uv run benchmarks/bench_multigrid.py [grid_size ...]
+
+import sys
+import time
+
+import numpy as np
+
+from bench_memory import make_simulation
+
+DIRECT_LIMIT = 400
+
+
+def main(sizes=(50, 200, 800, 1600)):
+    print(f"{'Grid':>6} | {'V-cycles':>8} | {'Setup+solve (s)':>15} | {'Solve (s)':>9} | "
+          f"{'LU (s)':>8} | {'Max |MG-LU| (°C)':>16}")
+    for n in sizes:
+        sim = make_simulation(n)
+        start = time.perf_counter()
+        sim.solve_steady_state(method='multigrid')
+        first = time.perf_counter() - start
+        grid = sim.solve_steady_state(method='multigrid')
+        stats = sim.run_stats
+
+        lu_time, diff = '--', '--'
+        if n <= DIRECT_LIMIT:
+            reference = sim.solve_steady_state(method='direct')
+            lu_time = f"{sim.run_stats['wall_time']:.3f}"
+            diff = f"{np.max(np.abs(grid - reference)):.2e}"
+
+        print(f"{n:6d} | {stats['iterations']:8d} | {first:15.3f} | {stats['wall_time']:9.3f} | "
+              f"{lu_time:>8} | {diff:>16}")
+
+
+if __name__ == "__main__":
+    main(tuple(map(int, sys.argv[1:])) or (50, 200, 800, 1600))
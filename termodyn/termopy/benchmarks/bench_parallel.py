@@ -0,0 +1,63 @@
+# Strong-scaling benchmark for the strip-decomposed explicit stepper
+# - Fixed n x n grid (4000x4000 by default), a fixed number of steps with
+#   the convergence check after every step, like run_simulation
+# - Runs with 1, 2, 4, ... worker threads up to the number of cores and
+#   reports time per step, speedup over one worker and parallel efficiency
+# - Also checks every run against the serial stepper, bit for bit
+# The stencil is memory-bound: expect scaling to flatten once the strips
+# saturate memory bandwidth, well before 32 cores on most machines.
+# Recorded results: single core only (1000x1000, 20 steps: 13.4-13.9
+# ms/step for 1-4 workers, bit-identical). No multi-core run has been
+# recorded yet; add one here before relying on the threaded stepper.
+#
+# uv run benchmarks/bench_parallel.py [grid_size] [steps] [max_workers]
+
+import os
+import sys
+import time
+
+import numpy as np
+
+from termopy.config import SimulationConfig
+from termopy.HeatTransferSimulation import HeatTransferSimulation
+from termopy.parallel import ParallelHeatTransferSimulation
+
+
+def advance(sim, steps):
+    # Seconds per step (step + convergence check) and the final grid
+    buffers = sim.allocate_buffers()
+    grid, grid_next = buffers.grids
+    grid.fill(sim.T_ambient)
+    grid[-1, :] = sim.T_hot_surface
+    start = time.perf_counter()
+    for _ in range(steps):
+        sim.step(grid, grid_next, buffers)
+        sim.max_change(grid, grid_next, buffers)
+        grid, grid_next = grid_next, grid
+    return (time.perf_counter() - start) / steps, grid.copy()
+
+
+def main(n=4000, steps=20, max_workers=None):
+    config = SimulationConfig(WIDTH=n, HEIGHT=n)
+    max_workers = max_workers or os.cpu_count()
+    counts = [1]
+    while counts[-1] * 2 <= max_workers:
+        counts.append(counts[-1] * 2)
+    if counts[-1] != max_workers:
+        counts.append(max_workers)
+
+    serial, reference = advance(HeatTransferSimulation(config, verbose=False), steps)
+    print(f"Grid {n}x{n}, {steps} steps, serial {serial * 1e3:.1f} ms/step")
+    print(f"{'Workers':>7} | {'ms/step':>8} | {'Speedup':>7} | {'Efficiency':>10} | {'Identical':>9}")
+    base = None
+    for workers in counts:
+        with ParallelHeatTransferSimulation(config, workers=workers, verbose=False) as sim:
+            seconds, grid = advance(sim, steps)
+        base = base or seconds
+        print(f"{workers:7d} | {seconds * 1e3:8.1f} | {base / seconds:7.2f} | "
+              f"{base / seconds / workers:10.0%} | {str(np.array_equal(grid, reference)):>9}")
+
+
+if __name__ == "__main__":
+    args = list(map(int, sys.argv[1:]))
+    main(*args)
@@ -0,0 +1,76 @@
+# Cost of recording a transient field history
+# - Runs the same explicit march three ways: no recording, a snapshot every
+#   `every` steps through write_snapshots (one .npy file per frame) and
+#   through a SnapshotWriter store (compressed chunks, background writer)
+# - Reports wall time, frames and bytes on disk, then times reading back a
+#   tenth of the history from the store
+#
+# uv run benchmarks/bench_snapshots.py [grid_size] [steps] [every]
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from termopy.config import SimulationConfig
+from termopy.HeatTransferSimulation import HeatTransferSimulation
+from termopy.snapshots import SnapshotReader, SnapshotWriter
+from termopy.transient import write_snapshots
+
+
+def disk_usage(path):
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def frames(sim, steps, every):
+    # Frames of an explicit march, every `every` steps
+    buffers = sim.allocate_buffers()
+    grid, grid_next = buffers.grids
+    grid.fill(sim.T_ambient)
+    grid[-1, :] = sim.T_hot_surface
+    for iteration in range(steps + 1):
+        if iteration % every == 0:
+            yield sim.snapshot(grid, iteration)
+        sim.step(grid, grid_next, buffers)
+        grid, grid_next = grid_next, grid
+
+
+def main(n=400, steps=4000, every=20):
+    sim = HeatTransferSimulation(SimulationConfig(WIDTH=n, HEIGHT=n), verbose=False)
+    root = tempfile.mkdtemp()
+    try:
+        start = time.perf_counter()
+        for _ in frames(sim, steps, every):
+            pass
+        baseline = time.perf_counter() - start
+        print(f"Grid {n}x{n}, {steps} steps, a frame every {every}")
+        print(f"{'Sink':>14} | {'Wall (s)':>8} | {'Frames':>6} | {'MB on disk':>10}")
+        print(f"{'none':>14} | {baseline:8.2f} | {'':>6} | {'':>10}")
+
+        path = os.path.join(root, 'npy')
+        start = time.perf_counter()
+        count = write_snapshots(frames(sim, steps, every), path)
+        print(f"{'npy per frame':>14} | {time.perf_counter() - start:8.2f} | {count:6d} | "
+              f"{disk_usage(path) / 1e6:10.1f}")
+
+        path = os.path.join(root, 'store')
+        start = time.perf_counter()
+        with SnapshotWriter(path) as writer:
+            for frame in frames(sim, steps, every):
+                writer.write(frame)
+        print(f"{'chunked store':>14} | {time.perf_counter() - start:8.2f} | {len(writer):6d} | "
+              f"{disk_usage(path) / 1e6:10.1f}")
+
+        reader = SnapshotReader(path)
+        start = time.perf_counter()
+        history = reader.between(reader.times[len(reader) // 2], reader.times[len(reader) * 6 // 10])
+        print(f"Read {len(history)} frames from the store in "
+              f"{(time.perf_counter() - start) * 1e3:.1f} ms")
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == "__main__":
+    args = list(map(int, sys.argv[1:]))
+    main(*args)
@@ -0,0 +1,62 @@
+# Cold-start cost of the termopy CLI
+# - Runs each command `repeat` times in a fresh interpreter and reports the
+#   median wall time next to a bare `python -c pass`
+# - `run` uses a tiny cached config, so it measures startup, not solving
+# - Finally lists which heavy modules a cached `run` imported: none, since
+#   hits are answered from the cache metadata (matplotlib should only ever
+#   appear for `plot`, NumPy only when a run has to be computed)
+#
+# uv run benchmarks/bench_startup.py [repeat]
+
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HEAVY = ('numpy', 'scipy', 'pandas', 'matplotlib')
+
+
+def wall_time(command, repeat, env):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, env=env, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(repeat=10):
+    with tempfile.TemporaryDirectory() as root:
+        config = os.path.join(root, 'plate.json')
+        with open(config, 'w') as f:
+            json.dump({'WIDTH': 10, 'HEIGHT': 10}, f)
+        env = dict(os.environ, TERMOPY_CACHE_DIR=os.path.join(root, 'cache'))
+        cli = [sys.executable, '-m', 'termopy']
+        # Fill the cache once
+        subprocess.run(cli + ['run', config], check=True, env=env, stdout=subprocess.DEVNULL)
+
+        commands = [
+            ('python -c pass', [sys.executable, '-c', 'pass']),
+            ('import termopy', [sys.executable, '-c', 'import termopy']),
+            ('termopy --help', cli + ['--help']),
+            ('termopy run --help', cli + ['run', '--help']),
+            ('termopy run (cached)', cli + ['run', config]),
+        ]
+        print(f"Median of {repeat} cold starts")
+        print(f"{'Command':>22} | {'ms':>7}")
+        for name, command in commands:
+            print(f"{name:>22} | {wall_time(command, repeat, env) * 1e3:7.1f}")
+
+        probe = ("import sys; from termopy.cli import main; main(['run', sys.argv[1]]); "
+                 f"print(*[name for name in {HEAVY!r} if name in sys.modules], file=sys.stderr)")
+        loaded = subprocess.run([sys.executable, '-c', probe, config], check=True, env=env,
+                                stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+        print(f"Heavy modules loaded by a cached run: {loaded.stderr.strip() or 'none'}")
+
+
+if __name__ == "__main__":
+    args = list(map(int, sys.argv[1:]))
+    main(*args)
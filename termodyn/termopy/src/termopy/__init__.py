@@ -1,2 +1,32 @@
-def main() -> None:
-    print("Hello from termopy!")
+# Public names, imported on first use so `import termopy` (and the CLI)
+# stays cheap; each maps to the submodule that defines it
+EXPORTS = {
+    'SimulationConfig': 'config',
+    'MATERIALS': 'config',
+    'HeatTransferSimulation': 'HeatTransferSimulation',
+    'ResultCache': 'cache',
+    'ConvergenceMonitor': 'convergence',
+    'parameter_grid': 'sweep',
+    'run_sweep': 'sweep',
+    'run_transient': 'transient',
+    'AdaptiveController': 'adaptive',
+    'SnapshotReader': 'snapshots',
+    'SnapshotWriter': 'snapshots',
+    'InverseProblem': 'inverse',
+    'fit': 'inverse',
+}
+
+def __getattr__(name):
+    if name not in EXPORTS:
+        raise AttributeError(f"module 'termopy' has no attribute {name!r}")
+    import importlib
+    value = getattr(importlib.import_module(f'.{EXPORTS[name]}', __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(list(globals()) + list(EXPORTS))
+
+def main(argv=None) -> None:
+    from .cli import main
+    main(argv)
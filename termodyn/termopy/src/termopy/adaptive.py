@@ -0,0 +1,100 @@
+import numpy as np
+
+class AdaptiveController:
+    # Step-doubling time-step control for run_transient(adaptive=...)
+    # Every attempt advances the same state by one step of dt and by two
+    # steps of dt/2; the largest difference between the two results is the
+    # local error estimate. Attempts within `tolerance` (°C) are accepted
+    # (keeping the more accurate two-half-step result), others are retried
+    # with a smaller dt. The next dt follows the usual controller
+    #   dt *= safety * (tolerance / error)**(1 / (order + 1))
+    # limited to [max_shrink, max_growth] per step, with order 1 for forward
+    # Euler and 2 for Peaceman-Rachford ADI.
+    # - explicit: dt never exceeds the forward Euler stability limit
+    #   (times `stability_margin`), however small the error estimate
+    # - adi: unconditionally stable; dt is limited only by the tolerance and
+    #   dt_max
+    # An attempt costs three steps, so adaptivity pays off once dt can grow
+    # well past the fixed step, as it does in the slow phases of a run.
+
+    def __init__(self, tolerance=0.01, dt_min=None, dt_max=None, safety=0.9,
+                 max_growth=2.0, max_shrink=0.2, stability_margin=0.9):
+        self.tolerance = tolerance
+        self.dt_min = dt_min
+        self.dt_max = dt_max
+        self.safety = safety
+        self.max_growth = max_growth
+        self.max_shrink = max_shrink
+        self.stability_margin = stability_margin
+
+    def start(self, sim, grid):
+        # Reset for a run of sim, starting from its current DT
+        self.order = 1 if sim.solver == 'explicit' else 2
+        self.upper = self.dt_max if self.dt_max is not None else np.inf
+        if sim.solver == 'explicit':
+            self.upper = min(self.upper, self.stability_margin * sim.stable_time_step())
+        self.dt = min(sim.DT, self.upper)
+        self.lower = self.dt_min if self.dt_min is not None else self.dt * 1e-3
+        self.half = np.empty_like(grid)
+        self.coarse = np.empty_like(grid)
+        self.accepted = 0
+        self.rejected = 0
+        self.smallest = np.inf
+        self.largest = 0.0
+
+    def factor(self, error):
+        # Step size change suggested by an error estimate
+        if error == 0:
+            return self.max_growth
+        factor = self.safety * (self.tolerance / error)**(1 / (self.order + 1))
+        return min(self.max_growth, max(self.max_shrink, factor))
+
+    def advance(self, sim, series, t, limit, src, dst, buffers, use_convection_radiation=True):
+        # Advance src at time t into dst by one accepted step of at most
+        # `limit` seconds, with boundaries from `series`. Returns the step
+        # taken, or None when the series ends before it.
+        while True:
+            dt = min(self.dt, limit)
+            clipped = dt < self.dt
+            half = series.values_at(t + dt / 2)
+            full = series.values_at(t + dt)
+            if full is None:
+                return None
+
+            # Two half steps into dst, one full step into self.coarse
+            for name, value in half.items():
+                setattr(sim, name, value)
+            sim.set_time_step(dt / 2, buffers)
+            sim.step(src, self.half, buffers, use_convection_radiation)
+            for name, value in full.items():
+                setattr(sim, name, value)
+            sim.step(self.half, dst, buffers, use_convection_radiation)
+            sim.set_time_step(dt, buffers)
+            sim.step(src, self.coarse, buffers, use_convection_radiation)
+
+            np.subtract(dst, self.coarse, out=self.coarse)
+            np.abs(self.coarse, out=self.coarse)
+            error = self.coarse.max()
+            proposal = dt * self.factor(error)
+
+            if error <= self.tolerance or dt <= self.lower:
+                self.accepted += 1
+                self.smallest = min(self.smallest, dt)
+                self.largest = max(self.largest, dt)
+                # A step shortened to land on an output time says little
+                # about the step size the field allows
+                self.dt = max(self.dt, proposal) if clipped else proposal
+                self.dt = min(max(self.dt, self.lower), self.upper)
+                return dt
+
+            self.rejected += 1
+            self.dt = max(proposal, self.lower)
+
+    def stats(self):
+        return {
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'steps': 3 * (self.accepted + self.rejected),
+            'dt_smallest': float(self.smallest),
+            'dt_largest': float(self.largest),
+        }
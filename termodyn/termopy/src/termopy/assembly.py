@@ -0,0 +1,250 @@
+from dataclasses import dataclass
+
+import numpy as np
+
+from .config import MATERIALS, SimulationConfig
+from .HeatTransferSimulation import HeatTransferSimulation
+
+def material_properties(material):
+    # {k, rho, cp, emissivity} of a MATERIALS name or an explicit dict
+    return MATERIALS[material] if isinstance(material, str) else material
+
+@dataclass(frozen=True)
+class Layer:
+    # One layer of a wall assembly
+    # - material: MATERIALS name (or property dict) filling the layer
+    # - framing: optional material of studs/chords interrupting the layer,
+    #   framing_width wide and repeated every framing_spacing (m), centred
+    #   on the middle of the modelled wall section
+    material: str
+    thickness: float
+    framing: str = None
+    framing_width: float = 0.038    # 2x lumber, 1.5"
+    framing_spacing: float = 0.406  # 16" on centre
+
+@dataclass(frozen=True)
+class WallAssembly:
+    # Wall cross-section built from layers, exterior first
+    # In the simulation grid the height axis runs through the wall: row 0 is
+    # the exterior (cooled) surface and the last row the interior (hot)
+    # surface. The width axis runs along the wall over `length` metres.
+    layers: tuple
+    length: float = 0.406
+
+    def thickness(self):
+        return sum(layer.thickness for layer in self.layers)
+
+    def r_value(self):
+        # Clear-field thermal resistance (m²·K/W) through the layer
+        # materials, framing ignored
+        return sum(layer.thickness / material_properties(layer.material)['k']
+                   for layer in self.layers)
+
+    def config(self, base=None, **changes):
+        # SimulationConfig for this assembly: geometry from the layers, scalar
+        # material fields from the exterior layer (its emissivity is the one
+        # the cooled surface radiates with)
+        base = base if base is not None else SimulationConfig()
+        exterior = material_properties(self.layers[0].material)
+        return base.replace(L_W=self.length, L_H=self.thickness(), **{
+            **{name: exterior[name] for name in ('k', 'rho', 'cp', 'emissivity')},
+            **changes,
+        })
+
+    def properties(self, height, width):
+        # Per-cell k, rho and cp arrays (height, width) for a node grid
+        # spanning the assembly; every layer needs at least one node row
+        y = np.linspace(0, self.thickness(), height)
+        x = np.linspace(0, self.length, width)
+        bounds = np.cumsum([layer.thickness for layer in self.layers])
+        rows = np.minimum(np.searchsorted(bounds, y, side='right'), len(self.layers) - 1)
+
+        fields = {name: np.empty((height, width)) for name in ('k', 'rho', 'cp')}
+        for n, layer in enumerate(self.layers):
+            inside = rows == n
+            if not inside.any():
+                raise ValueError(f"Layer {n} ({layer.material}, {layer.thickness} m) has no "
+                                 f"grid rows; use HEIGHT > {int(self.thickness() / layer.thickness) + 1}")
+            columns = np.ones(width, dtype=bool)
+            if layer.framing is not None:
+                offset = (x - self.length / 2 + layer.framing_spacing / 2) % layer.framing_spacing
+                framed = np.abs(offset - layer.framing_spacing / 2) <= layer.framing_width / 2
+                columns = ~framed
+                for name, value in material_properties(layer.framing).items():
+                    if name in fields:
+                        fields[name][np.ix_(inside, framed)] = value
+            for name, value in material_properties(layer.material).items():
+                if name in fields:
+                    fields[name][np.ix_(inside, columns)] = value
+        return fields
+
+# Approximate layer-ups of the README's target walls (clear-field R-values
+# about RSI 7.0 / R40 and RSI 8.0 / R45, before framing losses)
+ASSEMBLIES = {
+    'perfect_wall_r40': WallAssembly((
+        Layer('eps', 0.100),
+        Layer('osb', 0.011),
+        Layer('mineral_wool', 0.140, framing='softwood'),
+        Layer('gypsum', 0.0127),
+    )),
+    'larsen_truss_r47': WallAssembly((
+        Layer('osb', 0.011),
+        Layer('cellulose', 0.216, framing='softwood', framing_width=0.019),
+        Layer('cellulose', 0.089, framing='softwood'),
+        Layer('gypsum', 0.0127),
+    )),
+}
+
+class StencilCoefficients:
+    # Per-cell weights of the heterogeneous explicit update, scaled by DT
+    #   T' = center*T + south*T_S + north*T_N + west*T_W + east*T_E
+    # Face conductivities are harmonic means of the two cells they join
+    # (exact for layers in series); each weight is
+    #   DT * k_face / (rho*cp of the cell * spacing²)
+    # and center = 1 - (sum of the four). All are (HEIGHT-2, WIDTH-2) arrays
+    # computed once. `conductance` keeps the face weights k_face/spacing²
+    # for the steady solver (steady_state.conductance_matrix).
+
+    def __init__(self, k, rho, cp, dx, dy):
+        capacity = (rho * cp)[1:-1, 1:-1]
+        self.conductance = {}
+        self.rate = {}
+        for name, a, b, d in (
+            ('south', k[1:-1, 1:-1], k[:-2, 1:-1], dy),
+            ('north', k[1:-1, 1:-1], k[2:, 1:-1], dy),
+            ('west', k[1:-1, 1:-1], k[1:-1, :-2], dx),
+            ('east', k[1:-1, 1:-1], k[1:-1, 2:], dx),
+        ):
+            self.conductance[name] = 2 * a * b / (a + b) / d**2
+            self.rate[name] = self.conductance[name] / capacity
+
+    def stability_limit(self):
+        # Largest step keeping every center weight non-negative
+        return 1 / sum(self.rate.values()).max()
+
+    def stable_time_step(self):
+        # Same margin as the homogeneous step on a square grid
+        # (0.2*DX²/ALPHA, i.e. a center weight of 0.2)
+        return 0.8 * self.stability_limit()
+
+    def scale(self, dt):
+        # Fix the time step and compute the update weights
+        for name, rate in self.rate.items():
+            setattr(self, name, rate * dt)
+        self.center = 1 - (self.south + self.north + self.west + self.east)
+
+class AssemblySimulation(HeatTransferSimulation):
+    # HeatTransferSimulation of a heterogeneous wall assembly
+    # - Per-cell k, rho and cp from WallAssembly.properties
+    # - The explicit step uses precomputed StencilCoefficients: five
+    #   multiplies and four adds per interior cell, no more than the
+    #   homogeneous Laplacian
+    # - Edge cooling uses each edge cell's own k and rho*cp
+    # - solve_steady_state solves div(k grad T) = 0 with the same face
+    #   conductances ('direct' or 'cg'), and the residual norm and adaptive
+    #   steps use the layered stencil
+    # Time stepping is explicit only; ADI and multigrid assume uniform k
+    # and raise ValueError.
+
+    def __init__(self, assembly, config=None, dt=None, verbose=True):
+        config = assembly.config(config)
+        self.assembly = assembly
+        self.materials = assembly.properties(config.HEIGHT, config.WIDTH)
+        self.coefficients = StencilCoefficients(
+            self.materials['k'], self.materials['rho'], self.materials['cp'],
+            config.DX, config.DY)
+        if dt is None:
+            dt = self.coefficients.stable_time_step()
+        self.residual_dt = self.coefficients.stable_time_step()
+        self.interior = None
+        super().__init__(config, solver='explicit', dt=dt, verbose=verbose, kernel='numpy')
+        self.scale(self.DT)
+
+    def scale(self, dt):
+        # Stencil weights and per-cell edge cooling for a time step
+        self.coefficients.scale(dt)
+        # ΔT per unit boundary flux and step, per edge cell
+        # (EDGE_COOLING of the homogeneous model)
+        k, rho, cp = self.materials['k'], self.materials['rho'], self.materials['cp']
+        cooling = dt / (rho * cp * self.thickness) / (k / self.DX)
+        self.edge_cooling = tuple(cooling[edge] for edge in self.cooling_edges())
+
+    def cache_state(self):
+        return super().cache_state() + (('assembly', self.assembly),)
+
+    def set_time_step(self, dt, buffers=None):
+        if dt != self.DT:
+            self.scale(dt)
+        self.DT = dt
+
+    def stable_time_step(self):
+        return self.coefficients.stability_limit()
+
+    def step_adi(self, src, dst, buffers, use_convection_radiation=True):
+        raise ValueError("only the explicit solver supports layered assemblies")
+
+    def interior_solver(self, method):
+        # Sparse solver on the layered conductances, built once per
+        # simulation (the cached homogeneous solvers do not apply)
+        if method == 'multigrid':
+            raise ValueError("multigrid does not support layered assemblies; "
+                             "use method='direct' or 'cg'")
+        if self.interior is None or self.interior.method != method:
+            from .steady_state import SteadyStateSolver
+            self.interior = SteadyStateSolver(self.HEIGHT, self.WIDTH, self.DX, self.DY, method,
+                                              conductance=self.coefficients.conductance)
+        return self.interior
+
+    def residual(self, grid, buffers):
+        # Largest change one default explicit step of the layered stencil
+        # would still make to the interior or the cooling edges
+        c = self.coefficients
+        center = grid[1:-1, 1:-1]
+        out = buffers.stencil
+        work = buffers.diff[1:-1, 1:-1]
+        out.fill(0)
+        for rate, neighbour in (
+            (c.rate['south'], grid[:-2, 1:-1]), (c.rate['north'], grid[2:, 1:-1]),
+            (c.rate['west'], grid[1:-1, :-2]), (c.rate['east'], grid[1:-1, 2:]),
+        ):
+            np.subtract(neighbour, center, out=work)
+            np.multiply(work, rate, out=work)
+            np.add(out, work, out=out)
+        np.abs(out, out=out)
+        return max(float(out.max() * self.residual_dt), self.edge_residual(grid, buffers))
+
+    def edge_residual(self, grid, buffers):
+        # Per-cell edge cooling, rescaled from DT to the default step
+        largest = 0.0
+        for n, edge in enumerate(self.cooling_edges()):
+            out, work = buffers.edges[n]
+            q = self.calculate_convection_heat_flux(grid[edge], out=out)
+            q = np.add(q, self.calculate_radiation_heat_flux(grid[edge], out=work), out=out)
+            np.multiply(q, self.edge_cooling[n], out=q)
+            np.abs(q, out=q)
+            largest = max(largest, float(q.max()) * self.residual_dt / self.DT)
+        return largest
+
+    def step_explicit(self, src, dst, buffers, use_convection_radiation=True):
+        c = self.coefficients
+        out = dst[1:-1, 1:-1]
+        work = buffers.stencil
+        np.multiply(src[1:-1, 1:-1], c.center, out=out)
+        for weight, neighbour in (
+            (c.south, src[:-2, 1:-1]), (c.north, src[2:, 1:-1]),
+            (c.west, src[1:-1, :-2]), (c.east, src[1:-1, 2:]),
+        ):
+            np.multiply(neighbour, weight, out=work)
+            np.add(out, work, out=out)
+
+        self.advance_edges(src, dst, buffers, use_convection_radiation)
+
+    def apply_convection_radiation_boundaries(self, grid, buffers=None):
+        # Same edge balance as the homogeneous model, with per-cell cooling
+        for n, edge in enumerate(self.cooling_edges()):
+            out, work = buffers.edges[n] if buffers is not None else (None, None)
+            q = self.calculate_convection_heat_flux(grid[edge], out=out)
+            q_rad = self.calculate_radiation_heat_flux(grid[edge], out=work)
+            q = np.add(q, q_rad, out=out)
+            q = np.multiply(q, self.edge_cooling[n], out=out)
+            np.subtract(grid[edge], q, out=grid[edge])
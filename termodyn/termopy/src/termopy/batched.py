@@ -0,0 +1,166 @@
+import time
+
+import numpy as np
+
+class BatchedHeatTransferSimulation:
+    # Many plate scenarios advanced together as one (N, HEIGHT, WIDTH) array
+    # - Per-scenario parameters (ALPHA*DT, grid spacing, h, emissivity,
+    #   ambient and hot-surface temperatures, ...) are (N, 1, 1) arrays
+    #   broadcast along axis 0, so one vectorized explicit step advances
+    #   every scenario at once
+    # - Each scenario stops on its own CONVERGENCE_THRESHOLD or
+    #   MAX_ITERATIONS, as run_simulation does with the default
+    #   ConvergenceMonitor (no stagnation or divergence exits); converged
+    #   scenarios are frozen and compacted out of the working arrays, so
+    #   later steps only cost what the remaining scenarios need
+    # - The per-scenario arithmetic matches HeatTransferSimulation's explicit
+    #   step term by term, so results equal one-at-a-time runs
+    # - Steps run over blocks of `chunk_size` scenarios so the working set
+    #   stays cache-sized however many scenarios are stacked
+
+    def __init__(self, configs, chunk_size=64, verbose=False):
+        self.configs = list(configs)
+        shapes = {(config.HEIGHT, config.WIDTH) for config in self.configs}
+        if len(shapes) != 1:
+            raise ValueError(f"All scenarios need the same grid shape, got {sorted(shapes)}")
+        (self.HEIGHT, self.WIDTH), = shapes
+        self.chunk_size = chunk_size
+        self.verbose = verbose
+
+        def column(values):
+            return np.array(values, dtype=float).reshape(-1, 1, 1)
+
+        c = self.configs
+        self.params = {
+            'DX2': column([x.DX**2 for x in c]),
+            'DY2': column([x.DY**2 for x in c]),
+            'ALPHA_DT': column([x.ALPHA * x.DT for x in c]),
+            'T_ambient': column([x.T_ambient for x in c]),
+            'T_hot_surface': column([x.T_hot_surface for x in c]),
+            'h': column([x.h_natural_conv for x in c]),
+            'emissivity_sigma': column([x.emissivity * x.sigma for x in c]),
+            'T_amb_K4': column([(x.T_ambient + 273.15)**4 for x in c]),
+            'k_over_dx': column([x.k / x.DX for x in c]),
+            'DT': column([x.DT for x in c]),
+            'heat_capacity': column([x.rho * x.cp * x.thickness for x in c]),
+        }
+        self.thresholds = np.array([x.CONVERGENCE_THRESHOLD for x in c])
+        self.max_iterations = np.array([x.MAX_ITERATIONS for x in c])
+
+    def log(self, *args):
+        # Progress output, silenced for headless runs
+        if self.verbose:
+            print(*args)
+
+    def apply_boundary_conditions(self, grid, p, use_convection_radiation=True):
+        # Boundary engine for a stack of grids, per-scenario parameters in p
+        if use_convection_radiation:
+            # Bottom edge (cooling surface), then both side columns
+            edges = ((slice(None), slice(0, 1), slice(1, -1)),
+                     (slice(None), slice(1, -1), slice(None, None, self.WIDTH - 1)))
+            for edge in edges:
+                T_surface = grid[edge]
+                q_conv = p['h'] * (T_surface - p['T_ambient'])
+                q_rad = p['emissivity_sigma'] * ((T_surface + 273.15)**4 - p['T_amb_K4'])
+                heat_loss = (q_conv + q_rad) / p['k_over_dx']
+                grid[edge] -= heat_loss * p['DT'] / p['heat_capacity']
+        else:
+            grid[:, 0, :] = p['T_ambient'][:, 0]   # Bottom
+            grid[:, :, 0] = p['T_ambient'][:, 0]   # Left
+            grid[:, :, -1] = p['T_ambient'][:, 0]  # Right
+
+        # Top edge always at constant temperature
+        grid[:, -1, :] = p['T_hot_surface'][:, 0]
+
+    def step(self, src, dst, p, use_convection_radiation=True):
+        # One explicit step for all active scenarios, src -> dst
+        # Returns the per-scenario maximum absolute change.
+        n = len(src)
+        center = src[:, 1:-1, 1:-1]
+        vertical = self._stencil[:n]
+        horizontal = self._work[:n]
+
+        np.multiply(center, 2, out=vertical)
+        np.subtract(src[:, 2:, 1:-1], vertical, out=vertical)
+        np.add(vertical, src[:, :-2, 1:-1], out=vertical)
+        np.divide(vertical, p['DY2'], out=vertical)
+
+        np.multiply(center, 2, out=horizontal)
+        np.subtract(src[:, 1:-1, 2:], horizontal, out=horizontal)
+        np.add(horizontal, src[:, 1:-1, :-2], out=horizontal)
+        np.divide(horizontal, p['DX2'], out=horizontal)
+
+        np.add(vertical, horizontal, out=vertical)
+        np.multiply(vertical, p['ALPHA_DT'], out=vertical)
+        np.add(center, vertical, out=dst[:, 1:-1, 1:-1])
+
+        # Edges start from their previous values, then the boundary engine
+        dst[:, 0, :] = src[:, 0, :]
+        dst[:, -1, :] = src[:, -1, :]
+        dst[:, 1:-1, 0] = src[:, 1:-1, 0]
+        dst[:, 1:-1, -1] = src[:, 1:-1, -1]
+        self.apply_boundary_conditions(dst, p, use_convection_radiation)
+
+        diff = self._diff[:n]
+        np.subtract(dst, src, out=diff)
+        np.abs(diff, out=diff)
+        return diff.reshape(n, -1).max(axis=1)
+
+    def run_simulation(self, use_convection_radiation=True):
+        # Advance all scenarios to convergence; returns an (N, H, W) array
+        # Per-scenario iterations and final changes go to run_stats.
+        count = len(self.configs)
+        shape = (count, self.HEIGHT, self.WIDTH)
+        grids = (np.empty(shape), np.empty(shape))
+        chunk = min(self.chunk_size, count)
+        self._stencil = np.empty((chunk, self.HEIGHT - 2, self.WIDTH - 2))
+        self._work = np.empty_like(self._stencil)
+        self._diff = np.empty((chunk, self.HEIGHT, self.WIDTH))
+
+        results = np.empty(shape)
+        iterations = np.zeros(count, dtype=int)
+        max_change = np.full(count, np.inf)
+
+        src, dst = grids
+        src[...] = self.params['T_ambient']
+        src[:, -1, :] = self.params['T_hot_surface'][:, 0]
+
+        active = np.arange(count)
+        p = dict(self.params)
+        thresholds = self.thresholds
+        limits = self.max_iterations
+
+        start_time = time.time()
+        steps = 0
+        change = np.empty(count)
+        while len(active):
+            n = len(active)
+            for a in range(0, n, chunk):
+                b = min(a + chunk, n)
+                block = {name: value[a:b] for name, value in p.items()}
+                change[a:b] = self.step(src[a:b], dst[a:b], block, use_convection_radiation)
+            change_active = change[:n]
+            iterations[active] += 1
+            max_change[active] = change_active
+            src, dst = dst, src
+            steps += 1
+
+            # Freeze scenarios that converged (or ran out of iterations)
+            done = (change_active <= thresholds) | (iterations[active] >= limits)
+            if done.any():
+                results[active[done]] = src[:n][done]
+                keep = ~done
+                src[:keep.sum()] = src[:n][keep]
+                active = active[keep]
+                p = {name: value[keep] for name, value in p.items()}
+                thresholds, limits = thresholds[keep], limits[keep]
+                self.log(f"Step {steps:5d} | {done.sum()} converged | {len(active)} active")
+
+        self.run_stats = {
+            'solver': 'batched-explicit',
+            'iterations': iterations,
+            'max_change': max_change,
+            'steps': steps,
+            'wall_time': time.time() - start_time,
+        }
+        return results
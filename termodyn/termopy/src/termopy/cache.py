@@ -0,0 +1,216 @@
+import hashlib
+import json
+import os
+import time
+
+from .config import SOLVERS, SimulationConfig, adi_time_step
+from .kernels import resolve_kernel
+
+# NumPy is imported only where a grid is read or written: the key and the
+# JSON metadata are plain Python, so `termopy run` can answer a cache hit
+# from the metadata alone without paying for the NumPy import.
+
+# Bump whenever a change to the solvers alters the numbers they produce,
+# so grids computed by older code are never served from the cache
+SOLVER_VERSION = 1
+
+# Default cache location, overridable with TERMOPY_CACHE_DIR
+DEFAULT_DIRECTORY = os.environ.get(
+    'TERMOPY_CACHE_DIR',
+    os.path.join(os.path.expanduser('~'), '.cache', 'termopy'),
+)
+
+def plate_state(plate, solver, kernel, dt):
+    # HeatTransferSimulation.cache_state() of `plate` (a simulation, or a
+    # SimulationConfig for one about to be built): every config field,
+    # solver, kernel and time step
+    fields = tuple((name, getattr(plate, name)) for name, spec in
+                   SimulationConfig.__dataclass_fields__.items() if spec.init)
+    return fields + (('solver', solver), ('kernel', kernel), ('DT', float(dt)))
+
+def run_key(name, state, monitor_state=None, use_convection_radiation=True):
+    # Content address of one run of simulation class `name` with
+    # cache_state() `state` and monitor cache_state() `monitor_state`
+    # (None: the default monitor), keyed with the solver version
+    text = repr((SOLVER_VERSION, name, state, monitor_state, bool(use_convection_radiation)))
+    return hashlib.sha256(text.encode()).hexdigest()
+
+def cache_key(sim, use_convection_radiation=True, convergence=None):
+    # Content address of one run: the simulation class and its effective
+    # inputs (sim.cache_state(), i.e. every config field as currently set on
+    # the instance, solver, kernel, time step and subclass state), the
+    # convergence monitor settings, the boundary model and the solver
+    # version. Two simulations with equal keys produce equal grids.
+    monitor_state = convergence.cache_state() if convergence is not None else None
+    return run_key(type(sim).__qualname__, sim.cache_state(), monitor_state,
+                   use_convection_radiation)
+
+def config_key(config, solver='explicit', kernel='auto', use_convection_radiation=True):
+    # cache_key of a fresh HeatTransferSimulation(config, solver, kernel=kernel)
+    # with the default monitor, without building it (or importing NumPy)
+    if solver not in SOLVERS:
+        raise ValueError(f"Unknown solver {solver!r}, expected one of {SOLVERS}")
+    dt = adi_time_step(config) if solver == 'adi' else config.DT
+    state = plate_state(config, solver, resolve_kernel(kernel, solver), dt)
+    return run_key('HeatTransferSimulation', state, None, use_convection_radiation)
+
+def check_cacheable(sim):
+    # Subclass state the base cache_state() cannot see would be left out of
+    # the key, so every class must define the hook itself
+    if 'cache_state' not in vars(type(sim)):
+        raise ValueError(f"{type(sim).__qualname__} does not define cache_state(); "
+                         f"its results cannot be cached")
+
+class ResultCache:
+    # On-disk cache of finished run_simulation results
+    # - Each entry is <key>.npy (the grid, memory-mapped on load) plus
+    #   <key>.json (run_stats and an optional summary of the grid)
+    # - metadata(key) reads only the JSON, for callers that need the
+    #   stats or summary but not the grid
+    # - Entries are written atomically, so concurrent sweeps can share a
+    #   directory
+    # - Least recently used entries are evicted once the directory holds
+    #   more than max_bytes; hits refresh an entry's modification time
+    def __init__(self, directory=None, max_bytes=512 * 1024**2):
+        self.directory = directory if directory is not None else DEFAULT_DIRECTORY
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(self.directory, exist_ok=True)
+
+    def paths(self, key):
+        base = os.path.join(self.directory, key)
+        return base + '.npy', base + '.json'
+
+    def read(self, key):
+        # The JSON half of an entry, {'stats': ..., 'summary': ...}, or None
+        try:
+            with open(self.paths(key)[1]) as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or 'stats' not in entry:
+            return None
+        return entry
+
+    def touch(self, key):
+        # Count a hit and mark the entry recently used
+        now = time.time()
+        for path in self.paths(key):
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+        self.hits += 1
+
+    def metadata(self, key):
+        # Cached (stats, summary) for key, or None; summary is None for
+        # entries stored without one. Neither NumPy nor the grid is loaded.
+        entry = self.read(key)
+        if entry is None or not os.path.exists(self.paths(key)[0]):
+            self.misses += 1
+            return None
+        self.touch(key)
+        return entry['stats'], entry.get('summary')
+
+    def get(self, key):
+        # Cached (grid, stats) for key, or None. The grid is a read-only
+        # memory map, so loading is independent of the grid size.
+        import numpy as np
+
+        entry = self.read(key)
+        if entry is not None:
+            try:
+                grid = np.load(self.paths(key)[0], mmap_mode='r')
+            except (OSError, ValueError):
+                entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self.touch(key)
+        return grid, entry['stats']
+
+    def put(self, key, grid, stats, summary=None):
+        # Store grid and stats (plus an optional JSON-able summary) under
+        # key, then trim the cache to max_bytes
+        import numpy as np
+
+        grid_path, stats_path = self.paths(key)
+        suffix = f'.{os.getpid()}.tmp'
+        with open(grid_path + suffix, 'wb') as f:
+            np.save(f, np.ascontiguousarray(grid))
+        with open(stats_path + suffix, 'w') as f:
+            json.dump({'stats': stats, 'summary': summary}, f,
+                      default=lambda value: value.item())
+        # Grid first: get() opens the stats file first, so a reader never
+        # sees stats without the matching grid
+        os.replace(grid_path + suffix, grid_path)
+        os.replace(stats_path + suffix, stats_path)
+        self.evict()
+
+    def run(self, sim, use_convection_radiation=True, convergence=None, summarize=None):
+        # sim.run_simulation through the cache. On a hit, sim.run_stats is
+        # restored from the stored run with 'cached' set to True.
+        # `convergence` is passed on to run_simulation; on a miss,
+        # summarize(grid), if given, is stored with the entry (metadata).
+        check_cacheable(sim)
+        key = cache_key(sim, use_convection_radiation, convergence)
+        entry = self.get(key)
+        if entry is not None:
+            grid, stats = entry
+            sim.log(f"Loaded cached result {key[:12]}")
+            sim.run_stats = dict(stats, cached=True)
+            return grid
+        grid = sim.run_simulation(use_convection_radiation, convergence=convergence)
+        self.put(key, grid, sim.run_stats, summarize(grid) if summarize is not None else None)
+        sim.run_stats = dict(sim.run_stats, cached=False)
+        return grid
+
+    def entries(self):
+        # (mtime, size, key) of every complete entry, oldest first
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith('.npy'):
+                continue
+            key = name[:-4]
+            try:
+                size = sum(os.stat(path).st_size for path in self.paths(key))
+                mtime = os.stat(self.paths(key)[0]).st_mtime
+            except OSError:
+                continue
+            entries.append((mtime, size, key))
+        entries.sort()
+        return entries
+
+    def size(self):
+        # Total bytes held by the cache
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        # Drop least recently used entries until the cache fits max_bytes
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, key in entries:
+            if total <= self.max_bytes:
+                break
+            self.invalidate(key)
+            total -= size
+
+    def invalidate(self, key):
+        # Remove one entry; key may also be a simulation, for its
+        # use_convection_radiation=True and False runs
+        # (with the default convergence monitor)
+        keys = [key] if isinstance(key, str) else [
+            cache_key(key, use_conv) for use_conv in (True, False)
+        ]
+        for k in keys:
+            for path in self.paths(k):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def clear(self):
+        # Remove every entry
+        for _, _, key in self.entries():
+            self.invalidate(key)
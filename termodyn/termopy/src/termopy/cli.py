@@ -0,0 +1,250 @@
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+
+# Command-line interface: termopy {run,sweep,fit,plot} [config file]
+# Only argparse and json are imported up front (even config.py is deferred:
+# building the dataclass costs more than argparse itself); NumPy, SciPy,
+# pandas and matplotlib are imported by the command that needs them, so
+# `termopy --help` and argument errors cost a bare interpreter start and
+# only `plot` ever loads matplotlib. A cached `run` is answered from the
+# cache's JSON metadata and imports no NumPy at all. Results go to stdout as JSON (CSV for
+# sweeps) for use in pipelines; diagnostics go to stderr.
+
+def read_file(path):
+    # Mapping from a JSON or TOML file (by extension)
+    if path.endswith('.toml'):
+        import tomllib
+        with open(path, 'rb') as f:
+            return tomllib.load(f)
+    with open(path) as f:
+        return json.load(f)
+
+def make_config(fields, base=None):
+    # SimulationConfig from a mapping of config fields; `material` names a
+    # MATERIALS preset applied before the other fields
+    from .config import MATERIALS, SimulationConfig
+
+    fields = dict(fields)
+    config = base if base is not None else SimulationConfig()
+    material = fields.pop('material', None)
+    if material is not None:
+        if material not in MATERIALS:
+            raise ValueError(f"Unknown material {material!r}, expected one of {tuple(MATERIALS)}")
+        config = config.replace(**MATERIALS[material])
+    unknown = set(fields) - set(SimulationConfig.__dataclass_fields__)
+    if unknown:
+        raise ValueError(f"Unknown config fields: {', '.join(sorted(unknown))}")
+    return config.replace(**fields)
+
+def load_config(path):
+    # Config file for `run` and `plot`: the fields at the top level, or
+    # under a `config` table
+    data = read_file(path) if path is not None else {}
+    return make_config(data.get('config', data))
+
+def resolve(path, relative_to):
+    # Data paths in a config file are relative to the file
+    return os.path.join(os.path.dirname(os.path.abspath(relative_to)), path)
+
+def plain(value):
+    # JSON encoder fallback for NumPy scalars and arrays
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    return str(value)
+
+def dump(data):
+    json.dump(data, sys.stdout, indent=2, default=plain)
+    sys.stdout.write('\n')
+
+def make_simulation(args, verbose):
+    # Simulation for `run` and `plot`: serial, or split into --threads row
+    # strips (parallel.ParallelHeatTransferSimulation, explicit only)
+    config = load_config(args.config)
+    if args.threads:
+        if args.solver != 'explicit':
+            raise ValueError("--threads needs the explicit solver")
+        from .parallel import ParallelHeatTransferSimulation
+        return ParallelHeatTransferSimulation(config, workers=args.threads, verbose=verbose)
+    from .HeatTransferSimulation import HeatTransferSimulation
+    return HeatTransferSimulation(config, solver=args.solver, kernel=args.kernel,
+                                  verbose=verbose)
+
+def summarize(sim, grid):
+    # Grid statistics and edge losses reported by `run`, stored with cached
+    # results so a hit can be reported without loading the grid
+    conv_loss, rad_loss = sim.calculate_heat_transfer_rates(grid)
+    return {'T_min': float(grid.min()), 'T_max': float(grid.max()),
+            'T_mean': float(grid.mean()), 'conv_loss': float(conv_loss),
+            'rad_loss': float(rad_loss)}
+
+def cached_run(args, use_convection_radiation):
+    # `run` answered from the cache metadata alone, without importing
+    # NumPy: the key is computed from the config and --output copies the
+    # stored .npy file. None when the entry (or its summary) is missing.
+    from .cache import ResultCache, config_key
+
+    key = config_key(load_config(args.config), args.solver, args.kernel,
+                     use_convection_radiation)
+    cache = ResultCache(args.cache_dir)
+    entry = cache.metadata(key)
+    if entry is None or entry[1] is None:
+        return None
+    if args.output:
+        # np.save's naming, so both paths write the same file
+        output = args.output if args.output.endswith('.npy') else args.output + '.npy'
+        try:
+            shutil.copyfile(cache.paths(key)[0], output)
+        except FileNotFoundError:
+            return None
+    if args.verbose:
+        print(f"Loaded cached result {key[:12]}", file=sys.stderr)
+    stats, summary = entry
+    return dict(stats, cached=True, **summary)
+
+def run(args):
+    use_convection_radiation = not args.no_convection
+    # Plain cached runs (not --steady, --no-cache or --threads) are served
+    # from the cache metadata before NumPy is imported
+    if not (args.steady or args.no_cache or args.threads):
+        result = cached_run(args, use_convection_radiation)
+        if result is not None:
+            dump(result)
+            return
+
+    import numpy as np
+
+    # The simulation log would interleave with the JSON on stdout
+    with contextlib.redirect_stdout(sys.stderr), contextlib.ExitStack() as stack:
+        sim = make_simulation(args, args.verbose)
+        if hasattr(sim, 'close'):
+            stack.callback(sim.close)
+        if args.steady:
+            grid = sim.solve_steady_state(use_convection_radiation, args.steady)
+        elif args.no_cache:
+            grid = sim.run_simulation(use_convection_radiation)
+        else:
+            from .cache import ResultCache
+            grid = ResultCache(args.cache_dir).run(sim, use_convection_radiation,
+                                                   summarize=lambda grid: summarize(sim, grid))
+
+    if args.output:
+        np.save(args.output, grid)
+    dump(dict(sim.run_stats, **summarize(sim, grid)))
+
+def sweep(args):
+    # Sweep file: `base` config fields and `axes`, {field: [values]}, as
+    # for sweep.parameter_grid (`material` is allowed as an axis)
+    from .sweep import parameter_grid, run_sweep
+
+    data = read_file(args.config)
+    configs = parameter_grid(make_config(data.get('base', {})), **data.get('axes', {}))
+    table = run_sweep(configs, solver=args.solver,
+                      use_convection_radiation=not args.no_convection,
+                      max_workers=args.workers, results_path=args.results,
+                      engine=args.engine)
+    table.to_csv(sys.stdout, index=False)
+
+def read_events(path, roles):
+    # (time, role, value) events from a CSV or JSON-lines measurement file
+    from .transient import read_csv, read_payloads
+
+    if path.endswith('.csv'):
+        return list(read_csv(path, roles=roles))
+    return list(read_payloads(path, roles=roles))
+
+def fit(args):
+    # Fit file: `config` fields, `boundary` and `observations` measurement
+    # files, sensor `locations` {name: [x, y]} and optionally `parameters`,
+    # `initial`, `bounds` {name: [low, high]}, `reduced_shape`, `dt`,
+    # `output_interval` and `solver` (see inverse.InverseProblem)
+    # `roles` maps sensor names to boundary fields (transient.SENSOR_ROLES)
+    from .inverse import PARAMETERS, InverseProblem, fit
+    from .transient import SENSOR_ROLES
+
+    data = read_file(args.config)
+    locations = {name: tuple(xy) for name, xy in data['locations'].items()}
+    boundary = read_events(resolve(data['boundary'], args.config),
+                           data.get('roles', SENSOR_ROLES))
+    observations = read_events(resolve(data['observations'], args.config),
+                               {name: name for name in locations})
+    options = {name: data[name] for name in ('dt', 'output_interval', 'solver') if name in data}
+    if 'reduced_shape' in data:
+        options['reduced_shape'] = tuple(data['reduced_shape'])
+    problem = InverseProblem(make_config(data.get('config', {})), boundary, observations,
+                             locations, parameters=data.get('parameters', PARAMETERS), **options)
+    bounds = {name: tuple(limits) for name, limits in data.get('bounds', {}).items()}
+    dump(fit(problem, initial=data.get('initial'), bounds=bounds or None,
+             max_workers=args.workers, max_evaluations=args.max_evaluations))
+
+def plot(args):
+    # The original study: simple and convection/radiation models, compared
+    from .cache import ResultCache
+
+    sim = make_simulation(args, True)
+    cache = ResultCache(args.cache_dir)
+    print("1) Running simple model...")
+    grid_simple = cache.run(sim, use_convection_radiation=False)
+    print("\n2) Running advanced model...")
+    grid_advanced = cache.run(sim, use_convection_radiation=True)
+    sim.plot_results(grid_simple, grid_advanced)
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='termopy', description="2D plate heat transfer simulations")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    solver = argparse.ArgumentParser(add_help=False)
+    solver.add_argument('--solver', default='explicit', help="time stepping: explicit or adi")
+
+    convection = argparse.ArgumentParser(add_help=False)
+    convection.add_argument('--no-convection', action='store_true',
+                            help="hold the cooled edges at T_ambient instead")
+
+    model = argparse.ArgumentParser(add_help=False)
+    model.add_argument('--kernel', default='auto', help="explicit step: auto, numpy or native")
+    model.add_argument('--cache-dir', help="result cache directory")
+    model.add_argument('--threads', type=int,
+                       help="split the explicit step into this many row strips, one thread each")
+
+    command = commands.add_parser('run', parents=[solver, convection, model],
+                                  help="run one simulation, print its statistics as JSON")
+    command.add_argument('config', nargs='?', help="JSON or TOML config fields")
+    command.add_argument('--steady', metavar='METHOD', nargs='?', const='direct',
+                         help="solve the steady state directly (direct, cg or multigrid)")
+    command.add_argument('--output', help="save the final grid as .npy")
+    command.add_argument('--no-cache', action='store_true', help="always run the simulation")
+    command.add_argument('-v', '--verbose', action='store_true', help="log progress to stderr")
+    command.set_defaults(handler=run)
+
+    command = commands.add_parser('sweep', parents=[solver, convection],
+                                  help="run a parameter sweep, print the results as CSV")
+    command.add_argument('config', help="JSON or TOML file with `base` fields and `axes`")
+    command.add_argument('--engine', default='process', help="process, batched or continuation")
+    command.add_argument('--workers', type=int, help="worker processes (process engine)")
+    command.add_argument('--results', help="CSV to append to and resume from")
+    command.set_defaults(handler=sweep)
+
+    command = commands.add_parser('fit', help="fit material and surface parameters to measurements")
+    command.add_argument('config', help="JSON or TOML fit description")
+    command.add_argument('--workers', type=int, help="worker processes for the Jacobian")
+    command.add_argument('--max-evaluations', type=int, default=50)
+    command.set_defaults(handler=fit)
+
+    command = commands.add_parser('plot', parents=[solver, model],
+                                  help="compare the simple and advanced models in a figure")
+    command.add_argument('config', nargs='?', help="JSON or TOML config fields")
+    command.set_defaults(handler=plot)
+    return parser
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        args.handler(args)
+    except KeyError as error:
+        parser.exit(2, f"termopy {args.command}: error: missing {error} in the config file\n")
+    except (ValueError, OSError) as error:
+        parser.exit(2, f"termopy {args.command}: error: {error}\n")
@@ -0,0 +1,102 @@
+import numpy as np
+
+# Convergence norms for ConvergenceMonitor(norm=...), all in °C
+# - linf: largest change of any cell over one step (the original check)
+# - l2: root mean square change over one step
+# - residual: largest change one stable explicit step would still make to
+#   the interior (ALPHA * DT_explicit * |∇²T|) or the cooling edges.
+#   Independent of the step actually taken, so it is the honest measure
+#   for large-step solvers (ADI) and warm starts
+NORMS = ('linf', 'l2', 'residual')
+
+# Reasons run_simulation stops, as reported in run_stats['stop_reason']
+STOP_REASONS = ('converged', 'max_iterations', 'stagnated', 'diverged')
+
+class ConvergenceMonitor:
+    # Convergence checking for run_simulation
+    # - The norm is evaluated only every `check_every` steps; steps in
+    #   between do no convergence work at all
+    # - Stagnation: the best value has improved by less than the relative
+    #   `stagnation_tolerance` over the last `stagnation_window` checks
+    # - Divergence: a non-finite value, or one `divergence_factor` times
+    #   larger than the best value so far
+    # Both early exits are off (None) by default: a run stops on the
+    # threshold or MAX_ITERATIONS only, like the original loop and
+    # BatchedHeatTransferSimulation, unless the caller opts in.
+    # - Every checked value is stored in a history array preallocated for
+    #   the whole run; history_iterations gives the matching step numbers
+
+    def __init__(self, norm='linf', check_every=1, stagnation_window=None,
+                 stagnation_tolerance=1e-3, divergence_factor=None):
+        if norm not in NORMS:
+            raise ValueError(f"Unknown norm {norm!r}, expected one of {NORMS}")
+        if check_every < 1:
+            raise ValueError("check_every must be at least 1")
+        self.norm = norm
+        self.check_every = check_every
+        self.stagnation_window = stagnation_window
+        self.stagnation_tolerance = stagnation_tolerance
+        self.divergence_factor = divergence_factor
+        self.start(0, 0)
+
+    # cache_state() of a monitor with the default settings
+    DEFAULT_STATE = ('linf', 1, None, 1e-3, None)
+
+    def cache_state(self):
+        # Settings that change where a run stops (for cache.cache_key); None
+        # for the defaults, the key of runs that are given no monitor
+        state = (self.norm, self.check_every, self.stagnation_window,
+                 self.stagnation_tolerance, self.divergence_factor)
+        return None if state == self.DEFAULT_STATE else state
+
+    def start(self, threshold, max_iterations):
+        # Reset for a new run and preallocate the history
+        self.threshold = threshold
+        self.values = np.empty(max_iterations // self.check_every + 1)
+        self.best = np.empty_like(self.values)  # running minimum of values
+        self.checks = 0
+        self.value = float('inf')
+        self.stop_reason = None
+
+    @property
+    def history(self):
+        # Checked values of the current run
+        return self.values[:self.checks]
+
+    @property
+    def history_iterations(self):
+        # Step numbers at which the history values were taken
+        return self.check_every * np.arange(1, self.checks + 1)
+
+    def due(self, iteration):
+        # True when the step that just completed `iteration` steps is checked
+        return iteration % self.check_every == 0
+
+    def measure(self, sim, src, dst, buffers):
+        # Convergence norm of the step src -> dst, using buffers.diff as scratch
+        if self.norm == 'linf':
+            return float(sim.max_change(src, dst, buffers))
+        if self.norm == 'l2':
+            np.subtract(dst, src, out=buffers.diff)
+            flat = buffers.diff.reshape(-1)
+            return float(np.sqrt(np.dot(flat, flat) / flat.size))
+        return sim.residual(dst, buffers)
+
+    def update(self, value):
+        # Record one checked value; returns the stop reason, or None to go on
+        n = self.checks
+        self.values[n] = value
+        self.best[n] = value if n == 0 else min(value, self.best[n - 1])
+        self.checks = n + 1
+        self.value = value
+
+        if self.divergence_factor is not None and (
+                not np.isfinite(value) or value > self.divergence_factor * self.best[n]):
+            self.stop_reason = 'diverged'
+        elif value <= self.threshold:
+            self.stop_reason = 'converged'
+        elif self.stagnation_window is not None and n >= self.stagnation_window:
+            before = self.best[n - self.stagnation_window]
+            if self.best[n] > before * (1 - self.stagnation_tolerance):
+                self.stop_reason = 'stagnated'
+        return self.stop_reason
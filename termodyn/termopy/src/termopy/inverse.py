@@ -0,0 +1,172 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .HeatTransferSimulation import HeatTransferSimulation
+from .transient import FIELDS, run_transient
+
+# Parameters fit by default, all strictly positive (fit in log space)
+PARAMETERS = ('k', 'h_natural_conv', 'emissivity')
+
+# Problem installed in each worker process by load_problem
+worker_problem = None
+
+class InverseProblem:
+    # Misfit between a reduced transient model and sensor measurements
+    # - config: SimulationConfig holding everything that is not fit
+    # - boundary: (time, field, value) events driving T_hot_surface and
+    #   T_ambient (see transient.py); kept in memory and replayed per run
+    # - observations: (time, name, value) events of the sensors to match
+    # - locations: {name: (x, y)} sensor positions in metres, x along the
+    #   width and y up from the cooled (bottom) edge to the hot surface
+    # - reduced_shape: (HEIGHT, WIDTH) of the reduced model, coarse enough
+    #   that one forward run takes a fraction of a second
+    # - dt/output_interval: fixed ADI step and model sampling interval (s),
+    #   identical for every run so finite differences are not polluted by
+    #   changing step sizes
+    # Steady readings alone cannot identify these parameters: with fixed
+    # edge temperatures the steady field does not depend on k, h or
+    # emissivity. The information is in the transient response, and h and
+    # emissivity are strongly correlated (see fit()'s 'correlation').
+
+    def __init__(self, config, boundary, observations, locations,
+                 parameters=PARAMETERS, reduced_shape=(16, 16), dt=60.0,
+                 output_interval=None, solver='adi'):
+        if reduced_shape is not None:
+            config = config.replace(HEIGHT=reduced_shape[0], WIDTH=reduced_shape[1])
+        self.config = config
+        self.parameters = tuple(parameters)
+        self.boundary = sorted(boundary)
+        self.dt = dt
+        self.output_interval = output_interval if output_interval is not None else dt
+        self.solver = solver
+
+        # Observations inside the span where every boundary field has data
+        first = {name: None for name in FIELDS}
+        last = {}
+        for t, name, _ in self.boundary:
+            if first[name] is None:
+                first[name] = t
+            last[name] = t
+        if None in first.values():
+            raise ValueError("Boundary series needs samples for " + ", ".join(FIELDS))
+        start, end = max(first.values()), min(last.values())
+
+        self.names = sorted(locations)
+        series = {name: ([], []) for name in self.names}
+        for t, name, value in observations:
+            if name in series and start <= t <= end:
+                series[name][0].append(t)
+                series[name][1].append(value)
+        self.times = [np.array(series[name][0]) for name in self.names]
+        self.measured = np.concatenate([series[name][1] for name in self.names])
+        if not len(self.measured):
+            raise ValueError("No observations inside the boundary series")
+
+        # Bilinear sampling weights of each sensor on the reduced grid
+        self.rows = np.empty((len(self.names), 4), dtype=int)
+        self.cols = np.empty((len(self.names), 4), dtype=int)
+        self.weights = np.empty((len(self.names), 4))
+        for s, name in enumerate(self.names):
+            x, y = locations[name]
+            fi = min(max(y / config.DY, 0), config.HEIGHT - 1)
+            fj = min(max(x / config.DX, 0), config.WIDTH - 1)
+            i, j = min(int(fi), config.HEIGHT - 2), min(int(fj), config.WIDTH - 2)
+            a, b = fi - i, fj - j
+            self.rows[s] = (i, i, i + 1, i + 1)
+            self.cols[s] = (j, j + 1, j, j + 1)
+            self.weights[s] = ((1 - a) * (1 - b), (1 - a) * b, a * (1 - b), a * b)
+
+    def simulate(self, values):
+        # Modelled sensor temperatures at the observation times
+        config = self.config.replace(**dict(zip(self.parameters, values)))
+        sim = HeatTransferSimulation(config, solver=self.solver, dt=self.dt, verbose=False)
+        times = []
+        samples = []
+        for frame in run_transient(sim, self.boundary, self.output_interval):
+            times.append(frame.time)
+            samples.append((frame.grid[self.rows, self.cols] * self.weights).sum(axis=1))
+        samples = np.array(samples)
+        return np.concatenate([
+            np.interp(t, times, samples[:, s]) for s, t in enumerate(self.times)
+        ])
+
+    def residuals(self, values):
+        return self.simulate(values) - self.measured
+
+def load_problem(problem):
+    # Worker initializer: ship the problem to each process once
+    global worker_problem
+    worker_problem = problem
+
+def worker_residuals(values):
+    return worker_problem.residuals(values)
+
+def fit(problem, initial=None, bounds=None, max_workers=None, step=1e-3,
+        tolerance=1e-6, max_evaluations=50):
+    # Least-squares fit of problem.parameters to the observations
+    # - initial: starting values (defaults to problem.config); bounds:
+    #   {name: (low, high)} limits, positive
+    # - Parameters are fit as logarithms, so k ~ 100 and emissivity ~ 0.5 are
+    #   scaled alike and stay positive
+    # - Jacobian columns are forward differences of size `step` in log space,
+    #   evaluated in parallel, one worker process per parameter
+    # - tolerance: relative change of cost or parameters that ends the fit
+    # Returns a dict of fitted values, their relative standard errors and
+    # correlations (linearized), the RMS misfit (°C) and run statistics.
+    from scipy.optimize import least_squares
+
+    names = problem.parameters
+    if initial is None:
+        initial = {name: getattr(problem.config, name) for name in names}
+    x0 = np.log([initial[name] for name in names])
+    low = np.full(len(names), -np.inf)
+    high = np.full(len(names), np.inf)
+    for n, name in enumerate(names):
+        if bounds and name in bounds:
+            low[n], high[n] = np.log(bounds[name])
+    x0 = np.clip(x0, low, high)
+
+    last = {}
+
+    def residuals(x):
+        key = x.tobytes()
+        if key not in last:
+            last.clear()
+            last[key] = problem.residuals(np.exp(x))
+        return last[key]
+
+    start_time = time.time()
+    with ProcessPoolExecutor(max_workers=max_workers or len(names),
+                             initializer=load_problem, initargs=(problem,)) as executor:
+
+        def jacobian(x):
+            r0 = residuals(x)
+            # Step away from an active upper bound
+            steps = np.where(x + step > high, -step, step)
+            shifted = [np.exp(x + steps[n] * (np.arange(len(x)) == n)) for n in range(len(x))]
+            columns = executor.map(worker_residuals, shifted)
+            return np.column_stack([(r - r0) / h for r, h in zip(columns, steps)])
+
+        result = least_squares(residuals, x0, jac=jacobian, bounds=(low, high),
+                               ftol=tolerance, xtol=tolerance, max_nfev=max_evaluations)
+
+    # Linearized covariance of the log-parameters
+    m, n = result.jac.shape
+    variance = 2 * result.cost / max(m - n, 1)
+    covariance = np.linalg.pinv(result.jac.T @ result.jac) * variance
+    sigma = np.sqrt(np.diag(covariance))
+    with np.errstate(invalid='ignore', divide='ignore'):
+        correlation = covariance / np.outer(sigma, sigma)
+
+    return {
+        'values': dict(zip(names, np.exp(result.x))),
+        'relative_error': dict(zip(names, sigma)),
+        'correlation': correlation,
+        'rms': float(np.sqrt(np.mean(result.fun**2))),
+        'evaluations': result.nfev,
+        'jacobians': result.njev,
+        'status': result.message,
+        'wall_time': time.time() - start_time,
+    }
@@ -0,0 +1,29 @@
+# Compiled kernels for the explicit stepper
+# The fused C++ step lives in the termodyn `c` package (pybind11, built with
+# scikit-build). When that extension is not installed every caller falls
+# back to the NumPy path, which gives the same results to float tolerance.
+try:
+    from c._core import explicit_step as native_explicit_step
+except ImportError:
+    native_explicit_step = None
+
+# Kernels for HeatTransferSimulation(kernel=...)
+# - numpy: the allocation-free NumPy step (always available)
+# - native: the fused single-pass C++ step (stencil, edges and max change)
+# - auto: native when it is installed, numpy otherwise
+KERNELS = ('auto', 'numpy', 'native')
+
+def resolve_kernel(kernel, solver):
+    # Kernel actually used for a solver; only the explicit solver has a
+    # native kernel
+    if kernel not in KERNELS:
+        raise ValueError(f"Unknown kernel {kernel!r}, expected one of {KERNELS}")
+    if kernel == 'native':
+        if native_explicit_step is None:
+            raise ValueError("The native kernel is not installed (termodyn `c` package)")
+        if solver != 'explicit':
+            raise ValueError("The native kernel only supports the explicit solver")
+        return 'native'
+    if kernel == 'auto' and native_explicit_step is not None and solver == 'explicit':
+        return 'native'
+    return 'numpy'
@@ -0,0 +1,152 @@
+import numpy as np
+import scipy.sparse as sp
+
+from .stencil import laplacian
+from .steady_state import SteadyStateSolver
+
+def interpolation_matrix(n_to, n_from):
+    # Linear interpolation between n_from and n_to equally spaced nodes that
+    # span the same interval. Grids don't need to be nested, so any
+    # WIDTH/HEIGHT can be coarsened.
+    position = np.arange(n_to) * (n_from - 1) / (n_to - 1)
+    left = np.minimum(position.astype(int), n_from - 2)
+    weight = position - left
+    rows = np.tile(np.arange(n_to), 2)
+    cols = np.concatenate([left, left + 1])
+    data = np.concatenate([1 - weight, weight])
+    return sp.csr_matrix((data, (rows, cols)), shape=(n_to, n_from))
+
+def restriction_matrix(prolongation):
+    # Transpose of the prolongation, scaled so every coarse row averages
+    # (full weighting on nested grids)
+    restriction = prolongation.T.tocsr()
+    return sp.diags(1 / np.asarray(restriction.sum(axis=1)).ravel()) @ restriction
+
+class MultigridLevel:
+    # Storage for one grid level of the V-cycle
+    # - u: full grid (edges are Dirichlet data), f: interior source term
+    # - relaxation: ALPHA*DT of the explicit pseudo-time step on this level,
+    #   0.2 * min(dx², dy²) as in run_simulation; one explicit step is then
+    #   a weighted Jacobi sweep (weight 0.8 on square cells)
+
+    def __init__(self, height, width, dx, dy):
+        self.shape = (height, width)
+        self.dx = dx
+        self.dy = dy
+        self.relaxation = 0.2 * min(dx**2, dy**2)
+        self.u = np.zeros((height, width))
+        self.f = np.zeros((height - 2, width - 2))
+        self.residual = np.zeros((height, width))
+        self.stencil = np.empty((height - 2, width - 2))
+        self.work = np.empty((height - 2, width - 2))
+        # Transfers to the next finer level (set on coarse levels only)
+        self.prolongation = None
+        self.restriction = None
+        self.injection = None
+
+class MultigridSolver:
+    # Geometric multigrid for the steady heat equation -Laplace(T) = f
+    # Same interface as SteadyStateSolver: solve(grid) fills the interior
+    # from the grid's edge values.
+    # - Smoother: the explicit time step of run_simulation (same stencil,
+    #   pseudo-time DT), which damps the rough error modes quickly
+    # - Coarse levels: roughly half the nodes per axis, linear interpolation
+    #   and full-weighting restriction; the coarsest level is solved directly
+    # - Full multigrid (FMG) start, then V-cycles until the largest change
+    #   per cycle drops below `tolerance`, so the cycle count stays roughly
+    #   constant as the grid is refined
+
+    def __init__(self, height, width, dx, dy, tolerance=1e-4, max_cycles=100,
+                 pre_smoothing=2, post_smoothing=2, coarsest_size=9):
+        self.tolerance = tolerance
+        self.max_cycles = max_cycles
+        self.pre_smoothing = pre_smoothing
+        self.post_smoothing = post_smoothing
+        self.iterations = 0
+
+        # Build the grid hierarchy from the finest level down
+        length_y, length_x = dy * (height - 1), dx * (width - 1)
+        self.levels = [MultigridLevel(height, width, dx, dy)]
+        while min(height, width) > coarsest_size:
+            fine_height, fine_width = height, width
+            height, width = (height + 1) // 2, (width + 1) // 2
+            level = MultigridLevel(height, width, length_x / (width - 1), length_y / (height - 1))
+            level.prolongation = (interpolation_matrix(fine_height, height),
+                                  interpolation_matrix(fine_width, width))
+            level.restriction = tuple(map(restriction_matrix, level.prolongation))
+            level.injection = (interpolation_matrix(height, fine_height),
+                               interpolation_matrix(width, fine_width))
+            self.levels.append(level)
+
+        coarsest = self.levels[-1]
+        self.coarse_solver = SteadyStateSolver(*coarsest.shape, coarsest.dx, coarsest.dy)
+        self.previous = np.empty((self.levels[0].shape))
+
+    def smooth(self, level, sweeps):
+        # Explicit pseudo-time steps with source: u += ALPHA*DT (Laplace(u) + f)
+        interior = level.u[1:-1, 1:-1]
+        for _ in range(sweeps):
+            change = laplacian(level.u, level.dx, level.dy, out=level.stencil, work=level.work)
+            np.add(change, level.f, out=change)
+            np.multiply(change, level.relaxation, out=change)
+            np.add(interior, change, out=interior)
+
+    def v_cycle(self, index):
+        level = self.levels[index]
+        if index == len(self.levels) - 1:
+            self.coarse_solver.solve(level.u, source=level.f)
+            return
+
+        self.smooth(level, self.pre_smoothing)
+
+        # Residual r = f + Laplace(u), zero on the edges
+        residual = laplacian(level.u, level.dx, level.dy, out=level.stencil, work=level.work)
+        np.add(residual, level.f, out=level.residual[1:-1, 1:-1])
+
+        # Coarse-grid correction for the error equation -Laplace(e) = r
+        coarse = self.levels[index + 1]
+        restrict_y, restrict_x = coarse.restriction
+        coarse.f[...] = (restrict_y @ level.residual @ restrict_x.T)[1:-1, 1:-1]
+        coarse.u.fill(0.0)
+        self.v_cycle(index + 1)
+        prolong_y, prolong_x = coarse.prolongation
+        level.u[1:-1, 1:-1] += (prolong_y @ coarse.u @ prolong_x.T)[1:-1, 1:-1]
+
+        self.smooth(level, self.post_smoothing)
+
+    def full_multigrid(self):
+        # Coarse versions of the problem, solved from the coarsest level up;
+        # each interpolated solution is the starting guess one level finer
+        for fine, coarse in zip(self.levels, self.levels[1:]):
+            inject_y, inject_x = coarse.injection
+            coarse.u[...] = inject_y @ fine.u @ inject_x.T
+
+        for level in self.levels:
+            level.f.fill(0.0)
+        self.v_cycle(len(self.levels) - 1)
+
+        for index in range(len(self.levels) - 2, -1, -1):
+            level, coarse = self.levels[index], self.levels[index + 1]
+            prolong_y, prolong_x = coarse.prolongation
+            level.u[1:-1, 1:-1] = (prolong_y @ coarse.u @ prolong_x.T)[1:-1, 1:-1]
+            level.f.fill(0.0)
+            self.v_cycle(index)
+
+    def solve(self, grid):
+        # Fill grid[1:-1, 1:-1] in place from its edge values
+        finest = self.levels[0]
+        finest.u[...] = grid
+        self.full_multigrid()
+        self.iterations = 1
+
+        max_change = float('inf')
+        while max_change > self.tolerance and self.iterations < self.max_cycles:
+            np.copyto(self.previous, finest.u)
+            finest.f.fill(0.0)
+            self.v_cycle(0)
+            np.subtract(finest.u, self.previous, out=self.previous)
+            max_change = np.max(np.abs(self.previous))
+            self.iterations += 1
+
+        grid[1:-1, 1:-1] = finest.u[1:-1, 1:-1]
+        return grid
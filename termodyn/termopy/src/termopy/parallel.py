@@ -0,0 +1,134 @@
+import os
+import threading
+
+import numpy as np
+
+from .HeatTransferSimulation import HeatTransferSimulation
+from .stencil import laplacian
+
+def strip_bounds(rows, count):
+    # Split interior rows 1..rows-2 into `count` nearly equal [start, stop)
+    # strips (fewer when there are not enough rows)
+    count = max(1, min(count, rows - 2))
+    edges = np.linspace(1, rows - 1, count + 1).round().astype(int)
+    return [(int(start), int(stop)) for start, stop in zip(edges[:-1], edges[1:])]
+
+class StripPool:
+    # Persistent worker threads, one per strip
+    # run(task) calls task(n) for every strip n in parallel and returns when
+    # all are done; the calling thread works strip 0 itself. Two barrier
+    # waits per call are the only synchronization. NumPy ufuncs release the
+    # GIL on large arrays, so the strips run truly concurrently.
+
+    def __init__(self, count):
+        self.count = count
+        self.task = None
+        self.error = None
+        self.start = threading.Barrier(count)
+        self.done = threading.Barrier(count)
+        self.threads = [
+            threading.Thread(target=self.work, args=(n,), daemon=True)
+            for n in range(1, count)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    def work(self, n):
+        while True:
+            self.start.wait()
+            task = self.task
+            if task is None:
+                return
+            try:
+                task(n)
+            except BaseException as error:
+                self.error = error
+            self.done.wait()
+
+    def run(self, task):
+        self.task = task
+        self.start.wait()
+        try:
+            task(0)
+        finally:
+            self.done.wait()
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+
+    def close(self):
+        if self.threads:
+            self.task = None
+            self.start.wait()
+            for thread in self.threads:
+                thread.join()
+            self.threads = []
+
+class ParallelHeatTransferSimulation(HeatTransferSimulation):
+    # Explicit HeatTransferSimulation with the grid split into row strips,
+    # each advanced by its own thread
+    # - Strips share the ping-pong buffers; the halo rows a strip needs are
+    #   read straight from its neighbours' rows of the source grid, so the
+    #   per-step "halo exchange" is the barrier that ends the step
+    # - Each strip writes only its own rows of the stencil/diff scratch, and
+    #   the result is bit-for-bit the serial explicit step
+    # - Edges and the boundary engine (O(perimeter)) stay on the main thread
+    # Call close() (or use as a context manager) to stop the worker threads.
+    # Speedup is unmeasured: so far benchmarks/bench_parallel.py has only
+    # run on a single core, where it shows no overhead (13.4-13.9 ms/step
+    # for 1-4 strips on 1000x1000) and, necessarily, no gain. Run it on the
+    # target machine before choosing this over the serial stepper; the
+    # stencil is memory-bound, so expect scaling to stop at memory bandwidth.
+
+    def __init__(self, config=None, workers=None, dt=None, verbose=True):
+        super().__init__(config, solver='explicit', dt=dt, verbose=verbose, kernel='numpy')
+        self.strips = strip_bounds(self.HEIGHT, workers or os.cpu_count() or 1)
+        self.pool = StripPool(len(self.strips))
+        self.strip_change = np.zeros(len(self.strips))
+        self.log(f"- Strips: {len(self.strips)}")
+
+    def cache_state(self):
+        # The strip count is left out: results are bit-for-bit those of the
+        # serial stepper whatever the number of strips
+        return super().cache_state()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.pool.close()
+
+    def step_explicit(self, src, dst, buffers, use_convection_radiation=True):
+        scale = self.ALPHA * self.DT
+
+        def advance(n):
+            start, stop = self.strips[n]
+            # Interior rows start..stop-1 and their halo rows start-1, stop
+            change = laplacian(src[start - 1:stop + 1], self.DX, self.DY,
+                               out=buffers.stencil[start - 1:stop - 1],
+                               work=buffers.diff[start:stop, 1:-1])
+            np.multiply(change, scale, out=change)
+            np.add(src[start:stop, 1:-1], change, out=dst[start:stop, 1:-1])
+
+        self.pool.run(advance)
+        self.advance_edges(src, dst, buffers, use_convection_radiation)
+
+    def max_change(self, src, dst, buffers):
+        # Convergence check, strip by strip; the edge rows go to the first
+        # and last strips
+        last = len(self.strips) - 1
+
+        def measure(n):
+            start, stop = self.strips[n]
+            start = 0 if n == 0 else start
+            stop = self.HEIGHT if n == last else stop
+            diff = buffers.diff[start:stop]
+            np.subtract(dst[start:stop], src[start:stop], out=diff)
+            np.abs(diff, out=diff)
+            self.strip_change[n] = diff.max()
+
+        self.pool.run(measure)
+        return self.strip_change.max()
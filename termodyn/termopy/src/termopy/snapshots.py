@@ -0,0 +1,317 @@
+import json
+import os
+import queue
+import threading
+import zlib
+
+import numpy as np
+
+from .transient import Frame
+
+# On-disk layout of a snapshot store (a directory):
+# - meta.json: grid shape, dtype, frames per chunk and compression
+# - data.bin: compressed chunks back to back; each chunk is `count` frames
+#   of the grid, byte-shuffled (all first bytes, then all second bytes, ...)
+#   and zlib-compressed
+# - chunks.bin: one CHUNK_DTYPE record per chunk, written after its data;
+#   only frames covered by a record here are part of the store
+# - frames.bin: one FRAME_DTYPE record per frame
+# All three .bin files are append-only, so a store can be reopened and
+# extended, and readers memory-map them.
+FORMAT_VERSION = 1
+FRAME_DTYPE = np.dtype([('time', '<f8'), ('step', '<i8'),
+                        ('T_hot_surface', '<f8'), ('T_ambient', '<f8')])
+CHUNK_DTYPE = np.dtype([('offset', '<i8'), ('nbytes', '<i8'), ('start', '<i8'), ('count', '<i8')])
+
+# Uncompressed bytes per chunk; chunks are sized to stay under it
+CHUNK_BYTES = 8 * 1024**2
+
+def shuffle(chunk):
+    # Group the bytes of every element by significance; smooth float fields
+    # then compress several times better
+    raw = chunk.reshape(-1).view(np.uint8).reshape(-1, chunk.dtype.itemsize)
+    return np.ascontiguousarray(raw.T)
+
+def unshuffle(data, dtype, shape):
+    raw = np.frombuffer(data, np.uint8).reshape(dtype.itemsize, -1)
+    return np.ascontiguousarray(raw.T).view(dtype).reshape(shape)
+
+def read_meta(path):
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    if meta['version'] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format version {meta['version']}")
+    return meta
+
+def read_records(path, name, dtype):
+    # Memory-mapped records of one index file (empty arrays map nothing)
+    filename = os.path.join(path, name)
+    count = os.path.getsize(filename) // dtype.itemsize
+    if count == 0:
+        return np.empty(0, dtype)
+    return np.memmap(filename, dtype, mode='r', shape=(count,))
+
+class SnapshotWriter:
+    # Appendable, chunked, compressed sink for simulation frames
+    # - write(frame) copies the grid into the current chunk and returns; full
+    #   chunks are compressed and written by a background thread (zlib
+    #   releases the GIL), so I/O overlaps with the next steps
+    # - At most `queue_size` chunks wait for the writer; past that write()
+    #   blocks, which bounds memory when the disk cannot keep up
+    # - Opening an existing store appends to it (grid shape and dtype must
+    #   match); frames of a chunk that never got its chunk record, e.g.
+    #   after a crash, are dropped
+    # - Frame times never decrease (SnapshotReader.between searches them):
+    #   appending continues the stored run, and a frame earlier than the
+    #   last one, such as a new run starting again at 0, raises ValueError;
+    #   give each run its own store
+    # - close() (or leaving a with block) flushes the partial chunk, waits
+    #   for the writer and re-raises any error it hit
+    # dtype=np.float32 halves the store for plotting-only histories.
+
+    def __init__(self, path, dtype=np.float64, chunk_frames=None, level=1, queue_size=2):
+        self.path = path
+        self.dtype = np.dtype(dtype)
+        self.chunk_frames = chunk_frames
+        self.level = level
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.error = None
+        self.thread = None
+        self.chunk = None
+        self.records = None
+        self.filled = 0
+        self.count = 0
+        self.files = None
+        self.last_time = -np.inf
+        if os.path.exists(os.path.join(path, 'meta.json')):
+            self.open(read_meta(path))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        # Frames written so far, including those still queued
+        return self.count
+
+    def create(self, shape):
+        os.makedirs(self.path, exist_ok=True)
+        frame_bytes = int(np.prod(shape)) * self.dtype.itemsize
+        meta = {
+            'version': FORMAT_VERSION,
+            'shape': list(shape),
+            'dtype': self.dtype.str,
+            'chunk_frames': self.chunk_frames or max(1, CHUNK_BYTES // frame_bytes),
+            'compression': 'zlib',
+            'level': self.level,
+            'filters': ['shuffle'],
+        }
+        for name in ('data.bin', 'chunks.bin', 'frames.bin'):
+            open(os.path.join(self.path, name), 'wb').close()
+        with open(os.path.join(self.path, 'meta.json'), 'w') as f:
+            json.dump(meta, f, indent=2)
+        self.open(meta)
+
+    def open(self, meta):
+        # Start appending after the last committed chunk
+        self.shape = tuple(meta['shape'])
+        if np.dtype(meta['dtype']) != self.dtype:
+            raise ValueError(f"Snapshot store {self.path} holds {np.dtype(meta['dtype'])}, "
+                             f"not {self.dtype}")
+        self.chunk_frames = meta['chunk_frames']
+        chunks = read_records(self.path, 'chunks.bin', CHUNK_DTYPE)
+        if len(chunks):
+            last = chunks[-1]
+            data_end = int(last['offset'] + last['nbytes'])
+            self.count = int(last['start'] + last['count'])
+        else:
+            data_end = 0
+            self.count = 0
+        del chunks
+        if self.count:
+            frames = read_records(self.path, 'frames.bin', FRAME_DTYPE)
+            self.last_time = float(frames['time'][self.count - 1])
+            del frames
+        self.files = {}
+        for name, size in (('data.bin', data_end),
+                           ('chunks.bin', None),
+                           ('frames.bin', self.count * FRAME_DTYPE.itemsize)):
+            f = open(os.path.join(self.path, name), 'r+b')
+            if size is None:
+                size = os.path.getsize(f.name) // CHUNK_DTYPE.itemsize * CHUNK_DTYPE.itemsize
+            f.truncate(size)
+            f.seek(size)
+            self.files[name] = f
+        self.offset = data_end
+        self.written = self.count
+
+    def write(self, frame):
+        # Append one Frame (or anything with its fields)
+        if self.error is not None:
+            raise self.error
+        if self.files is None:
+            self.create(np.shape(frame.grid))
+        if np.shape(frame.grid) != self.shape:
+            raise ValueError(f"Frame grid has shape {np.shape(frame.grid)}, "
+                             f"expected {self.shape}")
+        if not frame.time >= self.last_time:
+            raise ValueError(f"Frame time {frame.time} is before the last stored time "
+                             f"{self.last_time}; write each run to its own store")
+        self.last_time = frame.time
+        if self.thread is None:
+            self.thread = threading.Thread(target=self.work, daemon=True)
+            self.thread.start()
+        if self.chunk is None:
+            self.chunk = np.empty((self.chunk_frames,) + self.shape, self.dtype)
+            self.records = np.zeros(self.chunk_frames, FRAME_DTYPE)
+        self.chunk[self.filled] = frame.grid
+        self.records[self.filled] = (frame.time, frame.step, frame.T_hot_surface, frame.T_ambient)
+        self.filled += 1
+        self.count += 1
+        if self.filled == self.chunk_frames:
+            self.flush()
+
+    def flush(self):
+        # Hand the current (possibly partial) chunk to the writer thread
+        if self.filled:
+            self.queue.put((self.chunk[:self.filled], self.records[:self.filled]))
+            self.chunk = None
+            self.records = None
+            self.filled = 0
+
+    def work(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            if self.error is not None:
+                continue
+            chunk, records = item
+            try:
+                data = zlib.compress(shuffle(chunk), self.level)
+                self.files['data.bin'].write(data)
+                self.files['frames.bin'].write(records.tobytes())
+                self.files['data.bin'].flush()
+                self.files['frames.bin'].flush()
+                # The chunk record commits the chunk, so it goes last
+                record = np.array([(self.offset, len(data), self.written, len(records))], CHUNK_DTYPE)
+                self.files['chunks.bin'].write(record.tobytes())
+                self.files['chunks.bin'].flush()
+                self.offset += len(data)
+                self.written += len(records)
+            except BaseException as error:
+                self.error = error
+
+    def close(self):
+        if self.files is None:
+            return
+        try:
+            if self.error is None:
+                self.flush()
+            if self.thread is not None:
+                self.queue.put(None)
+                self.thread.join()
+                self.thread = None
+        finally:
+            for f in self.files.values():
+                f.close()
+            self.files = None
+        if self.error is not None:
+            raise self.error
+
+class SnapshotReader:
+    # Lazy, memory-mapped view of a snapshot store
+    # - times, steps, T_hot_surface and T_ambient are memory-mapped arrays
+    #   over all frames; grids are decompressed only for the chunks a read
+    #   touches (the last chunk read is kept)
+    # - reader[i] is one grid, reader[a:b:s] a (frames, HEIGHT, WIDTH)
+    #   array; between(t0, t1) slices by simulated time
+    # - Frames appended after opening are picked up by refresh()
+
+    def __init__(self, path):
+        self.path = path
+        meta = read_meta(path)
+        self.shape = tuple(meta['shape'])
+        self.dtype = np.dtype(meta['dtype'])
+        self.chunk_frames = meta['chunk_frames']
+        self.cached = (None, None)
+        self.refresh()
+
+    def refresh(self):
+        self.chunks = read_records(self.path, 'chunks.bin', CHUNK_DTYPE)
+        count = int(self.chunks['start'][-1] + self.chunks['count'][-1]) if len(self.chunks) else 0
+        self.frames = read_records(self.path, 'frames.bin', FRAME_DTYPE)[:count]
+        self.data = read_records(self.path, 'data.bin', np.dtype(np.uint8))
+
+    def __len__(self):
+        return len(self.frames)
+
+    @property
+    def times(self):
+        return self.frames['time']
+
+    @property
+    def steps(self):
+        return self.frames['step']
+
+    @property
+    def T_hot_surface(self):
+        return self.frames['T_hot_surface']
+
+    @property
+    def T_ambient(self):
+        return self.frames['T_ambient']
+
+    def chunk(self, n):
+        # Frames of chunk n, decompressed
+        if self.cached[0] != n:
+            offset, nbytes, _, count = self.chunks[n]
+            data = zlib.decompress(self.data[offset:offset + nbytes])
+            self.cached = (n, unshuffle(data, self.dtype, (int(count),) + self.shape))
+        return self.cached[1]
+
+    def locate(self, index):
+        # (chunk, position in chunk) of a frame index
+        n = int(np.searchsorted(self.chunks['start'], index, side='right')) - 1
+        return n, index - int(self.chunks['start'][n])
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            indices = range(*index.indices(len(self)))
+            out = np.empty((len(indices),) + self.shape, self.dtype)
+            for i, frame in enumerate(indices):
+                n, position = self.locate(frame)
+                out[i] = self.chunk(n)[position]
+            return out
+        index = int(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Frame {index} out of range for {len(self)} frames")
+        n, position = self.locate(index)
+        return self.chunk(n)[position].copy()
+
+    def between(self, start=None, stop=None, stride=1):
+        # Grids with start <= time < stop (either bound may be None); a
+        # binary search, valid because SnapshotWriter keeps times in order
+        first = 0 if start is None else int(np.searchsorted(self.times, start, side='left'))
+        last = len(self) if stop is None else int(np.searchsorted(self.times, stop, side='left'))
+        return self[first:last:stride]
+
+    def __iter__(self):
+        # Frames in order, one chunk decompressed at a time
+        for n, (_, _, start, count) in enumerate(self.chunks):
+            grids = self.chunk(n)
+            for i in range(int(count)):
+                time, step, T_hot_surface, T_ambient = self.frames[start + i].tolist()
+                yield Frame(time, step, T_hot_surface, T_ambient, grids[i].copy())
+
+def record(frames, path, **options):
+    # Write an iterable of Frames (e.g. run_transient) to the store at
+    # `path`; options go to SnapshotWriter. Returns the store's frame count.
+    with SnapshotWriter(path, **options) as writer:
+        for frame in frames:
+            writer.write(frame)
+    return len(writer)
@@ -0,0 +1,117 @@
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+
+# Linear solvers for SteadyStateSolver(method=...)
+# - direct: sparse LU factorization, computed once and reused
+# - cg: conjugate gradients preconditioned with an incomplete LU factor
+# solve_steady_state additionally accepts 'multigrid' (see multigrid.py)
+METHODS = ('direct', 'cg')
+
+def laplacian_matrix(height, width, dx, dy):
+    # Negative 5-point Laplacian on the interior nodes of a height x width grid
+    # Rows are ordered like grid[1:-1, 1:-1].ravel(); the matrix is SPD.
+    def second_difference(n):
+        return sp.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(n, n))
+
+    nx, ny = width - 2, height - 2
+    return (sp.kron(sp.identity(ny), second_difference(nx)) / dx**2 +
+            sp.kron(second_difference(ny), sp.identity(nx)) / dy**2).tocsc()
+
+def conductance_matrix(conductance):
+    # Heterogeneous counterpart of laplacian_matrix: `conductance` holds the
+    # (HEIGHT-2, WIDTH-2) face weights k_face/spacing² of every interior
+    # node towards its south, north, west and east neighbours. Face weights
+    # are shared by the two nodes they join, so the matrix stays SPD; with
+    # every weight 1/d² it is laplacian_matrix (up to the factor k).
+    south, north = conductance['south'], conductance['north']
+    west, east = conductance['west'], conductance['east']
+    index = np.arange(south.size).reshape(south.shape)
+    rows = [index.ravel()]
+    cols = [index.ravel()]
+    values = [(south + north + west + east).ravel()]
+    for a, b, weight in (
+        (index[1:, :], index[:-1, :], south[1:, :]),
+        (index[:-1, :], index[1:, :], north[:-1, :]),
+        (index[:, 1:], index[:, :-1], west[:, 1:]),
+        (index[:, :-1], index[:, 1:], east[:, :-1]),
+    ):
+        rows.append(a.ravel())
+        cols.append(b.ravel())
+        values.append(-weight.ravel())
+    return sp.csc_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                         shape=(south.size, south.size))
+
+def conductance_rhs(grid, conductance):
+    # boundary_rhs for conductance_matrix
+    rhs = np.zeros((grid.shape[0] - 2, grid.shape[1] - 2))
+    rhs[0, :] += conductance['south'][0, :] * grid[0, 1:-1]
+    rhs[-1, :] += conductance['north'][-1, :] * grid[-1, 1:-1]
+    rhs[:, 0] += conductance['west'][:, 0] * grid[1:-1, 0]
+    rhs[:, -1] += conductance['east'][:, -1] * grid[1:-1, -1]
+    return rhs
+
+def boundary_rhs(grid, dx, dy):
+    # Contribution of the fixed edge values of grid to the interior equations
+    rhs = np.zeros((grid.shape[0] - 2, grid.shape[1] - 2))
+    rhs[0, :] += grid[0, 1:-1] / dy**2
+    rhs[-1, :] += grid[-1, 1:-1] / dy**2
+    rhs[:, 0] += grid[1:-1, 0] / dx**2
+    rhs[:, -1] += grid[1:-1, -1] / dx**2
+    return rhs
+
+class SteadyStateSolver:
+    # Direct or preconditioned-CG solve of the steady heat equation
+    # Laplace(T) = 0 on the interior nodes, with the grid's edges as Dirichlet
+    # data. The sparse operator and its factorization depend only on the grid
+    # geometry, so one solver is reused for any number of edge values.
+    # With `conductance` (see conductance_matrix) it solves div(k grad T) = 0
+    # for per-cell conductivities instead.
+
+    def __init__(self, height, width, dx, dy, method='direct', rtol=1e-10,
+                 conductance=None):
+        if method not in METHODS:
+            raise ValueError(f"Unknown method {method!r}, expected one of {METHODS}")
+        self.method = method
+        self.dx = dx
+        self.dy = dy
+        self.rtol = rtol
+        self.iterations = 0
+        self.conductance = conductance
+        if conductance is None:
+            self.matrix = laplacian_matrix(height, width, dx, dy)
+        else:
+            self.matrix = conductance_matrix(conductance)
+
+        if method == 'direct':
+            self._solve = spla.factorized(self.matrix)
+        else:
+            # Symmetric ordering and no pivoting keep the factor close to an
+            # incomplete Cholesky factor, which CG needs to stay stable
+            ilu = spla.spilu(self.matrix, permc_spec='MMD_AT_PLUS_A',
+                             diag_pivot_thresh=0.0, drop_tol=1e-4)
+            self.preconditioner = spla.LinearOperator(self.matrix.shape, ilu.solve)
+            self._solve = self._solve_cg
+
+    def _solve_cg(self, rhs):
+        def count(_):
+            self.iterations += 1
+
+        solution, info = spla.cg(self.matrix, rhs, rtol=self.rtol, M=self.preconditioner,
+                                 callback=count)
+        if info != 0:
+            raise RuntimeError(f"CG did not converge (info={info})")
+        return solution
+
+    def solve(self, grid, source=None):
+        # Fill grid[1:-1, 1:-1] in place from its edge values
+        # `source` is an optional interior term f of -Laplace(T) = f
+        if self.conductance is None:
+            rhs = boundary_rhs(grid, self.dx, self.dy)
+        else:
+            rhs = conductance_rhs(grid, self.conductance)
+        if source is not None:
+            rhs += source
+        self.iterations = 1 if self.method == 'direct' else 0
+        grid[1:-1, 1:-1] = self._solve(rhs.ravel()).reshape(rhs.shape)
+        return grid
@@ -0,0 +1,270 @@
+import csv
+import hashlib
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from .batched import BatchedHeatTransferSimulation
+from .config import MATERIALS, SimulationConfig
+from .convergence import ConvergenceMonitor
+from .HeatTransferSimulation import HeatTransferSimulation
+
+# Execution engines for run_sweep(engine=...)
+# - process: one run_simulation per case on a ProcessPoolExecutor
+# - batched: cases with the same grid shape stacked into one
+#   BatchedHeatTransferSimulation (explicit solver only)
+# - continuation: cases in continuation_order, each warm-started from the
+#   nearest case already solved, all judged by the steady-state residual
+ENGINES = ('process', 'batched', 'continuation')
+
+# Result columns produced for every case, after the config fields
+RESULT_COLUMNS = (
+    'key', 'solver', 'use_convection_radiation',
+    'T_min', 'T_max', 'T_mean', 'conv_loss', 'rad_loss',
+    'iterations', 'max_change', 'wall_time', 'warm_start',
+)
+
+def parameter_grid(base=None, **axes):
+    # Cartesian product of parameter values as a list of SimulationConfig
+    # Each keyword is a config field with a list of values, e.g.
+    #   parameter_grid(h_natural_conv=[5, 8, 12], thickness=[0.005, 0.01])
+    # The special axis `material` takes names from MATERIALS and sets
+    # k, rho, cp and emissivity together.
+    base = base if base is not None else SimulationConfig()
+    names = list(axes)
+    configs = []
+    for values in itertools.product(*(axes[name] for name in names)):
+        changes = {}
+        for name, value in zip(names, values):
+            if name == 'material':
+                changes.update(MATERIALS[value])
+            else:
+                changes[name] = value
+        configs.append(base.replace(**changes))
+    return configs
+
+def case_key(config, solver='explicit', use_convection_radiation=True):
+    # Stable identifier of one sweep case, used to resume partial sweeps
+    text = repr((config, solver, bool(use_convection_radiation)))
+    return hashlib.sha256(text.encode()).hexdigest()[:16]
+
+def run_case(config, solver='explicit', use_convection_radiation=True):
+    # Run one headless simulation and summarize it as a flat result row
+    # Module-level so ProcessPoolExecutor workers can import it.
+    sim = HeatTransferSimulation(config, solver=solver, verbose=False)
+    grid = sim.run_simulation(use_convection_radiation)
+    return result_row(sim, grid, use_convection_radiation, sim.run_stats)
+
+def run_batched(configs, use_convection_radiation=True):
+    # Run configs through BatchedHeatTransferSimulation, one batch per grid
+    # shape. Each row reports its share of the batch wall time.
+    groups = {}
+    for config in configs:
+        groups.setdefault((config.HEIGHT, config.WIDTH), []).append(config)
+
+    rows = []
+    for group in groups.values():
+        batch = BatchedHeatTransferSimulation(group)
+        grids = batch.run_simulation(use_convection_radiation)
+        stats = batch.run_stats
+        for n, (config, grid) in enumerate(zip(group, grids)):
+            sim = HeatTransferSimulation(config, verbose=False)
+            rows.append(result_row(sim, grid, use_convection_radiation, {
+                'iterations': int(stats['iterations'][n]),
+                'max_change': float(stats['max_change'][n]),
+                'wall_time': stats['wall_time'] / len(group),
+            }))
+    return rows
+
+def result_row(sim, grid, use_convection_radiation, stats):
+    # Flat summary of one finished case: config fields, then results
+    conv_loss, rad_loss = sim.calculate_heat_transfer_rates(grid)
+    row = {name: getattr(sim.config, name) for name in config_columns()}
+    row.update({
+        'key': case_key(sim.config, sim.solver, use_convection_radiation),
+        'solver': sim.solver,
+        'use_convection_radiation': bool(use_convection_radiation),
+        'T_min': float(np.min(grid)),
+        'T_max': float(np.max(grid)),
+        'T_mean': float(np.mean(grid)),
+        'conv_loss': float(conv_loss),
+        'rad_loss': float(rad_loss),
+        'iterations': stats['iterations'],
+        'max_change': stats['max_change'],
+        'wall_time': stats['wall_time'],
+        'warm_start': '',
+    })
+    return row
+
+def continuation_order(configs):
+    # Solve order for a warm-started sweep as (index, parent) pairs, where
+    # parent is the index of the nearest already solved config with the same
+    # grid shape, or None for a cold start
+    # - Distance is Euclidean over the numeric config fields that vary, each
+    #   scaled to [0, 1] by its range in the sweep
+    # - Within a shape the order grows a minimum spanning tree (Prim), so
+    #   every case is started from the closest solution available
+    fields = [name for name in config_columns() if name not in ('WIDTH', 'HEIGHT')]
+    points = np.array([[float(getattr(c, name)) for name in fields] for c in configs])
+    if len(configs):
+        span = np.ptp(points, axis=0)
+        points = points / np.where(span > 0, span, 1)
+
+    groups = {}
+    for index, config in enumerate(configs):
+        groups.setdefault((config.HEIGHT, config.WIDTH), []).append(index)
+
+    order = []
+    for group in groups.values():
+        group = np.array(group)
+        coords = points[group]
+        solved = np.zeros(len(group), dtype=bool)
+        distance = np.full(len(group), np.inf)
+        parent = np.full(len(group), -1)
+        current = 0
+        order.append((int(group[0]), None))
+        for _ in range(len(group) - 1):
+            solved[current] = True
+            d = np.linalg.norm(coords - coords[current], axis=1)
+            closer = ~solved & (d < distance)
+            distance[closer] = d[closer]
+            parent[closer] = current
+            current = int(np.argmin(np.where(solved, np.inf, distance)))
+            order.append((int(group[current]), int(group[parent[current]])))
+    return order
+
+def run_continuation(configs, solver='explicit', use_convection_radiation=True,
+                     convergence=None):
+    # Run configs one after another in continuation_order, each warm-started
+    # from its parent's grid. Returns the rows and a summary of the savings.
+    # Grids are dropped once no later case needs them as a parent.
+    # Every case, cold or warm, stops on `convergence`, by default the
+    # steady-state residual: a per-step change only shows how far one step
+    # moves the field, so a warm start would pass it after a single step
+    # whether or not it is close to its own solution.
+    if convergence is None:
+        convergence = ConvergenceMonitor('residual')
+    order = continuation_order(configs)
+    remaining = {}
+    for _, parent in order:
+        if parent is not None:
+            remaining[parent] = remaining.get(parent, 0) + 1
+
+    grids = {}
+    keys = {}
+    rows = []
+    for index, parent in order:
+        sim = HeatTransferSimulation(configs[index], solver=solver, verbose=False)
+        initial = grids.get(parent)
+        grid = sim.run_simulation(use_convection_radiation, initial_grid=initial,
+                                  convergence=convergence)
+        row = result_row(sim, grid, use_convection_radiation, sim.run_stats)
+        keys[index] = row['key']
+        if parent is not None:
+            row['warm_start'] = keys[parent]
+            remaining[parent] -= 1
+            if not remaining[parent]:
+                del grids[parent]
+        if remaining.get(index):
+            grids[index] = grid
+        rows.append(row)
+
+    # Cold starts give the reference cost of a case without continuation
+    cold = [row['iterations'] for row in rows if not row['warm_start']]
+    iterations = sum(row['iterations'] for row in rows)
+    cold_estimate = np.mean(cold) * len(rows) if cold else 0
+    summary = {
+        'cases': len(rows),
+        'cold_starts': len(cold),
+        'iterations': iterations,
+        'cold_iterations_estimate': float(cold_estimate),
+        'iteration_saving': float(1 - iterations / cold_estimate) if cold_estimate else 0.0,
+    }
+    return rows, summary
+
+def config_columns():
+    # Input columns: the init fields of SimulationConfig
+    return [name for name, f in SimulationConfig.__dataclass_fields__.items() if f.init]
+
+def load_results(results_path):
+    # Rows already written by an interrupted sweep, keyed by case key
+    if results_path is None or not os.path.exists(results_path):
+        return {}
+    with open(results_path, newline='') as f:
+        return {row['key']: row for row in csv.DictReader(f)}
+
+def run_sweep(configs, solver='explicit', use_convection_radiation=True,
+              max_workers=None, results_path=None, engine='process'):
+    # Run every config on a process pool (all cores by default), or with
+    # engine='batched' as stacked array programs in this process, or with
+    # engine='continuation' sequentially, warm-starting each case from the
+    # nearest solved one (summary in DataFrame.attrs['continuation'])
+    # - Each finished case is appended to `results_path` (CSV) right away;
+    #   rerunning with the same path skips cases that are already there,
+    #   so an interrupted sweep resumes where it stopped
+    # - Returns a pandas DataFrame with one row per config, in input order
+    import pandas as pd
+
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}, expected one of {ENGINES}")
+    if engine == 'batched' and solver != 'explicit':
+        raise ValueError("The batched engine only supports the explicit solver")
+
+    columns = config_columns() + list(RESULT_COLUMNS)
+    keys = [case_key(config, solver, use_convection_radiation) for config in configs]
+    done = load_results(results_path)
+    pending = {key: config for key, config in zip(keys, configs) if key not in done}
+
+    writer = None
+    output = None
+    if results_path is not None:
+        new_file = not os.path.exists(results_path)
+        output = open(results_path, 'a', newline='')
+        writer = csv.DictWriter(output, fieldnames=columns)
+        if new_file:
+            writer.writeheader()
+            output.flush()
+
+    rows = {}
+    summary = None
+
+    def record(row):
+        rows[row['key']] = row
+        if writer is not None:
+            writer.writerow(row)
+            output.flush()
+
+    try:
+        if engine == 'batched':
+            for row in run_batched(list(pending.values()), use_convection_radiation):
+                record(row)
+        elif engine == 'continuation':
+            results, summary = run_continuation(
+                list(pending.values()), solver, use_convection_radiation)
+            for row in results:
+                record(row)
+        else:
+            with ProcessPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(run_case, config, solver, use_convection_radiation)
+                    for config in pending.values()
+                ]
+                for future in as_completed(futures):
+                    record(future.result())
+    finally:
+        if output is not None:
+            output.close()
+
+    if results_path is None:
+        table = pd.DataFrame([rows[key] for key in keys], columns=columns)
+    else:
+        # The CSV holds both resumed and new rows; let pandas parse the types
+        table = pd.read_csv(results_path, keep_default_na=False)
+        table = table.drop_duplicates('key', keep='last')
+        table = table.set_index('key').loc[keys].reset_index()[columns]
+    if summary is not None:
+        table.attrs['continuation'] = summary
+    return table
@@ -0,0 +1,223 @@
+import collections
+import csv
+import datetime
+import json
+import os
+import time
+
+import numpy as np
+
+# Hot-box sensors (hardware/sensors.py sensor_mapping) and the simulation
+# boundary each one drives: the heated A side is the hot surface, the
+# B side is the ambient the plate cools into
+SENSOR_NAMES = {'28b87f230d000052': 'A Side', '28f475b80e000076': 'B Side'}
+SENSOR_ROLES = {'A Side': 'T_hot_surface', 'B Side': 'T_ambient'}
+
+# Boundary fields a series can drive
+FIELDS = ('T_hot_surface', 'T_ambient')
+
+# One output snapshot of a transient run
+Frame = collections.namedtuple('Frame', 'time step T_hot_surface T_ambient grid')
+
+def parse_timestamp(value):
+    # Seconds since the epoch from a number, a numeric string or an ISO 8601
+    # string (the hardware's iso_timestamp). Naive times are taken as UTC.
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    moment = datetime.datetime.fromisoformat(value)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=datetime.timezone.utc)
+    return moment.timestamp()
+
+def measurement_events(measurements, sensor_names=SENSOR_NAMES, roles=SENSOR_ROLES):
+    # (time, field, temperature) events from measurement payloads
+    # Accepts the dicts the hardware POSTs ({sensor_id, timestamp,
+    # temperature}) or rows from GET /measurements (which add sensor_name).
+    # Measurements from sensors without a role are skipped.
+    for m in measurements:
+        name = m.get('sensor_name') or sensor_names.get(m['sensor_id'], m['sensor_id'])
+        field = roles.get(name)
+        if field is not None:
+            yield parse_timestamp(m['timestamp']), field, float(m['temperature'])
+
+def read_payloads(path, sensor_names=SENSOR_NAMES, roles=SENSOR_ROLES):
+    # Events from a file of measurement payloads, one JSON object per line
+    with open(path) as f:
+        payloads = (json.loads(line) for line in f if line.strip())
+        yield from measurement_events(payloads, sensor_names, roles)
+
+def read_csv(path, sensor_names=SENSOR_NAMES, roles=SENSOR_ROLES):
+    # Events from a CSV file, read one row at a time
+    # - Wide: a timestamp column plus T_hot_surface and/or T_ambient columns
+    # - Long: timestamp, sensor_id or sensor_name, temperature (the
+    #   measurements table layout)
+    with open(path, newline='') as f:
+        rows = csv.DictReader(f)
+        if 'temperature' in rows.fieldnames:
+            yield from measurement_events(rows, sensor_names, roles)
+            return
+        fields = [name for name in FIELDS if name in rows.fieldnames]
+        for row in rows:
+            t = parse_timestamp(row['timestamp'])
+            for name in fields:
+                if row[name] != '':
+                    yield t, name, float(row[name])
+
+class BoundarySeries:
+    # Linear interpolation of streamed boundary events to arbitrary times
+    # - events: iterable of (time, field, value), in time order
+    # - Only the samples after the last release() are held, so memory stays
+    #   bounded however long the record is (as long as every sensor keeps
+    #   reporting); a stream that goes back in time raises ValueError
+    # - Before a field's first sample its first value is held
+
+    def __init__(self, events, fields=FIELDS):
+        self.events = iter(events)
+        self.samples = {name: collections.deque() for name in fields}
+        self.exhausted = False
+        self.last_time = -np.inf
+
+    def pull(self):
+        # Read one event into its field's queue; False once the stream ends
+        for t, name, value in self.events:
+            if t < self.last_time:
+                raise ValueError(f"Boundary events out of order at t={t}")
+            self.last_time = t
+            if name in self.samples:
+                self.samples[name].append((t, value))
+                return True
+        self.exhausted = True
+        return False
+
+    def start_time(self):
+        # Earliest time every field has a sample for, or None without data
+        while not all(self.samples.values()) and self.pull():
+            pass
+        if not all(self.samples.values()):
+            return None
+        return max(queue[0][0] for queue in self.samples.values())
+
+    def values_at(self, t):
+        # {field: value} interpolated at time t, or None once t is past the
+        # end of the data. Any t after the last release() may be queried.
+        values = {}
+        for name, queue in self.samples.items():
+            while queue[-1][0] < t and not self.exhausted:
+                self.pull()
+            if queue[-1][0] < t:
+                return None
+            n = 0
+            while n + 1 < len(queue) and queue[n + 1][0] <= t:
+                n += 1
+            t0, v0 = queue[n]
+            if n + 1 == len(queue) or t <= t0:
+                values[name] = v0
+            else:
+                t1, v1 = queue[n + 1]
+                values[name] = v0 + (v1 - v0) * (t - t0) / (t1 - t0)
+        return values
+
+    def release(self, t):
+        # Drop samples no query at or after time t can need
+        for queue in self.samples.values():
+            while len(queue) > 1 and queue[1][0] <= t:
+                queue.popleft()
+
+def run_transient(sim, events, output_interval, use_convection_radiation=True,
+                  initial_grid=None, adaptive=None):
+    # Time-march sim with boundary temperatures following a recorded series
+    # Generator: yields a Frame at the start and then every
+    # `output_interval` seconds of simulated time, and stops when the series
+    # ends. Frames own a copy of the grid; nothing else accumulates, so weeks
+    # of data run in constant memory. sim.run_stats is set when it finishes.
+    # `adaptive` is an optional AdaptiveController; steps then vary in size
+    # and land exactly on the output times. run_stats counts accepted and
+    # rejected steps either way (a fixed-DT run rejects none), and `steps`
+    # is the number of solver steps actually taken.
+    series = BoundarySeries(events)
+    t = series.start_time()
+    if t is None:
+        raise ValueError("Boundary series has no samples for " + ", ".join(FIELDS))
+
+    buffers = sim.allocate_buffers()
+    grid, grid_next = buffers.grids
+    saved = {name: getattr(sim, name) for name in FIELDS}
+    saved_dt = sim.DT
+    start_time = time.time()
+    t_start = t
+    steps = 0
+    frames = 0
+    try:
+        values = series.values_at(t)
+        for name, value in values.items():
+            setattr(sim, name, value)
+        if initial_grid is None:
+            grid.fill(sim.T_ambient)
+        else:
+            np.copyto(grid, initial_grid)
+        sim.hold_hot_surface(grid)
+        if adaptive is not None:
+            adaptive.start(sim, grid)
+
+        next_output = t
+        while True:
+            if t >= next_output - 1e-9 * output_interval:
+                yield Frame(t, steps, sim.T_hot_surface, sim.T_ambient, grid.copy())
+                frames += 1
+                next_output += output_interval
+
+            if adaptive is not None:
+                dt = adaptive.advance(sim, series, t, next_output - t, grid, grid_next,
+                                      buffers, use_convection_radiation)
+                if dt is None:
+                    break
+            else:
+                # Boundaries are taken at the end of the step they apply to
+                dt = sim.DT
+                values = series.values_at(t + dt)
+                if values is None:
+                    break
+                for name, value in values.items():
+                    setattr(sim, name, value)
+                sim.step(grid, grid_next, buffers, use_convection_radiation)
+            grid, grid_next = grid_next, grid
+            t += dt
+            steps += 1
+            series.release(t)
+    finally:
+        for name, value in saved.items():
+            setattr(sim, name, value)
+        # Through set_time_step: subclasses keep DT-scaled coefficients
+        sim.set_time_step(saved_dt)
+        sim.run_stats = {
+            'solver': sim.solver,
+            'iterations': steps,
+            'frames': frames,
+            'simulated_time': float(t - t_start),
+            'wall_time': time.time() - start_time,
+        }
+        if adaptive is not None:
+            sim.run_stats.update(adaptive.stats())
+        else:
+            sim.run_stats.update({'accepted': steps, 'rejected': 0, 'steps': steps})
+
+def write_snapshots(frames, directory):
+    # Save frames as <directory>/frame_NNNNNN.npy plus an index.csv of times
+    # and boundary values, one frame at a time. Returns the frame count.
+    # snapshots.record writes a compressed, chunked store instead.
+    os.makedirs(directory, exist_ok=True)
+    count = 0
+    with open(os.path.join(directory, 'index.csv'), 'w', newline='') as f:
+        index = csv.writer(f)
+        index.writerow(['file', 'time', 'step', 'T_hot_surface', 'T_ambient'])
+        for frame in frames:
+            name = f'frame_{count:06d}.npy'
+            np.save(os.path.join(directory, name), frame.grid)
+            index.writerow([name, frame.time, frame.step, frame.T_hot_surface, frame.T_ambient])
+            f.flush()
+            count += 1
+    return count
@@ -0,0 +1,43 @@
+import numpy as np
+
+class TridiagonalSolver:
+    # Thomas algorithm for the constant-coefficient tridiagonal system
+    #   -r x[k-1] + (1 + 2r) x[k] - r x[k+1] = d[k],  k = 0 .. n-1
+    # as it appears in each implicit half step of the ADI scheme.
+    # - The forward-elimination factors depend only on (n, r), so they are
+    #   computed once here and reused for every solve
+    # - solve() works in place on an (n, m) array: axis 0 is the system
+    #   axis, and the m independent lines are eliminated together
+
+    def __init__(self, n, r, lines):
+        self.n = n
+        self.r = r
+        self.upper = np.empty(n)            # Modified super-diagonal c'
+        self.inv_denominator = np.empty(n)  # 1 / (b - a c'[k-1])
+        self.work = np.empty(lines)         # Scratch row for the sweeps
+
+        diagonal = 1 + 2 * r
+        denominator = diagonal
+        for k in range(n):
+            if k > 0:
+                denominator = diagonal + r * self.upper[k - 1]
+            self.inv_denominator[k] = 1 / denominator
+            self.upper[k] = -r / denominator
+
+    def solve(self, d):
+        # Overwrite d with the solution x, without allocating
+        work = self.work
+
+        # Forward elimination: d'[k] = (d[k] + r d'[k-1]) / denominator[k]
+        d[0] *= self.inv_denominator[0]
+        for k in range(1, self.n):
+            np.multiply(d[k - 1], self.r, out=work)
+            np.add(d[k], work, out=d[k])
+            d[k] *= self.inv_denominator[k]
+
+        # Back substitution: x[k] = d'[k] - c'[k] x[k+1]
+        for k in range(self.n - 2, -1, -1):
+            np.multiply(d[k + 1], self.upper[k], out=work)
+            np.subtract(d[k], work, out=d[k])
+
+        return d
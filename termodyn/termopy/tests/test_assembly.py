@@ -0,0 +1,34 @@
+import numpy as np
+import pytest
+
+from termopy.assembly import AssemblySimulation, Layer, WallAssembly
+from termopy.config import SimulationConfig
+
+# Two layers an order of magnitude apart in conductivity: a uniform-k solve
+# of this wall is off by several °C
+WALL = WallAssembly((Layer('eps', 0.05), Layer('gypsum', 0.05)), length=0.1)
+CONFIG = SimulationConfig(HEIGHT=11, WIDTH=6, CONVERGENCE_THRESHOLD=1e-7,
+                          MAX_ITERATIONS=200000)
+
+@pytest.mark.parametrize('use_convection_radiation', [False, True])
+@pytest.mark.parametrize('method', ['direct', 'cg'])
+def test_steady_state_matches_explicit_march(method, use_convection_radiation):
+    sim = AssemblySimulation(WALL, CONFIG, verbose=False)
+    marched = sim.run_simulation(use_convection_radiation)
+    assert sim.run_stats['stop_reason'] == 'converged'
+    steady = sim.solve_steady_state(use_convection_radiation, method)
+    np.testing.assert_allclose(steady, marched, atol=1e-3)
+
+def test_residual_norm_uses_layered_stencil():
+    sim = AssemblySimulation(WALL, CONFIG, verbose=False)
+    steady = sim.solve_steady_state()
+    buffers = sim.allocate_buffers()
+    assert sim.residual(steady, buffers) < 1e-10
+
+def test_uniform_k_solvers_are_rejected():
+    sim = AssemblySimulation(WALL, CONFIG, verbose=False)
+    with pytest.raises(ValueError):
+        sim.solve_steady_state(method='multigrid')
+    buffers = sim.allocate_buffers()
+    with pytest.raises(ValueError):
+        sim.step_adi(*buffers.grids, buffers)
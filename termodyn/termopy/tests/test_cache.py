@@ -0,0 +1,82 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from termopy.assembly import ASSEMBLIES, AssemblySimulation
+from termopy.cache import ResultCache, cache_key, config_key
+from termopy.config import SimulationConfig
+from termopy.convergence import ConvergenceMonitor
+from termopy.HeatTransferSimulation import HeatTransferSimulation
+from termopy.simulation3d import HeatTransferSimulation3D
+
+CONFIG = SimulationConfig(WIDTH=12, HEIGHT=12, MAX_ITERATIONS=200)
+
+def test_key_covers_class_and_subclass_state():
+    assembly = ASSEMBLIES['perfect_wall_r40']
+    config = assembly.config(SimulationConfig(WIDTH=12, HEIGHT=40))
+    plate = HeatTransferSimulation(config, verbose=False)
+    layered = AssemblySimulation(assembly, config, dt=plate.DT, verbose=False)
+    volume = HeatTransferSimulation3D(config, dt=plate.DT, verbose=False)
+    keys = {cache_key(sim) for sim in (plate, layered, volume)}
+    assert len(keys) == 3
+    thicker = HeatTransferSimulation3D(config, L_D=1.0, dt=plate.DT, verbose=False)
+    assert cache_key(thicker) != cache_key(volume)
+
+def test_key_covers_limits_changed_after_construction():
+    sim = HeatTransferSimulation(CONFIG, verbose=False)
+    key = cache_key(sim)
+    sim.MAX_ITERATIONS = 100
+    assert cache_key(sim) != key
+    sim.MAX_ITERATIONS = CONFIG.MAX_ITERATIONS
+    sim.CONVERGENCE_THRESHOLD = 1e-6
+    assert cache_key(sim) != key
+    sim.CONVERGENCE_THRESHOLD = CONFIG.CONVERGENCE_THRESHOLD
+    assert cache_key(sim, convergence=ConvergenceMonitor('l2')) != key
+    assert cache_key(sim, convergence=ConvergenceMonitor()) == key
+
+def test_run_refuses_subclasses_without_hook(tmp_path):
+    class Plate(HeatTransferSimulation):
+        pass
+
+    cache = ResultCache(tmp_path)
+    with pytest.raises(ValueError):
+        cache.run(Plate(CONFIG, verbose=False))
+
+    sim = HeatTransferSimulation(CONFIG, verbose=False)
+    cache.run(sim)
+    assert not sim.run_stats['cached']
+    cache.run(sim)
+    assert sim.run_stats['cached']
+    sim.MAX_ITERATIONS = 100
+    cache.run(sim)
+    assert not sim.run_stats['cached']
+
+def test_config_key_matches_simulation():
+    for solver in ('explicit', 'adi'):
+        for use_conv in (True, False):
+            sim = HeatTransferSimulation(CONFIG, solver=solver, verbose=False)
+            assert config_key(CONFIG, solver, use_convection_radiation=use_conv) == \
+                cache_key(sim, use_conv)
+
+def test_cli_serves_hits_without_numpy(tmp_path):
+    config = tmp_path / 'plate.json'
+    config.write_text(json.dumps({'WIDTH': 10, 'HEIGHT': 10, 'MAX_ITERATIONS': 200}))
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    probe = ("import sys; from termopy.cli import main; main(sys.argv[1:]); "
+             "print('numpy' in sys.modules, file=sys.stderr)")
+
+    def run(output):
+        args = ['run', str(config), '--cache-dir', str(tmp_path / 'cache'), '--output', output]
+        done = subprocess.run([sys.executable, '-c', probe] + args, check=True, env=env,
+                              capture_output=True, text=True)
+        return json.loads(done.stdout), done.stderr.split()[-1]
+
+    first, loaded = run(str(tmp_path / 'first.npy'))
+    assert not first['cached'] and loaded == 'True'
+    second, loaded = run(str(tmp_path / 'second'))
+    assert second['cached'] and loaded == 'False'
+    assert dict(first, cached=True) == second
+    assert (tmp_path / 'first.npy').read_bytes() == (tmp_path / 'second.npy').read_bytes()
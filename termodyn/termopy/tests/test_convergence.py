@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from termopy.batched import BatchedHeatTransferSimulation
+from termopy.config import SimulationConfig
+from termopy.convergence import ConvergenceMonitor
+from termopy.HeatTransferSimulation import HeatTransferSimulation
+
+CONFIG = SimulationConfig(WIDTH=12, HEIGHT=12)
+
+def test_default_monitor_stops_on_threshold_or_limit_only():
+    monitor = ConvergenceMonitor()
+    monitor.start(1e-4, 1000)
+    for value in (1.0, 1.0, 1e6, float('nan')):
+        assert monitor.update(value) is None
+    assert monitor.update(1e-5) == 'converged'
+
+def test_early_exits_are_opt_in():
+    monitor = ConvergenceMonitor(stagnation_window=3)
+    monitor.start(1e-4, 100)
+    assert [monitor.update(1.0) for _ in range(4)] == [None, None, None, 'stagnated']
+    monitor = ConvergenceMonitor(divergence_factor=10)
+    monitor.start(1e-4, 100)
+    assert monitor.update(1.0) is None
+    assert monitor.update(20.0) == 'diverged'
+
+def test_batched_and_per_case_runs_stop_at_the_same_step():
+    configs = [CONFIG, CONFIG.replace(T_hot_surface=80, MAX_ITERATIONS=150)]
+    batch = BatchedHeatTransferSimulation(configs)
+    grids = batch.run_simulation()
+    for n, config in enumerate(configs):
+        sim = HeatTransferSimulation(config, verbose=False)
+        grid = sim.run_simulation()
+        assert batch.run_stats['iterations'][n] == sim.run_stats['iterations']
+        np.testing.assert_allclose(grids[n], grid, rtol=0, atol=1e-12)
+
+@pytest.mark.parametrize('norm', ['linf', 'l2', 'residual'])
+def test_check_interval_only_thins_the_history(norm):
+    sim = HeatTransferSimulation(CONFIG, verbose=False)
+    sim.run_simulation(convergence=ConvergenceMonitor(norm, check_every=5))
+    monitor = sim.convergence
+    assert sim.run_stats['stop_reason'] == 'converged'
+    assert sim.run_stats['iterations'] % 5 == 0
+    assert monitor.history[-1] <= CONFIG.CONVERGENCE_THRESHOLD
+    np.testing.assert_array_equal(monitor.history_iterations[-1], sim.run_stats['iterations'])
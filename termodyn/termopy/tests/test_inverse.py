@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from termopy.config import MATERIALS, SimulationConfig
+from termopy.inverse import InverseProblem, fit
+
+CONFIG = SimulationConfig(**MATERIALS['steel'])
+# Hot side ramped from ambient to 100 °C over half an hour, then held
+BOUNDARY = [(t, 'T_hot_surface', 25 + 75 * min(t, 1800) / 1800) for t in range(0, 7201, 300)] + \
+           [(t, 'T_ambient', 25.0) for t in range(0, 7201, 600)]
+LOCATIONS = {'low': (0.25, 0.05), 'mid': (0.25, 0.25)}
+TIMES = range(0, 7201, 600)
+
+def problem(observations, **options):
+    return InverseProblem(CONFIG, BOUNDARY, observations, LOCATIONS, parameters=('k',),
+                          reduced_shape=(10, 10), **options)
+
+def synthetic(k):
+    # Observations the reduced model itself produces with conductivity k
+    placeholder = problem([(t, name, 0.0) for t in TIMES for name in LOCATIONS])
+    values = iter(placeholder.simulate([k]))
+    return [(t, name, next(values)) for name in placeholder.names for t in TIMES]
+
+def test_fit_recovers_conductivity_from_synthetic_data():
+    observations = synthetic(50.0)
+    target = problem(observations)
+    assert np.abs(target.residuals([50.0])).max() == 0
+    assert np.abs(target.residuals([30.0])).max() > 0.1
+    result = fit(target, initial={'k': 30.0}, max_workers=1)
+    assert result['values']['k'] == pytest.approx(50.0, rel=1e-4)
+    assert result['rms'] < 1e-4
+
+def test_observations_outside_the_boundary_span_are_dropped():
+    observations = [(-600, 'mid', 20.0), (0, 'mid', 25.0), (9000, 'mid', 90.0), (0, 'other', 0.0)]
+    assert list(problem(observations).measured) == [25.0]
+    with pytest.raises(ValueError):
+        problem([(9000, 'mid', 90.0)])
+    with pytest.raises(ValueError):
+        InverseProblem(CONFIG, [e for e in BOUNDARY if e[1] == 'T_ambient'],
+                       [(0, 'mid', 25.0)], LOCATIONS)
+
+def test_sensor_on_the_hot_surface_reads_its_temperature():
+    hot = InverseProblem(CONFIG, BOUNDARY, [(t, 'top', 0.0) for t in TIMES], {'top': (0.2, 0.5)},
+                         parameters=('k',), reduced_shape=(10, 10))
+    np.testing.assert_allclose(hot.simulate([50.0]),
+                               [25 + 75 * min(t, 1800) / 1800 for t in TIMES])
@@ -0,0 +1,24 @@
+import numpy as np
+
+from termopy.cache import ResultCache, cache_key
+from termopy.config import SimulationConfig
+from termopy.HeatTransferSimulation import HeatTransferSimulation
+from termopy.parallel import ParallelHeatTransferSimulation
+
+CONFIG = SimulationConfig(WIDTH=20, HEIGHT=23, MAX_ITERATIONS=300)
+
+def test_strips_match_the_serial_stepper_bit_for_bit():
+    serial = HeatTransferSimulation(CONFIG, verbose=False, kernel='numpy').run_simulation()
+    for workers in (1, 3, 4):
+        with ParallelHeatTransferSimulation(CONFIG, workers=workers, verbose=False) as sim:
+            np.testing.assert_array_equal(sim.run_simulation(), serial)
+
+def test_cached_runs_do_not_depend_on_the_strip_count(tmp_path):
+    cache = ResultCache(tmp_path)
+    with ParallelHeatTransferSimulation(CONFIG, workers=2, verbose=False) as two, \
+            ParallelHeatTransferSimulation(CONFIG, workers=3, verbose=False) as three:
+        assert cache_key(two) == cache_key(three)
+        first = cache.run(two)
+        assert not two.run_stats['cached']
+        np.testing.assert_array_equal(cache.run(three), first)
+        assert three.run_stats['cached']
@@ -0,0 +1,35 @@
+import numpy as np
+
+from termopy.config import SimulationConfig
+from termopy.convergence import ConvergenceMonitor
+from termopy.HeatTransferSimulation import HeatTransferSimulation
+
+CONFIG = SimulationConfig(WIDTH=12, HEIGHT=12, MAX_ITERATIONS=200)
+
+def test_step_quantities_follow_the_time_step():
+    # Only DT-independent config quantities are copied; nothing on the
+    # simulation is left scaled for a step it does not take
+    for sim in (HeatTransferSimulation(CONFIG, dt=CONFIG.DT / 2, verbose=False),
+                HeatTransferSimulation(CONFIG, solver='adi', verbose=False)):
+        assert sim.DT != CONFIG.DT
+        for name in ('CX', 'CY', 'EDGE_COOLING'):
+            assert not hasattr(sim, name)
+        for name in ('WIDTH', 'k', 'DX', 'DY', 'ALPHA'):
+            assert getattr(sim, name) == getattr(CONFIG, name)
+
+def test_default_run_is_headless_and_deterministic():
+    first = HeatTransferSimulation(CONFIG, verbose=False).run_simulation()
+    second = HeatTransferSimulation(CONFIG, verbose=False).run_simulation()
+    np.testing.assert_array_equal(first, second)
+
+def test_adi_and_explicit_reach_the_same_field():
+    # Judged by the residual, which does not depend on the step size
+    config = CONFIG.replace(CONVERGENCE_THRESHOLD=1e-6, MAX_ITERATIONS=20000)
+    explicit = HeatTransferSimulation(config, verbose=False)
+    adi = HeatTransferSimulation(config, solver='adi', verbose=False)
+    marched = explicit.run_simulation(convergence=ConvergenceMonitor('residual'))
+    implicit = adi.run_simulation(convergence=ConvergenceMonitor('residual'))
+    assert explicit.run_stats['stop_reason'] == adi.run_stats['stop_reason'] == 'converged'
+    assert adi.DT > 10 * explicit.DT
+    assert adi.run_stats['iterations'] < explicit.run_stats['iterations'] / 10
+    np.testing.assert_allclose(implicit, marched, atol=1e-4)
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from termopy.adaptive import AdaptiveController
+from termopy.config import SimulationConfig
+from termopy.simulation3d import HeatTransferSimulation3D
+from termopy.transient import run_transient
+
+CONFIG = SimulationConfig(WIDTH=8, HEIGHT=8, MAX_ITERATIONS=100)
+
+def events(duration=600, step=60):
+    # Hot surface ramping from 60 to 100 °C, ambient steady at 25 °C
+    for t in range(0, duration + 1, step):
+        yield float(t), 'T_hot_surface', 60 + 40 * t / duration
+        yield float(t), 'T_ambient', 25.0
+
+def make(**kwargs):
+    return HeatTransferSimulation3D(CONFIG, depth=6, dtype=np.float64, verbose=False, **kwargs)
+
+def test_edge_cooling_follows_the_time_step():
+    sim = make()
+    cooling = sim.EDGE_COOLING
+    sim.set_time_step(sim.DT / 4)
+    assert sim.EDGE_COOLING == pytest.approx(cooling / 4)
+    assert make(dt=sim.DT).EDGE_COOLING == pytest.approx(sim.EDGE_COOLING)
+
+def test_stable_step_covers_the_third_axis():
+    sim = make()
+    assert sim.DT == pytest.approx(0.8 * sim.stable_time_step())
+    assert sim.stable_time_step() < HeatTransferSimulation3D.__mro__[1].stable_time_step(sim)
+
+def landing(sim, interval):
+    # Largest step no longer than DT that lands on every output time
+    return make(dt=interval / np.ceil(interval / sim.DT))
+
+def test_transient_runs_on_volumes():
+    sim = landing(make(), 120)
+    dt = sim.DT
+    frames = list(run_transient(sim, events(), 120))
+    np.testing.assert_allclose([frame.time for frame in frames], [0, 120, 240, 360, 480, 600])
+    assert frames[-1].grid.shape == sim.shape()
+    np.testing.assert_allclose(frames[-1].grid[:, -1, :], 100)
+    assert sim.DT == dt
+
+def test_adaptive_matches_fixed_steps():
+    reference = landing(make(), 300)
+    fixed = list(run_transient(reference, events(), 300))
+    sim = make()
+    cooling = sim.EDGE_COOLING
+    adaptive = list(run_transient(sim, events(), 300, adaptive=AdaptiveController(tolerance=1e-3)))
+    assert len(fixed) == len(adaptive) == 3
+    for a, b in zip(fixed, adaptive):
+        assert a.time == pytest.approx(b.time)
+        np.testing.assert_allclose(a.grid, b.grid, atol=0.05)
+    assert sim.EDGE_COOLING == cooling
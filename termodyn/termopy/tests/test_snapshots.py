@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+
+from termopy.config import SimulationConfig
+from termopy.HeatTransferSimulation import HeatTransferSimulation
+from termopy.snapshots import CHUNK_DTYPE, SnapshotReader, SnapshotWriter, record
+from termopy.transient import Frame
+
+SHAPE = (6, 5)
+
+def frames(count, start=0.0):
+    rng = np.random.default_rng(int(start))
+    for n in range(count):
+        yield Frame(start + 10.0 * n, n, 90.0 + n, 25.0, rng.normal(50, 10, SHAPE))
+
+def test_round_trip_across_chunks(tmp_path):
+    written = list(frames(11))
+    assert record(written, tmp_path, chunk_frames=4) == 11
+    reader = SnapshotReader(tmp_path)
+    assert len(reader) == 11
+    np.testing.assert_array_equal(reader.times, [f.time for f in written])
+    np.testing.assert_array_equal(reader.T_hot_surface, [f.T_hot_surface for f in written])
+    np.testing.assert_array_equal(reader[-1], written[-1].grid)
+    np.testing.assert_array_equal(reader[2:9:3], [written[n].grid for n in (2, 5, 8)])
+    for stored, frame in zip(reader, written):
+        assert stored.time == frame.time and stored.step == frame.step
+        np.testing.assert_array_equal(stored.grid, frame.grid)
+    with pytest.raises(IndexError):
+        reader[11]
+
+def test_between_slices_by_time(tmp_path):
+    written = list(frames(11))
+    record(written, tmp_path, chunk_frames=4)
+    reader = SnapshotReader(tmp_path)
+    np.testing.assert_array_equal(reader.between(20, 50), [f.grid for f in written[2:5]])
+    np.testing.assert_array_equal(reader.between(15, 51), [f.grid for f in written[2:6]])
+    np.testing.assert_array_equal(reader.between(stop=20), [f.grid for f in written[:2]])
+    np.testing.assert_array_equal(reader.between(80, stride=2), [f.grid for f in written[8::2]])
+    assert len(reader.between(200)) == 0
+
+def test_appending_continues_the_stored_run(tmp_path):
+    written = list(frames(10))
+    record(written[:5], tmp_path, chunk_frames=3)
+    record(written[5:], tmp_path)
+    reader = SnapshotReader(tmp_path)
+    assert len(reader) == 10
+    np.testing.assert_array_equal(reader.between(40, 70), [f.grid for f in written[4:7]])
+
+def test_a_new_run_in_the_same_store_is_rejected(tmp_path):
+    record(frames(5), tmp_path)
+    with pytest.raises(ValueError):
+        record(frames(5), tmp_path)
+    with SnapshotWriter(tmp_path / 'other') as writer:
+        writer.write(next(frames(1, start=100.0)))
+        with pytest.raises(ValueError):
+            writer.write(next(frames(1)))
+    assert len(SnapshotReader(tmp_path)) == 5
+
+def test_run_simulation_snapshots(tmp_path):
+    config = SimulationConfig(WIDTH=8, HEIGHT=8, MAX_ITERATIONS=25)
+    sim = HeatTransferSimulation(config, verbose=False)
+    with SnapshotWriter(tmp_path, dtype=np.float32) as writer:
+        grid = sim.run_simulation(snapshots=writer, snapshot_every=10)
+    reader = SnapshotReader(tmp_path)
+    np.testing.assert_array_equal(reader.steps, [0, 10, 20, 25])
+    np.testing.assert_allclose(reader.times, reader.steps * sim.DT)
+    np.testing.assert_allclose(reader[-1], grid, rtol=1e-6)
+
+def test_uncommitted_chunk_is_dropped_on_reopen(tmp_path):
+    written = list(frames(8))
+    record(written[:7], tmp_path, chunk_frames=3)
+    # As if the writer died before committing its last chunk
+    chunks = tmp_path / 'chunks.bin'
+    chunks.write_bytes(chunks.read_bytes()[:-CHUNK_DTYPE.itemsize])
+    reader = SnapshotReader(tmp_path)
+    assert len(reader) == 6
+    record(written[6:], tmp_path)
+    assert len(reader) == 6
+    reader.refresh()
+    assert len(reader) == 8
+    np.testing.assert_array_equal(reader.times, [f.time for f in written])
+    np.testing.assert_array_equal(reader[6:], [f.grid for f in written[6:]])
+
+def test_store_keeps_its_dtype(tmp_path):
+    written = list(frames(3))
+    record(written, tmp_path, dtype=np.float32)
+    np.testing.assert_array_equal(SnapshotReader(tmp_path)[1], written[1].grid.astype(np.float32))
+    with pytest.raises(ValueError):
+        SnapshotWriter(tmp_path)
+    with pytest.raises(ValueError):
+        record([Frame(100.0, 3, 90.0, 25.0, np.zeros((5, 6)))], tmp_path, dtype=np.float32)
@@ -0,0 +1,38 @@
+import numpy as np
+import pytest
+
+from termopy.config import MATERIALS, SimulationConfig
+from termopy.convergence import ConvergenceMonitor
+from termopy.HeatTransferSimulation import HeatTransferSimulation, steady_solver
+
+# Non-square, with different spacings along the two axes
+CONFIG = SimulationConfig(WIDTH=9, HEIGHT=17, L_H=1.0, CONVERGENCE_THRESHOLD=1e-7,
+                          MAX_ITERATIONS=200000)
+
+@pytest.fixture(scope='module')
+def marched():
+    sim = HeatTransferSimulation(CONFIG, verbose=False)
+    grid = sim.run_simulation(convergence=ConvergenceMonitor('residual'))
+    assert sim.run_stats['stop_reason'] == 'converged'
+    return grid
+
+@pytest.mark.parametrize('use_convection_radiation', [False, True])
+@pytest.mark.parametrize('method', ['direct', 'cg', 'multigrid'])
+def test_steady_state_matches_explicit_march(marched, method, use_convection_radiation):
+    sim = HeatTransferSimulation(CONFIG, verbose=False)
+    steady = sim.solve_steady_state(use_convection_radiation, method)
+    assert sim.run_stats['solver'] == f'steady-{method}'
+    assert sim.residual(steady, sim.allocate_buffers()) < 1e-8
+    np.testing.assert_allclose(steady, marched, atol=1e-4)
+
+def test_interior_solver_is_shared_across_materials():
+    steady_solver.cache_clear()
+    grids = [HeatTransferSimulation(CONFIG.replace(**MATERIALS[name]), verbose=False)
+             .solve_steady_state(method='multigrid') for name in ('aluminum', 'steel', 'osb')]
+    assert steady_solver.cache_info().misses == 1
+    for grid in grids[1:]:
+        np.testing.assert_allclose(grid, grids[0], atol=1e-10)
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        HeatTransferSimulation(CONFIG, verbose=False).solve_steady_state(method='jacobi')
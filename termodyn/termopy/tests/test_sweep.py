@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from termopy.config import SimulationConfig
+from termopy.convergence import ConvergenceMonitor
+from termopy.HeatTransferSimulation import HeatTransferSimulation
+from termopy.sweep import parameter_grid, run_continuation, run_sweep
+
+BASE = SimulationConfig(WIDTH=14, HEIGHT=14)
+# Boundary temperatures change the solution; materials alone do not (the
+# steady field of this model is independent of k, rho and cp)
+CONFIGS = parameter_grid(BASE, T_hot_surface=[80, 100], T_ambient=[20, 25])
+
+def cold_start(config, use_convection_radiation):
+    sim = HeatTransferSimulation(config, verbose=False)
+    grid = sim.run_simulation(use_convection_radiation,
+                              convergence=ConvergenceMonitor('residual'))
+    return grid
+
+def test_warm_and_cold_starts_reach_the_same_field():
+    for use_convection_radiation in (True, False):
+        rows, summary = run_continuation(CONFIGS, use_convection_radiation=use_convection_radiation)
+        assert summary['cold_starts'] == 1
+        for row in rows:
+            config = BASE.replace(T_hot_surface=row['T_hot_surface'], T_ambient=row['T_ambient'])
+            cold = cold_start(config, use_convection_radiation)
+            assert abs(row['T_mean'] - cold.mean()) < 1e-3
+            assert abs(row['T_min'] - cold.min()) < 1e-3
+            assert abs(row['T_max'] - cold.max()) < 1e-3
+
+def test_warm_start_takes_the_edges_of_its_own_case():
+    neighbour = HeatTransferSimulation(BASE.replace(T_ambient=20), verbose=False)
+    parent = neighbour.run_simulation(convergence=ConvergenceMonitor('residual'))
+    config = BASE.replace(T_ambient=25)
+    sim = HeatTransferSimulation(config, verbose=False)
+    warm = sim.run_simulation(initial_grid=parent, convergence=ConvergenceMonitor('residual'))
+    assert sim.run_stats['iterations'] > 1
+    np.testing.assert_allclose(warm, cold_start(config, True), atol=1e-3)
+
+def test_engines_agree_and_keep_input_order():
+    base = SimulationConfig(WIDTH=10, HEIGHT=10, CONVERGENCE_THRESHOLD=1e-5)
+    configs = parameter_grid(base, T_hot_surface=[80, 100], h_natural_conv=[5, 10])
+    process = run_sweep(configs, max_workers=2)
+    batched = run_sweep(configs, engine='batched')
+    continuation = run_sweep(configs, engine='continuation')
+    assert list(process['T_hot_surface']) == [80, 80, 100, 100]
+    for table in (batched, continuation):
+        assert list(table['key']) == list(process['key'])
+    np.testing.assert_array_equal(batched['iterations'], process['iterations'])
+    for column in ('T_min', 'T_max', 'T_mean', 'conv_loss', 'rad_loss'):
+        np.testing.assert_allclose(batched[column], process[column], rtol=1e-12)
+        np.testing.assert_allclose(continuation[column], process[column], atol=1e-3)
+    assert continuation.attrs['continuation']['cold_starts'] == 1
+
+def test_sweep_resumes_from_its_results_file(tmp_path):
+    base = SimulationConfig(WIDTH=8, HEIGHT=8, MAX_ITERATIONS=100)
+    configs = parameter_grid(base, T_hot_surface=[80, 90, 100])
+    results = tmp_path / 'results.csv'
+    first = run_sweep(configs[:2], engine='batched', results_path=results)
+    table = run_sweep(configs, engine='batched', results_path=results)
+    assert len(results.read_text().splitlines()) == 4
+    assert list(table['key'][:2]) == list(first['key'])
+    with pytest.raises(ValueError):
+        run_sweep(configs, solver='adi', engine='batched')
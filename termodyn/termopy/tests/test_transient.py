@@ -0,0 +1,98 @@
+import json
+
+import numpy as np
+import pytest
+
+from termopy.adaptive import AdaptiveController
+from termopy.config import SimulationConfig
+from termopy.HeatTransferSimulation import HeatTransferSimulation
+from termopy.transient import BoundarySeries, read_csv, read_payloads, run_transient
+
+CONFIG = SimulationConfig(WIDTH=10, HEIGHT=10)
+# Hot side ramped from ambient to 100 °C over ten minutes, then held
+EVENTS = [
+    (0.0, 'T_hot_surface', 25.0), (0.0, 'T_ambient', 25.0),
+    (600.0, 'T_hot_surface', 100.0),
+    (3600.0, 'T_hot_surface', 100.0), (3600.0, 'T_ambient', 25.0),
+]
+
+def test_series_interpolates_holds_and_ends():
+    series = BoundarySeries([
+        (10.0, 'T_hot_surface', 50.0), (20.0, 'T_ambient', 20.0),
+        (30.0, 'T_hot_surface', 70.0), (40.0, 'T_ambient', 30.0),
+    ])
+    assert series.start_time() == 20.0
+    assert series.values_at(20.0) == {'T_hot_surface': 60.0, 'T_ambient': 20.0}
+    assert series.values_at(30.0) == {'T_hot_surface': 70.0, 'T_ambient': 25.0}
+    series.release(30.0)
+    assert all(len(queue) <= 2 for queue in series.samples.values())
+    assert series.values_at(35.0) is None
+    with pytest.raises(ValueError):
+        BoundarySeries([(10.0, 'T_ambient', 20.0), (5.0, 'T_ambient', 21.0)]).start_time()
+
+def test_readers_map_sensors_to_boundaries(tmp_path):
+    payloads = tmp_path / 'payloads.jsonl'
+    payloads.write_text('\n'.join(json.dumps(m) for m in [
+        {'sensor_id': '28b87f230d000052', 'timestamp': '1970-01-01T00:01:00', 'temperature': 80.5},
+        {'sensor_id': '28f475b80e000076', 'timestamp': '1970-01-01T00:01:00Z', 'temperature': 21},
+        {'sensor_id': 'unknown', 'timestamp': 60, 'temperature': 0},
+    ]) + '\n')
+    assert list(read_payloads(payloads)) == [(60.0, 'T_hot_surface', 80.5),
+                                             (60.0, 'T_ambient', 21.0)]
+
+    wide = tmp_path / 'wide.csv'
+    wide.write_text('timestamp,T_hot_surface,T_ambient\n0,90,20\n60,,21\n')
+    assert list(read_csv(wide)) == [(0.0, 'T_hot_surface', 90.0), (0.0, 'T_ambient', 20.0),
+                                    (60.0, 'T_ambient', 21.0)]
+
+    long = tmp_path / 'long.csv'
+    long.write_text('timestamp,sensor_name,temperature\n0,A Side,90\n0,B Side,20\n0,Other,5\n')
+    assert list(read_csv(long)) == [(0.0, 'T_hot_surface', 90.0), (0.0, 'T_ambient', 20.0)]
+
+def test_constant_boundaries_match_run_simulation():
+    steps = 40
+    events = [(0.0, 'T_hot_surface', 100.0), (0.0, 'T_ambient', 25.0),
+              (steps * CONFIG.DT, 'T_hot_surface', 100.0), (steps * CONFIG.DT, 'T_ambient', 25.0)]
+    sim = HeatTransferSimulation(CONFIG, verbose=False)
+    frames = list(run_transient(sim, events, 10 * CONFIG.DT))
+    assert [frame.step for frame in frames] == [0, 10, 20, 30, 40]
+    marched = HeatTransferSimulation(CONFIG.replace(MAX_ITERATIONS=steps, CONVERGENCE_THRESHOLD=0),
+                                     verbose=False).run_simulation()
+    np.testing.assert_allclose(frames[-1].grid, marched, atol=1e-12)
+
+def test_boundaries_are_restored_after_a_run():
+    sim = HeatTransferSimulation(CONFIG, dt=CONFIG.DT / 2, verbose=False)
+    frames = list(run_transient(sim, EVENTS, 300.0))
+    assert frames[0].T_hot_surface == 25.0 and frames[-1].T_hot_surface == 100.0
+    assert sim.T_hot_surface == CONFIG.T_hot_surface and sim.DT == CONFIG.DT / 2
+    assert sim.run_stats['frames'] == len(frames)
+
+@pytest.fixture(scope='module')
+def reference():
+    # Fine fixed steps that land on every output time
+    sim = HeatTransferSimulation(CONFIG, dt=300.0 / 480, verbose=False)
+    return list(run_transient(sim, EVENTS, 300.0))
+
+@pytest.mark.parametrize('solver', ['explicit', 'adi'])
+def test_adaptive_steps_track_the_fine_solution(reference, solver):
+    sim = HeatTransferSimulation(CONFIG, solver=solver, verbose=False)
+    frames = list(run_transient(sim, EVENTS, 300.0, adaptive=AdaptiveController(tolerance=0.01)))
+    assert [frame.time for frame in frames] == [frame.time for frame in reference]
+    for frame, expected in zip(frames, reference):
+        np.testing.assert_allclose(frame.grid, expected.grid, atol=0.05)
+    stats = sim.run_stats
+    assert stats['rejected'] > 0
+    assert stats['steps'] == 3 * (stats['accepted'] + stats['rejected'])
+    if solver == 'explicit':
+        assert stats['dt_largest'] <= 0.9 * sim.stable_time_step()
+    else:
+        assert stats['dt_largest'] > 10 * sim.stable_time_step()
+
+def test_looser_tolerance_takes_fewer_steps():
+    steps = []
+    for tolerance in (0.01, 0.1):
+        sim = HeatTransferSimulation(CONFIG, solver='adi', verbose=False)
+        for _ in run_transient(sim, EVENTS, 300.0, adaptive=AdaptiveController(tolerance)):
+            pass
+        steps.append(sim.run_stats['steps'])
+    assert steps[1] < steps[0]